@@ -0,0 +1,53 @@
+"""
+Benchmark: throughput of parallel reachability exploration as the number of worker processes grows.
+
+Explores the manufacturing `Pull` example breadth-first to a fixed depth, with the tokens of its example marking
+multiplied by `--scale` to widen the state space. The serial `reachability_graph` is timed first, and every
+parallel run is checked against its result.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel_reachability [--scale 3] [--depth 20] [--workers 1,2,4,8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from carladam.analysis.parallel import parallel_reachability_graph
+from carladam.analysis.reachability import reachability_graph
+from carladam.petrinet.token import Token
+from examples.manufacturing.pull import Pull
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--workers", default="1,2,4,8")
+    args = parser.parse_args()
+
+    net = Pull.new()
+    initial = {
+        place: Token() * (len(tokens) * args.scale)
+        for place, tokens in net.Structure.example_markings["Initialized"].items()
+    }
+
+    started = time.perf_counter()
+    serial = reachability_graph(net, initial, max_depth=args.depth)
+    elapsed = time.perf_counter() - started
+    states = serial.exploration.states
+    print(f"{states} states, {serial.exploration.edges} edges")
+    print(f"{'workers':>8} {'seconds':>10} {'states/s':>10}")
+    print(f"{'serial':>8} {elapsed:>10.2f} {states / elapsed:>10.0f}")
+    for workers in map(int, args.workers.split(",")):
+        started = time.perf_counter()
+        graph = parallel_reachability_graph(net, initial, workers=workers, max_depth=args.depth, keep_markings=False)
+        elapsed = time.perf_counter() - started
+        assert graph.edges == serial.edges
+        print(f"{workers:>8} {elapsed:>10.2f} {states / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
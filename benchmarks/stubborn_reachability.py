@@ -0,0 +1,68 @@
+"""
+Benchmark: states explored with and without stubborn-set reduction, as independent production lines are added.
+
+Each line is an instance of the manufacturing `Pull` example, with its external ordering transition limited to
+`--orders` orders so that its state space is finite. Lines share no places, so the full state space grows
+exponentially with their number, while the reduced one grows roughly linearly. Both explorations are checked to
+find the same deadlocks.
+
+Run from the repository root:
+
+    python -m benchmarks.stubborn_reachability [--lines 1,2,3] [--orders 2] [--max-states 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from carladam.analysis.reachability import canonical_key, reachability_graph
+from carladam.petrinet.compose import compose
+from carladam.petrinet.hierarchy import HierarchicalNet, ModuleInstance
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.token import Token
+from examples.manufacturing.pull import Pull
+
+
+def deadlocks(graph) -> set:
+    sources = {source for source, transition, target in graph.edges}
+    return {canonical_key(marking) for number, marking in enumerate(graph.markings) if number not in sources}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", default="1,2,3")
+    parser.add_argument("--orders", type=int, default=2)
+    parser.add_argument("--max-states", type=int, default=10_000)
+    args = parser.parse_args()
+
+    pull = Pull.new()
+    orders = Place("Orders")
+    order = pull.Structure.order_c
+    line = compose(pull, PetriNet.new(orders, order, orders >> order))
+    line_marking = {**pull.Structure.example_markings["Initialized"], orders: Token() * args.orders}
+
+    print(f"{'lines':>5} {'reduction':>10} {'states':>8} {'edges':>8} {'seconds':>8}")
+    for count in map(int, args.lines.split(",")):
+        instances = [ModuleInstance(f"Line {index}", line) for index in range(count)]
+        net = HierarchicalNet(PetriNet.new(), instances).flatten()
+        initial = {}
+        for instance in instances:
+            initial.update(instance.marking(line_marking))
+        found = {}
+        for reduction in ("none", "stubborn"):
+            started = time.perf_counter()
+            graph = reachability_graph(net, initial, reduction=reduction, max_states=args.max_states)
+            elapsed = time.perf_counter() - started
+            exploration = graph.exploration
+            states = f"{exploration.states}{'' if exploration.complete else '+'}"
+            print(f"{count:>5} {reduction:>10} {states:>8} {exploration.edges:>8} {elapsed:>8.2f}")
+            if exploration.complete:
+                found[reduction] = deadlocks(graph)
+        if len(found) == 2:
+            assert found["none"] == found["stubborn"]
+
+
+if __name__ == "__main__":
+    main()
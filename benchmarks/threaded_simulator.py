@@ -0,0 +1,124 @@
+"""
+Stress benchmark: throughput of the simulator's engine and caches under a threaded WSGI server.
+
+Each request decodes a marking from JSON, replays a sequence of transitions, finds the enabled transitions
+and their subnet, renders a GraphViz diagram, and encodes the resulting marking -- the same shared, cached
+work that `petrinet_simulator.views.simulator` does, without the template rendering or network requests.
+
+Run from the repository root:
+
+    python -m benchmarks.threaded_simulator [--requests N] [--threads 1,2,4,8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from pyrsistent import pmap
+
+from carladam.diagram.digraph import graphviz_digraph
+from carladam.django.petrinet_simulator.marking import decode_marking_from_json
+from carladam.django.petrinet_simulator.replay import replay_cache
+from carladam.django.petrinet_simulator.templatetags.petrinet_simulator import marking_encoded
+from carladam.petrinet.petrinet import PetriNet
+from examples.manufacturing.pull import Pull
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def simulator_app(net: PetriNet):
+    colors = pmap((color.label, color) for color in net.colors)
+    transitions_by_id = {transition.id: transition for transition in net.transitions}
+
+    def app(environ, start_response):
+        query = parse_qs(environ.get("QUERY_STRING", ""))
+        marking_json = json.loads(query.get("initial_marking", ["{}"])[0])
+        marking = decode_marking_from_json(net=net, colors=colors, marking_json=marking_json)
+        transition_ids = filter(None, query.get("transitions", [""])[0].split(","))
+        marking = replay_cache.marking_after(net, marking, [transitions_by_id[id_] for id_ in transition_ids])
+        enabled = sorted(net.enabled_transitions(marking))
+        subnet = PetriNet.new(*(net.subnet(transition) for transition in enabled))
+        body = "\n".join([graphviz_digraph(net, marking), graphviz_digraph(subnet), marking_encoded(marking)])
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [body.encode()]
+
+    return app
+
+
+def random_walks(net: PetriNet, count: int, length: int, seed: int = 0) -> list[str]:
+    """Returns query strings for `count` random transition sequences from the net's example marking."""
+    rng = random.Random(seed)
+    initial = net.Structure.example_markings["Initialized"]
+    initial_json = {
+        place.id: [{"id": t.id, "color": t.color.label, "data": {}} for t in tokens]
+        for place, tokens in initial.items()
+    }
+    queries = []
+    for _ in range(count):
+        marking, transitions = initial, []
+        for _ in range(rng.randrange(length)):
+            enabled = sorted(net.enabled_transitions(marking))
+            if not enabled:
+                break
+            transition = rng.choice(enabled)
+            transitions.append(transition.id)
+            marking = net.marking_after_transition(marking, transition)
+        queries.append(urlencode({"initial_marking": json.dumps(initial_json), "transitions": ",".join(transitions)}))
+    return queries
+
+
+def run(port: int, queries: list[str], threads: int, requests: int) -> float:
+    """Issues `requests` requests from `threads` client threads, returning requests per second."""
+    local = threading.local()
+
+    def fetch(i: int):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection("127.0.0.1", port)
+        local.connection.request("GET", f"/?{queries[i % len(queries)]}")
+        response = local.connection.getresponse()
+        response.read()
+        assert response.status == 200
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(fetch, range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--walks", type=int, default=50, help="Number of distinct transition sequences requested.")
+    args = parser.parse_args()
+
+    net = Pull.new()
+    queries = random_walks(net, args.walks, length=20)
+    server = make_server("127.0.0.1", 0, simulator_app(net), ThreadingWSGIServer, QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print(f"{'threads':>8} {'req/s':>10}")
+        for threads in map(int, args.threads.split(",")):
+            print(f"{threads:>8} {run(server.server_port, queries, threads, args.requests):>10.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,9 @@ CarlAdam models Petri nets in Python.
 This top-level module exports commonly used classes and functions.
 """
 
-from carladam.petrinet.arc import Annotate, TransformEach, arc, arc_path
+from carladam.petrinet.arc import Annotate, TransformBatch, TransformEach, arc, arc_path
 from carladam.petrinet.color import Abstract, Color, color_eq
+from carladam.petrinet.indexed import tokens_with
 from carladam.petrinet.marking import Marking
 from carladam.petrinet.petrinet import PetriNet
 from carladam.petrinet.place import Place
@@ -25,6 +26,7 @@ __all__ = [
     "Place",
     "Token",
     "TokenSet",
+    "TransformBatch",
     "TransformEach",
     "Transition",
     "__",
@@ -35,4 +37,5 @@ __all__ = [
     "one",
     "passthrough",
     "tokens_where",
+    "tokens_with",
 ]
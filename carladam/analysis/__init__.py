@@ -0,0 +1,5 @@
+"""
+Analyses of the behavior of Petri nets.
+
+Vectorized analyses, built on `CompiledNet`, use NumPy, installed with the `analysis` extra.
+"""
@@ -0,0 +1,190 @@
+"""
+Karp–Miller coverability graphs, answering questions about nets whose reachable markings are unbounded.
+
+Markings are count vectors (see `CompiledNet`), extended with `OMEGA` for places that can hold arbitrarily many
+tokens of a color. Whenever a newly reached marking strictly covers a marking on the path leading to it, the
+sequence of transitions between them can be repeated without end, so each count that grew becomes `OMEGA`.
+This acceleration makes the graph finite for every net. Its markings over-approximate the reachable markings
+exactly enough to decide boundedness, coverability, and which transitions can ever occur.
+
+Checking a new marking against the markings on its path uses an index of those markings by support, the set of
+slots they hold tokens in: only markings whose support is contained in the new marking's can be covered by it.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> net = PetriNet.new(source := Transition("Source"), p := Place("P"), sink := Transition("Sink"),
+    ...                    source >> p, p >> sink)
+    >>> graph = coverability_graph(net, {})
+    >>> graph.is_bounded(), graph.place_bounds()[p]
+    (False, inf)
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Iterator, Mapping, Sequence
+
+from attr import define
+
+from carladam.petrinet.compiled import CompiledNet
+from carladam.petrinet.marking import Marking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.transition import Transition
+
+OMEGA = math.inf
+"Count of a slot that can hold arbitrarily many tokens. Adding or subtracting a finite count leaves it unchanged."
+
+OmegaCounts = tuple[int | float, ...]
+"A count vector that may contain `OMEGA`."
+
+
+def omega_counts(compiled: CompiledNet, marking: Marking) -> OmegaCounts:
+    """Returns the count vector of a marking, ignoring tokens of colors that no arc weight mentions."""
+    return tuple(compiled.counts(marking))
+
+
+def support(counts: OmegaCounts) -> int:
+    """Returns a bit mask of the slots of a count vector that hold tokens."""
+    mask = 0
+    for slot, count in enumerate(counts):
+        if count:
+            mask |= 1 << slot
+    return mask
+
+
+class PathIndex:
+    """The markings on the path from the initial marking to the one being expanded, indexed by support."""
+
+    def __init__(self):
+        self._by_support: dict[int, list[OmegaCounts]] = {}
+
+    def push(self, counts: OmegaCounts):
+        self._by_support.setdefault(support(counts), []).append(counts)
+
+    def pop(self, counts: OmegaCounts):
+        mask = support(counts)
+        markings = self._by_support[mask]
+        markings.pop()
+        if not markings:
+            del self._by_support[mask]
+
+    def covered_by(self, counts: OmegaCounts) -> Iterator[OmegaCounts]:
+        """Generates the markings on the path that `counts` strictly covers."""
+        mask = support(counts)
+        for ancestor_mask, ancestors in list(self._by_support.items()):
+            if ancestor_mask & ~mask:
+                continue
+            for ancestor in ancestors:
+                if ancestor != counts and all(count >= previous for count, previous in zip(counts, ancestor)):
+                    yield ancestor
+
+    def accelerate(self, counts: OmegaCounts) -> OmegaCounts:
+        """Returns `counts` with `OMEGA` in every slot that has grown since a marking on the path it covers."""
+        while True:
+            accelerated = list(counts)
+            for ancestor in self.covered_by(counts):
+                for slot, previous in enumerate(ancestor):
+                    if accelerated[slot] > previous:
+                        accelerated[slot] = OMEGA
+            accelerated = tuple(accelerated)
+            if accelerated == counts:
+                return counts
+            counts = accelerated
+
+
+@define(frozen=True)
+class CoverabilityGraph:
+    """A Karp–Miller coverability graph, with markings numbered in order of discovery."""
+
+    compiled: CompiledNet
+
+    markings: Sequence[OmegaCounts]
+    "Count vectors, possibly containing `OMEGA`, of the markings in the graph. The initial marking is first."
+
+    edges: Sequence[tuple[int, Transition, int]]
+    "Source marking number, transition, and target marking number of each edge."
+
+    def is_bounded(self) -> bool:
+        """Returns True if the net has finitely many reachable markings (ignoring token identity and data)."""
+        return not any(OMEGA in counts for counts in self.markings)
+
+    def place_bounds(self) -> Mapping[Place, int | float]:
+        """Returns the greatest number of tokens each place can hold, which is `OMEGA` for unbounded places."""
+        n_colors = self.compiled.n_colors
+        return {
+            place: max(sum(counts[index * n_colors : (index + 1) * n_colors]) for counts in self.markings)
+            for index, place in enumerate(self.compiled.places)
+        }
+
+    def unbounded_places(self) -> set[Place]:
+        return {place for place, bound in self.place_bounds().items() if bound == OMEGA}
+
+    def covers(self, marking: Marking) -> bool:
+        """Returns True if a marking with at least the given tokens of each color in each place is reachable."""
+        target = omega_counts(self.compiled, marking)
+        return any(all(count >= wanted for count, wanted in zip(counts, target)) for counts in self.markings)
+
+    def dead_transitions(self) -> set[Transition]:
+        """Returns the transitions that can never occur."""
+        return set(self.compiled.transitions) - {transition for source, transition, target in self.edges}
+
+
+def check_supported(net: PetriNet, compiled: CompiledNet):
+    """
+    Raises `ValueError` if the net has transitions that count vectors cannot describe.
+
+    Transitions without arcs are allowed: they are never enabled, and `CompiledNet.enabled` never yields them.
+    """
+    unsupported = [
+        transition
+        for index, transition in enumerate(compiled.transitions)
+        if not compiled.weight_only[index]
+        and (net.node_inputs.get(transition) or net.node_outputs.get(transition))
+        or any(compiled.inhibit[index * compiled.n_places : (index + 1) * compiled.n_places])
+    ]
+    if unsupported:
+        raise ValueError(
+            "Coverability requires transitions described by arc weights alone, without inhibitor arcs.",
+            unsupported,
+        )
+
+
+def fire(compiled: CompiledNet, counts: OmegaCounts, transition_index: int) -> OmegaCounts:
+    """Returns the ω-marking resulting from a transition occurring."""
+    offset = transition_index * compiled.width
+    pre, post = compiled.pre, compiled.post
+    return tuple(count - pre[offset + slot] + post[offset + slot] for slot, count in enumerate(counts))
+
+
+def coverability_graph(net: PetriNet, initial_marking: Marking) -> CoverabilityGraph:
+    """
+    Builds the Karp–Miller coverability graph of a net from an initial marking.
+
+    Only the colors and quantities of tokens are considered. Raises `ValueError` if any transition has guards,
+    transforms, reset, transfer, or inhibitor arcs, whose effects count vectors cannot describe.
+    """
+    compiled = net.compiled
+    check_supported(net, compiled)
+    initial = omega_counts(compiled, initial_marking)
+    markings = [initial]
+    numbers = {initial: 0}
+    edges = []
+    path = PathIndex()
+    path.push(initial)
+    stack = [(0, compiled.enabled(initial))]
+    while stack:
+        number, transitions = stack[-1]
+        transition_index = next(transitions, None)
+        if transition_index is None:
+            stack.pop()
+            path.pop(markings[number])
+            continue
+        counts = path.accelerate(fire(compiled, markings[number], transition_index))
+        target = numbers.get(counts)
+        if target is None:
+            target = numbers[counts] = len(markings)
+            markings.append(counts)
+            path.push(counts)
+            stack.append((target, compiled.enabled(counts)))
+        edges.append((number, compiled.transitions[transition_index], target))
+    return CoverabilityGraph(compiled, markings, edges)
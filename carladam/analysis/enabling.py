@@ -0,0 +1,104 @@
+"""
+Bulk evaluation of which transitions are enabled, across many markings at once.
+
+Markings are converted to a count tensor (markings × places × colors). Transitions whose behavior depends only on
+arc weights (see `CompiledNet.weight_only`) are then evaluated for every marking in a single vectorized computation.
+Other transitions, having guards or transforms, are evaluated in a second pass, one marking at a time.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy
+
+from carladam.petrinet.compiled import CompiledNet
+from carladam.petrinet.marking import Marking, pmarking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.transition import Transition
+
+CHUNK_ELEMENTS = 1 << 22
+"Upper bound on the size of intermediate arrays, used to process large batches of markings in chunks."
+
+
+def count_tensor(compiled: CompiledNet, markings: Sequence[Marking]) -> numpy.ndarray:
+    """
+    Returns the counts of each color in each place for each marking, as a markings × places × colors array.
+
+    Tokens of colors that no arc weight mentions cannot affect arc weights, so they are not counted.
+    """
+    counts = numpy.zeros((len(markings), compiled.n_places, compiled.n_colors), dtype=numpy.int64)
+    place_index, color_index = compiled.place_index, compiled.color_index
+    for marking_index, marking in enumerate(markings):
+        for place, tokens in marking.items():
+            row = counts[marking_index, place_index[place]]
+            for token in tokens:
+                if token.color in color_index:
+                    row[color_index[token.color]] += 1
+    return counts
+
+
+def occupancy(compiled: CompiledNet, markings: Sequence[Marking]) -> numpy.ndarray:
+    """Returns a markings × places array that is True where a place holds tokens of any color."""
+    occupied = numpy.zeros((len(markings), compiled.n_places), dtype=bool)
+    place_index = compiled.place_index
+    for marking_index, marking in enumerate(markings):
+        for place, tokens in marking.items():
+            if tokens:
+                occupied[marking_index, place_index[place]] = True
+    return occupied
+
+
+def weight_enabled_matrix(
+    compiled: CompiledNet, counts: numpy.ndarray, occupied: numpy.ndarray | None = None
+) -> numpy.ndarray:
+    """
+    Returns a markings × transitions array that is True where a transition is enabled by arc weights alone.
+
+    `counts` is a markings × places × colors count tensor, or a markings × slots array of count vectors.
+    `occupied` is a markings × places array of places holding tokens, used by inhibitor arcs;
+    by default it is derived from `counts`.
+    """
+    counts = numpy.asarray(counts, dtype=numpy.int64).reshape(len(counts), compiled.width)
+    if occupied is None:
+        occupied = counts.reshape(len(counts), compiled.n_places, compiled.n_colors).any(axis=2)
+    shape = (compiled.n_transitions, compiled.width)
+    pre = numpy.frombuffer(compiled.pre, dtype=numpy.int64).reshape(shape)
+    test = numpy.frombuffer(compiled.test, dtype=numpy.int64).reshape(shape)
+    requirement = numpy.maximum(pre, test)
+    inhibit = numpy.frombuffer(compiled.inhibit, dtype=numpy.int64).reshape(compiled.n_transitions, compiled.n_places)
+
+    # Inhibitor arcs: a transition is disabled if any place inhibiting it holds tokens.
+    enabled = (occupied.astype(numpy.int64) @ inhibit.T) == 0
+
+    # Input and read arcs: every slot must hold at least the quantity required.
+    chunk = max(1, CHUNK_ELEMENTS // max(1, requirement.size))
+    for start in range(0, len(counts), chunk):
+        stop = start + chunk
+        satisfied = (counts[start:stop, None, :] >= requirement[None, :, :]).all(axis=2)
+        enabled[start:stop] &= satisfied
+    return enabled
+
+
+def enabled_matrix(net: PetriNet, markings: Sequence[Marking]) -> numpy.ndarray:
+    """
+    Returns a markings × transitions array that is True where a transition is enabled in a marking.
+
+    Columns are ordered as `net.compiled.transitions`.
+    Results are the same as calling `PetriNet.transition_is_enabled` for every marking and transition.
+    """
+    compiled = net.compiled
+    enabled = weight_enabled_matrix(compiled, count_tensor(compiled, markings), occupancy(compiled, markings))
+    guarded = [index for index, weight_only in enumerate(compiled.weight_only) if not weight_only]
+    if guarded:
+        pmarkings = [pmarking(marking) for marking in markings]
+        for index in guarded:
+            transition = compiled.transitions[index]
+            enabled[:, index] = [net.transition_is_enabled(marking, transition) for marking in pmarkings]
+    return enabled
+
+
+def enabled_transitions(net: PetriNet, markings: Sequence[Marking]) -> list[frozenset[Transition]]:
+    """Returns the set of transitions enabled in each of the given markings."""
+    transitions = net.compiled.transitions
+    return [frozenset(transitions[index] for index in row.nonzero()[0]) for row in enabled_matrix(net, markings)]
@@ -0,0 +1,174 @@
+"""
+Place and transition invariants, computed from the net's structure alone.
+
+The incidence matrix of a net holds, for each place (or each color in each place) and each transition,
+the number of tokens the transition adds to the place less the number it removes.
+
+A P-invariant is a weighting of places whose weighted token count no transition changes: a conservation law,
+holding in every reachable marking. A T-invariant is a number of occurrences of each transition that together
+leave every marking unchanged, as a cycle of behavior would. Both are the non-negative integer solutions of
+a system of linear equations in the incidence matrix, found here with the Farkas algorithm, which eliminates one
+column at a time by combining rows of opposite signs. The minimal solutions it returns generate all others.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> net = PetriNet.new(a := Place("A"), b := Place("B"), f := Transition("F"), g := Transition("G"),
+    ...                    a >> f, f >> b, b >> g, g >> a)
+    >>> [{place.name: weight for place, weight in invariant.items()} for invariant in p_invariants(net)]
+    [{'A': 1, 'B': 1}]
+    >>> [{transition.name: weight for transition, weight in invariant.items()} for invariant in t_invariants(net)]
+    [{'F': 1, 'G': 1}]
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, Mapping
+
+import numpy
+from attr import define
+
+from carladam.petrinet.arc import ArcKind
+from carladam.petrinet.color import Color
+from carladam.petrinet.marking import Marking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.transition import Transition
+
+Invariant = Mapping[Hashable, int]
+"Positive weight of each place, (place, color) pair, or transition in an invariant's support."
+
+
+@define(frozen=True)
+class Incidence:
+    """An incidence matrix, with the place or (place, color) pair of each row and the transition of each column."""
+
+    rows: tuple[Place | tuple[Place, Color], ...]
+
+    transitions: tuple[Transition, ...]
+
+    matrix: numpy.ndarray
+    "Tokens added less tokens removed (rows × transitions)."
+
+
+def check_weights_describe_counts(net: PetriNet):
+    """Raises `ValueError` if any arc changes token counts in ways its weight does not describe."""
+    arcs = [
+        arc
+        for arc in net.arcs
+        if arc.transform is not None
+        or getattr(arc, "kind", None) is ArcKind.RESET
+        or getattr(arc, "transfer_from", None) is not None
+    ]
+    if arcs:
+        raise ValueError("Invariants require arcs whose weights describe the tokens they move.", arcs)
+
+
+def incidence_matrix(net: PetriNet, by_color: bool = False) -> Incidence:
+    """
+    Returns the incidence matrix of a net, with transitions ordered as `net.compiled.transitions`.
+
+    Rows are the net's places, ordered as `net.compiled.places`, with all colors counted together.
+    If `by_color` is True, rows are instead each (place, color) pair that an arc weight mentions.
+    Read and inhibitor arcs move no tokens, and so do not contribute.
+    """
+    check_weights_describe_counts(net)
+    compiled = net.compiled
+    shape = (compiled.n_transitions, compiled.n_places, compiled.n_colors)
+    pre = numpy.frombuffer(compiled.pre, dtype=numpy.int64).reshape(shape)
+    post = numpy.frombuffer(compiled.post, dtype=numpy.int64).reshape(shape)
+    test = numpy.frombuffer(compiled.test, dtype=numpy.int64).reshape(shape)
+    change = post - pre
+    if not by_color:
+        return Incidence(compiled.places, compiled.transitions, change.sum(axis=2).T)
+    used = (pre | post | test).any(axis=0)
+    rows = tuple(
+        (place, color)
+        for place_index, place in enumerate(compiled.places)
+        for color_index, color in enumerate(compiled.colors)
+        if used[place_index, color_index]
+    )
+    return Incidence(rows, compiled.transitions, change[:, used].T)
+
+
+def farkas(matrix: numpy.ndarray) -> numpy.ndarray:
+    """
+    Returns the minimal-support non-negative integer solutions `y` of `y @ matrix == 0`, one per row.
+
+    Every non-negative solution is a non-negative combination of those returned. Each solution is divided by
+    the greatest common divisor of its entries, and solutions are returned in lexicographic order.
+    """
+    n_rows, n_columns = matrix.shape
+    rows = numpy.hstack([numpy.asarray(matrix, dtype=numpy.int64), numpy.eye(n_rows, dtype=numpy.int64)])
+    for column in range(n_columns):
+        values = rows[:, column]
+        positive, negative = rows[values > 0], rows[values < 0]
+        # Combine each row having a positive entry in this column with each having a negative one, cancelling it.
+        combined = (
+            positive[:, None, :] * -negative[None, :, column, None]
+            + negative[None, :, :] * positive[:, None, column, None]
+        ).reshape(-1, rows.shape[1])
+        rows = numpy.unique(normalized(numpy.vstack([rows[values == 0], combined])), axis=0)
+        rows = rows[minimal_support(rows[:, n_columns:] != 0, strict=True)]
+    solutions = numpy.unique(rows[:, n_columns:], axis=0)
+    return solutions[minimal_support(solutions != 0, strict=False)]
+
+
+def normalized(rows: numpy.ndarray) -> numpy.ndarray:
+    """Returns rows divided by the greatest common divisor of their entries."""
+    divisors = numpy.gcd.reduce(rows, axis=1)
+    return rows // numpy.maximum(divisors, 1)[:, None]
+
+
+def minimal_support(supports: numpy.ndarray, strict: bool) -> numpy.ndarray:
+    """
+    Returns a mask of the rows whose support contains no other row's, given each row's support.
+
+    If `strict` is True, rows whose support equals another's are kept.
+    """
+    supports = supports.astype(numpy.int64)
+    # outside[k, i] is the number of entries in the support of row k but not of row i.
+    outside = supports @ (1 - supports).T
+    sizes = supports.sum(axis=1)
+    contains = outside == 0
+    numpy.fill_diagonal(contains, False)
+    if strict:
+        contains &= sizes[:, None] < sizes[None, :]
+    return ~contains.any(axis=0)
+
+
+def p_invariants(net: PetriNet, by_color: bool = False) -> list[Invariant]:
+    """
+    Returns the minimal P-invariants of a net, as the positive weight of each place in their support.
+
+    If `by_color` is True, weights are given for (place, color) pairs instead; see `incidence_matrix`.
+    """
+    incidence = incidence_matrix(net, by_color)
+    return invariants(farkas(incidence.matrix), incidence.rows)
+
+
+def t_invariants(net: PetriNet, by_color: bool = False) -> list[Invariant]:
+    """
+    Returns the minimal T-invariants of a net, as the positive number of occurrences of each transition in their
+    support.
+
+    If `by_color` is True, each color must be reproduced separately; see `incidence_matrix`.
+    """
+    incidence = incidence_matrix(net, by_color)
+    return invariants(farkas(incidence.matrix.T), incidence.transitions)
+
+
+def invariants(solutions: numpy.ndarray, nodes: tuple) -> list[Invariant]:
+    return [{nodes[index]: int(solution[index]) for index in solution.nonzero()[0]} for solution in solutions]
+
+
+def weighted_count(invariant: Invariant, marking: Marking) -> int:
+    """
+    Returns the weighted number of tokens in a marking, which a P-invariant keeps equal in every reachable marking.
+    """
+    total = 0
+    for node, weight in invariant.items():
+        if isinstance(node, tuple):
+            place, color = node
+            total += weight * sum(1 for token in marking.get(place, ()) if token.color == color)
+        else:
+            total += weight * len(marking.get(node, ()))
+    return total
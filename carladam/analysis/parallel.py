@@ -0,0 +1,275 @@
+"""
+Reachability exploration spread across worker processes.
+
+States are partitioned among workers by the hash of their key: each worker owns one shard of the visited set,
+along with the markings in that shard. Exploration proceeds one breadth-first level at a time. Each worker
+expands the markings it owns in the current level, and sends each successor, in one batch per worker,
+to the worker owning it. Owners then deduplicate the successors they receive against their shard.
+The parent process only routes batches and numbers new states.
+
+New states are numbered in the same order as `explore` numbers them breadth-first, by the first edge that
+reaches them, so the resulting graph is identical to the one `reachability_graph` returns, whatever the number
+of workers.
+
+Workers are started with the `fork` method, inheriting the net (including transition functions and guards,
+which need not be picklable) and the parent's hash seed, so all processes agree on which worker owns each state.
+Markings are pickled to pass between processes, so token `data` must be picklable.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+from multiprocessing.connection import Connection
+from typing import Any, Hashable, Sequence
+
+from carladam.analysis.reachability import (
+    Exploration,
+    MarkingKey,
+    ReachabilityGraph,
+    canonical_key,
+    successors,
+)
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+
+EncodedMarking = tuple[tuple[int, tuple], ...]
+"A marking as (place index, tokens) pairs, which pickles smaller than a map from `Place`s."
+
+SEED = -1
+"Source and transition index of the pseudo-edge that reaches the initial marking."
+
+
+def encode_marking(marking: PMarking, place_index: dict[Place, int]) -> EncodedMarking:
+    return tuple((place_index[place], tuple(tokens)) for place, tokens in marking.items() if tokens)
+
+
+def decode_marking(encoded: EncodedMarking, places: Sequence[Place]) -> PMarking:
+    return pmarking({places[index]: set(tokens) for index, tokens in encoded})
+
+
+class Shard:
+    """The part of an exploration owned by one worker: the states whose key hashes to its index."""
+
+    def __init__(self, net: PetriNet, key: MarkingKey, index: int, count: int, keep_markings: bool):
+        self.net = net
+        self.key = key
+        self.index = index
+        self.count = count
+        self.keep_markings = keep_markings
+        self.places = tuple(sorted(net.places, key=lambda place: (place.name, place.id)))
+        self.place_index = {place: index for index, place in enumerate(self.places)}
+        self.transition_index = {transition: index for index, transition in enumerate(sorted(net.transitions))}
+        self.visited: dict[Hashable, int] = {}
+        self.markings: dict[int, EncodedMarking] = {}
+        self.frontier: list[tuple[int, PMarking]] = []
+        # State found in the current level, but not yet numbered: key → (first edge reaching it, marking).
+        self.found: dict[Hashable, tuple[tuple[int, int], PMarking]] = {}
+        self.unresolved_edges: list[tuple[int, int, Hashable]] = []
+        # Successors received, or kept from this shard's own expansion: (source, transition index, marking, key).
+        self.inbox: list[tuple[int, int, PMarking, Hashable]] = []
+
+    def expand(self, at_depth_limit: bool) -> tuple[list[bytes], bool]:
+        """
+        Returns the successors of this shard's current level, as one pickled batch per owning shard,
+        and whether every successor was included.
+
+        Successors this shard owns itself are kept, unpickled, for the next call to `receive`.
+        """
+        batches: list[list] = [[] for _ in range(self.count)]
+        complete = True
+        for number, marking in self.frontier:
+            for transition, target in successors(self.net, marking):
+                if at_depth_limit:
+                    complete = False
+                    break
+                key = self.key(target)
+                owner = hash(key) % self.count
+                if owner == self.index:
+                    self.inbox.append((number, self.transition_index[transition], target, key))
+                else:
+                    encoded = encode_marking(target, self.place_index)
+                    batches[owner].append((number, self.transition_index[transition], encoded))
+        self.frontier = []
+        return [pickle.dumps(batch, pickle.HIGHEST_PROTOCOL) for batch in batches], complete
+
+    def receive(self, blobs: Sequence[bytes]) -> list[tuple[int, int]]:
+        """Deduplicates received successors, returning the first edge reaching each state not seen before."""
+        for blob in blobs:
+            for source, transition_index, encoded in pickle.loads(blob):
+                marking = decode_marking(encoded, self.places)
+                self.inbox.append((source, transition_index, marking, self.key(marking)))
+        for source, transition_index, marking, key in self.inbox:
+            self.unresolved_edges.append((source, transition_index, key))
+            if key in self.visited:
+                continue
+            edge = (source, transition_index)
+            found = self.found.get(key)
+            if found is None or edge < found[0]:
+                self.found[key] = edge, marking
+        self.inbox = []
+        return [edge for edge, marking in self.found.values()]
+
+    def number(self, numbers: Sequence[int | None]) -> list[tuple[int, int, int]]:
+        """
+        Numbers the states found in the current level, returning the edges received since the last call.
+
+        `numbers` holds the number of each state in the order `receive` returned them, or None for states
+        beyond the exploration's `max_states`, which are discarded along with the edges that reach them.
+        """
+        for (key, (edge, marking)), number in zip(self.found.items(), numbers):
+            if number is None:
+                continue
+            self.visited[key] = number
+            self.frontier.append((number, marking))
+            if self.keep_markings:
+                self.markings[number] = encode_marking(marking, self.place_index)
+        self.found = {}
+        edges = []
+        for source, transition_index, key in self.unresolved_edges:
+            target = self.visited.get(key)
+            if target is not None and source != SEED:
+                edges.append((source, transition_index, target))
+        self.unresolved_edges = []
+        return edges
+
+    def encoded_markings(self) -> dict[int, EncodedMarking]:
+        """Returns the markings of this shard by number, if kept."""
+        return self.markings
+
+
+def serve(connection: Connection, shard: Shard):
+    """Runs a worker, calling methods of its shard as the parent process requests."""
+    while True:
+        method, args = connection.recv()
+        if method is None:
+            break
+        connection.send(getattr(shard, method)(*args))
+    connection.close()
+
+
+class LocalPool:
+    """A single `Shard` in the current process, for explorations not worth starting a worker process for."""
+
+    def __init__(self, net: PetriNet, key: MarkingKey, keep_markings: bool):
+        self.shard = Shard(net, key, 0, 1, keep_markings)
+
+    def call(self, method: str, args: Sequence[tuple] | None = None) -> list[Any]:
+        return [getattr(self.shard, method)(*(args[0] if args is not None else ()))]
+
+    def close(self):
+        pass
+
+
+class WorkerPool:
+    """Worker processes, each serving one `Shard`."""
+
+    def __init__(self, net: PetriNet, key: MarkingKey, workers: int, keep_markings: bool):
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:  # pragma: nocover
+            raise RuntimeError("Parallel exploration requires the 'fork' start method.") from None
+        self.connections: list[Connection] = []
+        self.processes = []
+        for index in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=serve, args=(child, Shard(net, key, index, workers, keep_markings)), daemon=True
+            )
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def call(self, method: str, args: Sequence[tuple] | None = None) -> list[Any]:
+        """Calls a method of every shard, with per-shard arguments, returning each shard's result."""
+        for index, connection in enumerate(self.connections):
+            connection.send((method, args[index] if args is not None else ()))
+        return [connection.recv() for connection in self.connections]
+
+    def close(self):
+        for connection in self.connections:
+            connection.send((None, ()))
+            connection.close()
+        for process in self.processes:
+            process.join()
+
+
+def number_states(
+    found: Sequence[Sequence[tuple[int, int]]], exploration: Exploration, max_states: int | None
+) -> list[list[int | None]]:
+    """
+    Numbers the states each shard found, in order of the first edge reaching them, continuing from the number
+    of states already found; states beyond `max_states` are left unnumbered.
+    """
+    ordered = sorted(
+        (edge, shard, position) for shard, edges in enumerate(found) for position, edge in enumerate(edges)
+    )
+    numbers: list[list[int | None]] = [[None] * len(edges) for edges in found]
+    for edge, shard, position in ordered:
+        if max_states is not None and exploration.states >= max_states:
+            exploration.complete = False
+            break
+        numbers[shard][position] = exploration.states
+        exploration.states += 1
+    return numbers
+
+
+def parallel_reachability_graph(
+    net: PetriNet,
+    initial_marking: Marking,
+    *,
+    workers: int | None = None,
+    key: MarkingKey = canonical_key,
+    max_states: int | None = None,
+    max_depth: int | None = None,
+    keep_markings: bool = True,
+) -> ReachabilityGraph:
+    """
+    Explores the markings reachable from `initial_marking` breadth-first, using `workers` processes.
+
+    Returns the same graph as `reachability_graph` with the same options.
+    The number of workers defaults to the number of CPUs; a single worker runs in the current process.
+    If `keep_markings` is False, markings are not collected from the workers, and the graph holds only edges.
+    """
+    workers = workers or os.cpu_count() or 1
+    initial_marking = pmarking(initial_marking)
+    places = tuple(sorted(net.places, key=lambda place: (place.name, place.id)))
+    transitions = sorted(net.transitions)
+    exploration = Exploration()
+    edges: list[tuple[int, int, int]] = []
+    pool = WorkerPool(net, key, workers, keep_markings) if workers > 1 else LocalPool(net, key, keep_markings)
+    try:
+        seed = pickle.dumps([(SEED, SEED, encode_marking(initial_marking, {p: i for i, p in enumerate(places)}))])
+        inboxes = [[seed] if index == hash(key(initial_marking)) % workers else [] for index in range(workers)]
+        depth = -1
+        while True:
+            # Deduplicate the states each shard received, then number the new ones in breadth-first order.
+            found = pool.call("receive", [(inbox,) for inbox in inboxes])
+            numbers = number_states(found, exploration, max_states)
+            for shard_edges in pool.call("number", [(shard_numbers,) for shard_numbers in numbers]):
+                edges.extend(shard_edges)
+            if not any(number is not None for shard_numbers in numbers for number in shard_numbers):
+                break
+            depth += 1
+            exploration.depth = depth
+            # Expand the new level, sending each successor to the shard that owns it.
+            at_depth_limit = max_depth is not None and depth >= max_depth
+            expanded = pool.call("expand", [(at_depth_limit,)] * workers)
+            exploration.complete = exploration.complete and all(complete for batches, complete in expanded)
+            inboxes = [[batches[index] for batches, complete in expanded] for index in range(workers)]
+        markings = {}
+        if keep_markings:
+            for shard_markings in pool.call("encoded_markings"):
+                markings.update(shard_markings)
+    finally:
+        pool.close()
+    edges.sort()
+    exploration.edges = len(edges)
+    return ReachabilityGraph(
+        markings=[decode_marking(markings[number], places) for number in range(len(markings))],
+        edges=[(source, transitions[transition_index], target) for source, transition_index, target in edges],
+        exploration=exploration,
+    )
@@ -0,0 +1,269 @@
+"""
+Exploration of the markings reachable from an initial marking.
+
+`explore` visits reachable markings breadth-first or depth-first, firing transitions with the same semantics as
+`PetriNet.enabled_transitions` and `PetriNet.marking_after_transition`. Each marking found is numbered in order
+of discovery, and each firing is passed to an `on_edge` callback as it happens, so a graph far larger than memory
+can be streamed to disk. Only the keys of markings already seen, and the markings waiting to be explored, are held.
+
+Transitions create new tokens, with new IDs, each time they occur, so markings that differ only in token IDs
+are treated as the same state: by default, markings are compared using `canonical_key`.
+`carladam.analysis.symmetry.symmetric_key` also treats as one state markings that differ only by swapping the
+contents of interchangeable copies of part of a net.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> net = PetriNet.new(a := Place("A"), b := Place("B"), f := Transition("F"), g := Transition("G"),
+    ...                    a >> f, f >> b, b >> g, g >> a)
+    >>> graph = reachability_graph(net, {a: {Token()}})
+    >>> len(graph.markings), [(source, transition.name, target) for source, transition, target in graph.edges]
+    (2, [(0, 'F', 1), (1, 'G', 0)])
+"""
+
+from __future__ import annotations
+
+import json
+from collections import Counter, deque
+from enum import Enum
+from typing import Callable, Hashable, IO, Iterable, Iterator, Mapping, NamedTuple
+
+from attr import define, field
+from pyrsistent import PMap, freeze
+
+from carladam.analysis.reduction import reduce_net
+from carladam.analysis.stubborn import StubbornSets
+from carladam.petrinet.errors import TransitionNotEnabled
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.occurrence import Occurrence
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.record import Record
+from carladam.petrinet.token import Token
+from carladam.petrinet.transition import Transition
+
+MarkingKey = Callable[[PMarking], Hashable]
+"Function returning a key that is equal for markings to be treated as the same state."
+
+
+def canonical_key(marking: Marking) -> Hashable:
+    """
+    Returns a key identifying a marking by the color and data of the tokens in each place, ignoring token IDs.
+
+    Places without tokens are ignored, so a marking holding an empty set for a place has the same key as one
+    without that place.
+    """
+    return frozenset((place, contents_key(tokens)) for place, tokens in marking.items() if tokens)
+
+
+def contents_key(tokens: Iterable[Token]) -> Hashable:
+    """Returns a key identifying the tokens in a place by their color and data, ignoring token IDs."""
+    return frozenset(Counter((token.color, data_key(token.data)) for token in tokens).items())
+
+
+def data_key(data: Mapping) -> Hashable:
+    """Returns token `data` in a hashable form; data given as a plain `dict` is frozen."""
+    if isinstance(data, (PMap, Record)):
+        return data
+    return freeze(data)
+
+
+class Order(Enum):
+    """Order in which markings are explored."""
+
+    BREADTH_FIRST = "bfs"
+    "Explore markings in order of their distance from the initial marking; finds shortest paths."
+
+    DEPTH_FIRST = "dfs"
+    "Explore the most recently found marking first; reaches deep markings with a smaller frontier."
+
+
+class Reduction(Enum):
+    """Which of the transitions enabled in a marking are explored."""
+
+    NONE = "none"
+    "Explore every enabled transition."
+
+    STUBBORN = "stubborn"
+    """
+    Explore only the enabled transitions of a stubborn set (see `carladam.analysis.stubborn`).
+    Every reachable deadlock is still found, along with every reachable change to `visible` places, if given.
+    """
+
+
+class Edge(NamedTuple):
+    """A transition occurring in a marking, and the marking that results."""
+
+    source: int
+    "Number of the marking the transition occurred in."
+
+    transition: Transition
+
+    target: int
+    "Number of the resulting marking."
+
+    source_marking: PMarking
+
+    target_marking: PMarking
+
+
+@define
+class Exploration:
+    """Summary of an exploration."""
+
+    states: int = 0
+    "Number of distinct markings found, including the initial marking."
+
+    edges: int = 0
+    "Number of transition occurrences found."
+
+    depth: int = 0
+    "Greatest number of transitions between the initial marking and any marking explored."
+
+    complete: bool = True
+    "False if `max_states` or `max_depth` left some reachable markings or transitions unexplored."
+
+
+def successors(net: PetriNet, marking: PMarking) -> Iterator[tuple[Transition, PMarking]]:
+    """Generates each transition enabled in the marking, with the marking that results from it occurring."""
+    for transition in sorted(net.transitions):
+        try:
+            after = Occurrence(net, marking, transition).marking_after()
+        except TransitionNotEnabled:
+            continue
+        yield transition, after
+
+
+def explore(
+    net: PetriNet,
+    initial_marking: Marking,
+    *,
+    order: Order | str = Order.BREADTH_FIRST,
+    key: MarkingKey = canonical_key,
+    max_states: int | None = None,
+    max_depth: int | None = None,
+    on_state: Callable[[int, PMarking], None] | None = None,
+    on_edge: Callable[[Edge], None] | None = None,
+    reduction: Reduction | str = Reduction.NONE,
+    visible: Iterable[Place] | None = None,
+    reduce: bool = False,
+) -> Exploration:
+    """
+    Explores the markings reachable from `initial_marking`, returning a summary.
+
+    `on_state` is called with the number and marking of each distinct marking when it is first found,
+    and `on_edge` with each transition occurrence. Markings with equal `key`s are the same state,
+    and only the first of them found is explored or reported.
+
+    No more than `max_states` markings are found, and markings `max_depth` transitions from the initial marking
+    are not explored further. Depth-first exploration with a `max_depth` may leave markings unexplored that a
+    shorter path would have reached within the bound.
+
+    With `reduction="stubborn"`, fewer markings are explored, but every deadlock is still found;
+    see `carladam.analysis.stubborn` for the effect of `visible`.
+
+    With `reduce=True`, the markings of the net reduced by `carladam.analysis.reduction.reduce_net`, leaving
+    `visible` places unchanged, are explored instead. They are compared by `key` and reported as the markings of
+    the original net they stand for, and each reported transition stands for the sequence of original transitions
+    given by `ReducedNet.transitions`. State 0 is reported as `initial_marking`, although the reduced net starts
+    from it with tokens already moved along fused series. Only the markings with no token waiting along a fused
+    series are reached, so counts of states differ from the original net's, but every deadlock is found.
+    """
+    if reduce:
+        reduced = reduce_net(net, initial_marking, keep=visible or ())
+        given = pmarking(initial_marking)
+
+        def expand(number: int, marking: PMarking) -> PMarking:
+            return given if number == 0 else reduced.expand(marking)
+
+        def report_state(number: int, marking: PMarking):
+            on_state(number, expand(number, marking))
+
+        def report_edge(edge: Edge):
+            on_edge(
+                edge._replace(
+                    source_marking=expand(edge.source, edge.source_marking),
+                    target_marking=expand(edge.target, edge.target_marking),
+                )
+            )
+
+        return explore(
+            reduced.net,
+            reduced.initial_marking,
+            order=order,
+            key=lambda marking: key(reduced.expand(marking)),
+            max_states=max_states,
+            max_depth=max_depth,
+            on_state=on_state and report_state,
+            on_edge=on_edge and report_edge,
+            reduction=reduction,
+            visible=visible,
+        )
+    order = Order(order)
+    stubborn = StubbornSets(net, visible) if Reduction(reduction) is Reduction.STUBBORN else None
+    initial_marking = pmarking(initial_marking)
+    result = Exploration(states=1)
+    numbers = {key(initial_marking): 0}
+    if on_state:
+        on_state(0, initial_marking)
+    frontier = deque([(0, initial_marking, 0)])
+    take = frontier.popleft if order is Order.BREADTH_FIRST else frontier.pop
+    while frontier:
+        number, marking, depth = take()
+        result.depth = max(result.depth, depth)
+        if max_depth is not None and depth >= max_depth:
+            result.complete = result.complete and not any(successors(net, marking))
+            continue
+        if stubborn is None:
+            expanded = successors(net, marking)
+        else:
+            expanded = stubborn.successors(marking, is_new=lambda target: key(target) not in numbers)
+        for transition, target_marking in expanded:
+            target_key = key(target_marking)
+            target = numbers.get(target_key)
+            if target is None:
+                if max_states is not None and result.states >= max_states:
+                    result.complete = False
+                    continue
+                target = numbers[target_key] = result.states
+                result.states += 1
+                if on_state:
+                    on_state(target, target_marking)
+                frontier.append((target, target_marking, depth + 1))
+            result.edges += 1
+            if on_edge:
+                on_edge(Edge(number, transition, target, marking, target_marking))
+    return result
+
+
+@define
+class ReachabilityGraph:
+    """Reachability graph held in memory, with markings numbered in order of discovery."""
+
+    markings: list[PMarking] = field(factory=list)
+
+    edges: list[tuple[int, Transition, int]] = field(factory=list)
+    "Source marking number, transition, and target marking number of each transition occurrence."
+
+    exploration: Exploration = field(factory=Exploration)
+
+
+def reachability_graph(net: PetriNet, initial_marking: Marking, **options) -> ReachabilityGraph:
+    """Explores the markings reachable from `initial_marking`, keeping them all; `options` are passed to `explore`."""
+    graph = ReachabilityGraph()
+    graph.exploration = explore(
+        net,
+        initial_marking,
+        on_state=lambda number, marking: graph.markings.append(marking),
+        on_edge=lambda edge: graph.edges.append((edge.source, edge.transition, edge.target)),
+        **options,
+    )
+    return graph
+
+
+def edge_writer(file: IO[str]) -> Callable[[Edge], None]:
+    """Returns an `on_edge` callback writing each edge to `file` as a line of JSON, identifying its transition by ID."""
+
+    def write(edge: Edge):
+        file.write(json.dumps({"source": edge.source, "transition": edge.transition.id, "target": edge.target}))
+        file.write("\n")
+
+    return write
@@ -0,0 +1,316 @@
+"""
+Structural reduction: shrinking a net, before analysis, with rules that preserve its reachable markings.
+
+Models built with `arc_path` often have long chains of places and transitions that merely pass a token along.
+Every place of a chain can hold the token, multiplying the number of reachable markings, though the chain behaves
+like a single step. `reduce_net` applies classic reduction rules (see `Rule`) until none applies, and returns the
+smaller net along with how its markings and transitions stand for those of the original.
+
+Rules apply only to plain parts of a net: transitions with the default guard and function, whose arcs consume or
+produce one abstract token each, and places whose arcs all connect to such transitions. Nodes listed in `keep` are
+never removed, and places in `keep` always hold the same tokens as in the original net.
+
+The markings reached by the reduced net, expanded by `ReducedNet.expand`, are the markings of the original net in
+which no token is waiting to move along a fused series; every deadlock of the original is among them. Each
+transition of the reduced net occurs as the sequence of original transitions given by `ReducedNet.transitions`.
+
+Only `explore` and `reachability_graph` take a `reduce` option, mapping what they report back to the original net.
+Place bounds, counts of markings, invariants, and unfoldings describe markings that reduction passes over, so
+coverability graphs, symbolic reachability, unfoldings, and invariants do not take one. They may still be run on
+`ReducedNet.net` from `ReducedNet.initial_marking`, to find deadlocks whose `expand`ed markings are deadlocks of the
+original net.
+
+    >>> from carladam import PetriNet, Place, Token, Transition, arc_path
+    >>> from carladam.analysis.reachability import reachability_graph
+    >>> places = [Place(name=f"Step {index}") for index in range(10)]
+    >>> transitions = [Transition(name=f"Move {index}") for index in range(9)]
+    >>> nodes = [node for pair in zip(places, transitions) for node in pair] + places[-1:]
+    >>> net = PetriNet.new(*arc_path(*nodes))
+    >>> reduced = reduce_net(net, {places[0]: {Token()}})
+    >>> len(reachability_graph(net, {places[0]: {Token()}}).markings)
+    10
+    >>> len(reduced.net.places), len(reachability_graph(reduced.net, reduced.initial_marking).markings)
+    (1, 1)
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from enum import Enum
+from typing import Iterable, NamedTuple
+
+import attrs
+from attr import define
+from pyrsistent import PMap, PSet, pmap, pset
+
+from carladam.petrinet.arc import ArcKind, CompletedArcPT, arc, weights_are_satisfied
+from carladam.petrinet.color import Abstract
+from carladam.petrinet.compose import compose
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.token import Token
+from carladam.petrinet.transition import Transition
+from carladam.petrinet.types import PetriNetNode
+
+DEFAULT_GUARD = attrs.fields(Transition).guard.default
+DEFAULT_FN = attrs.fields(Transition).fn.default
+
+
+class Rule(Enum):
+    """A reduction rule."""
+
+    SERIES_PLACES = "series places"
+    """
+    A transition whose only input and output are two different places, and which is the only transition consuming
+    from the first place, is removed, and the first place is fused into the second.
+    """
+
+    SERIES_TRANSITIONS = "series transitions"
+    """
+    An unmarked place with one transition producing to it and one consuming from it, for which it is the only input,
+    is removed, and the consuming transition is fused into the producing one.
+    """
+
+    PARALLEL_PLACES = "parallel places"
+    """
+    A place with the same producing and consuming transitions as another place, and at least as many tokens, never
+    disables a transition the other does not, so it is removed.
+    """
+
+    SELF_LOOP_PLACES = "self-loop places"
+    """
+    A marked place that every transition consuming from it produces back to, and that only those transitions
+    produce to, never changes, so it is removed, unless that would leave a transition without arcs.
+    """
+
+
+class Step(NamedTuple):
+    """A rule applied to a net."""
+
+    rule: Rule
+
+    place: Place
+    "The place removed."
+
+    transition: Transition | None
+    "The transition removed, if any."
+
+    into: PetriNetNode | None
+    "The node the removed place or transition was fused into, or the parallel place left in its place."
+
+    tokens: PSet
+    "Tokens the removed place holds beyond those of the parallel place, or always holds if it was a self-loop."
+
+
+@define(frozen=True)
+class ReducedNet:
+    """A net reduced from an original net, with the steps taken to reduce it."""
+
+    original: PetriNet
+
+    net: PetriNet
+
+    initial_marking: PMarking
+
+    steps: tuple[Step, ...]
+
+    transitions: PMap[Transition, tuple[Transition, ...]]
+    "Sequence of transitions of the original net that each transition of the reduced net stands for."
+
+    def expand(self, marking: Marking) -> PMarking:
+        """Returns the marking of the original net that a marking of the reduced net stands for."""
+        expanded = dict(marking)
+        for step in reversed(self.steps):
+            if step.rule is Rule.PARALLEL_PLACES:
+                expanded[step.place] = pset(expanded.get(step.into, ())) | step.tokens
+            elif step.rule is Rule.SELF_LOOP_PLACES:
+                expanded[step.place] = step.tokens
+        return pmarking(expanded)
+
+
+def is_plain(net: PetriNet, transition: Transition) -> bool:
+    """Returns True if a transition has the default guard and function, and each arc moves one abstract token."""
+    if transition.guard is not DEFAULT_GUARD or transition.fn is not DEFAULT_FN:
+        return False
+    for input_arc in net.node_inputs.get(transition, ()):
+        if input_arc.kind is not ArcKind.CONSUME or input_arc.guard is not weights_are_satisfied:
+            return False
+    return all(
+        connected.transform is None
+        and getattr(connected, "transfer_from", None) is None
+        and connected.weight == {Abstract: 1}
+        for connected in (*net.node_inputs.get(transition, ()), *net.node_outputs.get(transition, ()))
+    )
+
+
+class Reducer:
+    """The plain part of a net, as it is reduced step by step."""
+
+    def __init__(self, net: PetriNet, initial_marking: Marking, keep: Iterable[PetriNetNode]):
+        self.keep = frozenset(keep)
+        self.marking = {place: pset(tokens) for place, tokens in initial_marking.items() if tokens}
+        self.inputs: dict[Transition, set[Place]] = {}
+        self.outputs: dict[Transition, set[Place]] = {}
+        for transition in net.transitions:
+            if is_plain(net, transition):
+                self.inputs[transition] = {arc.src for arc in net.node_inputs.get(transition, ())}
+                self.outputs[transition] = {arc.dest for arc in net.node_outputs.get(transition, ())}
+        self.producers: dict[Place, set[Transition]] = {}
+        self.consumers: dict[Place, set[Transition]] = {}
+        for place in net.places:
+            producers = {arc.src for arc in net.node_inputs.get(place, ())}
+            consumers = {arc.dest for arc in net.node_outputs.get(place, ())}
+            if all(transition in self.inputs for transition in producers | consumers) and all(
+                token.color is Abstract for token in self.marking.get(place, ())
+            ):
+                self.producers[place], self.consumers[place] = producers, consumers
+        self.steps: list[Step] = []
+        self.sequences = {transition: (transition,) for transition in net.transitions}
+
+    def reduce(self):
+        """Applies the rules until none applies."""
+        while self.series_places() | self.series_transitions() | self.parallel_places() | self.self_loop_places():
+            pass
+
+    def remove_place(self, place: Place):
+        for transition in self.producers.pop(place):
+            self.outputs[transition].discard(place)
+        for transition in self.consumers.pop(place):
+            self.inputs[transition].discard(place)
+        self.marking.pop(place, None)
+
+    def remove_transition(self, transition: Transition):
+        for place in self.inputs.pop(transition):
+            if place in self.consumers:
+                self.consumers[place].discard(transition)
+        for place in self.outputs.pop(transition):
+            if place in self.producers:
+                self.producers[place].discard(transition)
+        del self.sequences[transition]
+
+    def series_places(self) -> bool:
+        applied = False
+        for transition in sorted(self.inputs):
+            if transition not in self.inputs or transition in self.keep:
+                continue
+            if len(self.inputs[transition]) != 1 or len(self.outputs[transition]) != 1:
+                continue
+            (place,), (into,) = self.inputs[transition], self.outputs[transition]
+            if place == into or not {place, into} <= self.producers.keys() or {place, into} & self.keep:
+                continue
+            if self.consumers[place] != {transition} or any(
+                into in self.outputs[producer] for producer in self.producers[place]
+            ):
+                continue
+            for producer in self.producers[place]:
+                self.outputs[producer].add(into)
+                self.producers[into].add(producer)
+                self.sequences[producer] += self.sequences[transition]
+            tokens = set(self.marking.get(into, ()))
+            for token in self.marking.get(place, ()):
+                # A token produced to several places is the same object in each, but counts once in each.
+                tokens.add(Token() if token in tokens else token)
+            if tokens:
+                self.marking[into] = pset(tokens)
+            self.remove_transition(transition)
+            self.remove_place(place)
+            self.steps.append(Step(Rule.SERIES_PLACES, place, transition, into, pset()))
+            applied = True
+        return applied
+
+    def series_transitions(self) -> bool:
+        applied = False
+        for place in sorted(self.producers):
+            if place not in self.producers or place in self.keep or self.marking.get(place):
+                continue
+            if len(self.producers[place]) != 1 or len(self.consumers[place]) != 1:
+                continue
+            (into,), (transition,) = self.producers[place], self.consumers[place]
+            if into == transition or {into, transition} & self.keep or self.inputs[transition] != {place}:
+                continue
+            # Tokens reach the consuming transition's outputs sooner, which only plain places can ignore.
+            outputs = self.outputs[transition]
+            if not outputs <= self.producers.keys() or outputs & self.outputs[into]:
+                continue
+            for output in outputs:
+                self.outputs[into].add(output)
+                self.producers[output].add(into)
+            self.sequences[into] += self.sequences[transition]
+            self.remove_transition(transition)
+            self.remove_place(place)
+            self.steps.append(Step(Rule.SERIES_TRANSITIONS, place, transition, into, pset()))
+            applied = True
+        return applied
+
+    def parallel_places(self) -> bool:
+        applied = False
+        groups = defaultdict(list)
+        for place in sorted(self.producers):
+            groups[frozenset(self.producers[place]), frozenset(self.consumers[place])].append(place)
+        for group in groups.values():
+            counts = {place: len(self.marking.get(place, ())) for place in group}
+            into = min(group, key=lambda place: (counts[place], place not in self.keep, place))
+            for place in sorted(group):
+                if place != into and place not in self.keep:
+                    surplus = sorted(self.marking.get(place, ()), key=lambda token: token.id)[counts[into] :]
+                    self.remove_place(place)
+                    self.steps.append(Step(Rule.PARALLEL_PLACES, place, None, into, pset(surplus)))
+                    applied = True
+        return applied
+
+    def self_loop_places(self) -> bool:
+        applied = False
+        for place in sorted(self.producers):
+            if place in self.keep or not self.marking.get(place) or not self.consumers[place]:
+                continue
+            # A transition left without arcs would never be enabled.
+            if self.producers[place] == self.consumers[place] and all(
+                self.inputs[transition] | self.outputs[transition] != {place} for transition in self.consumers[place]
+            ):
+                tokens = self.marking[place]
+                self.remove_place(place)
+                self.steps.append(Step(Rule.SELF_LOOP_PLACES, place, None, None, tokens))
+                applied = True
+        return applied
+
+
+def reduce_net(net: PetriNet, initial_marking: Marking, keep: Iterable[PetriNetNode] = ()) -> ReducedNet:
+    """
+    Returns the net reduced by applying every `Rule` until none applies, leaving the nodes in `keep` unchanged.
+
+    Some rules depend on the initial marking, so the reduced net is only equivalent to the original when starting
+    from `ReducedNet.initial_marking`.
+    """
+    reducer = Reducer(net, initial_marking, keep)
+    plain = set(reducer.inputs)
+    reducer.reduce()
+    removed_places = {step.place for step in reducer.steps}
+    removed_transitions = {step.transition for step in reducer.steps}
+    original_arcs = {(member.src, member.dest): member for member in net.arcs}
+    arcs = [
+        member
+        for member in net.arcs
+        if (member.dest if isinstance(member, CompletedArcPT) else member.src) not in plain
+    ]
+    for transition in reducer.inputs:
+        for place in reducer.inputs[transition]:
+            arcs.append(original_arcs.get((place, transition)) or arc(place, transition))
+        for place in reducer.outputs[transition]:
+            arcs.append(original_arcs.get((transition, place)) or arc(transition, place))
+    reduced = compose(
+        [
+            *(place for place in net.places if place not in removed_places),
+            *(transition for transition in net.transitions if transition not in removed_transitions),
+            *arcs,
+        ]
+    )
+    return ReducedNet(
+        original=net,
+        net=reduced,
+        initial_marking=pmarking(
+            {place: tokens for place, tokens in reducer.marking.items() if place not in removed_places}
+        ),
+        steps=tuple(reducer.steps),
+        transitions=pmap(reducer.sequences),
+    )
@@ -0,0 +1,85 @@
+"""
+Slicing: cutting a net down to the part that can influence given places and transitions.
+
+`PetriNet.subnet` gives a node with its neighbors, one arc away. A property concerning a few places depends on
+more than that: on every transition that changes those places, on every place those transitions read, and so on,
+back through the net. `cone_of_influence` follows these dependencies to a fixed point:
+
+- A place depends on every transition that produces to it, consumes from it, or resets it.
+- A transition depends on every place it has an input arc from, of any kind, including read and inhibitor arcs,
+  since those places decide whether it is enabled and which tokens it receives.
+
+`slice_net` returns the net made of those nodes and the arcs among them. Its transitions are enabled exactly when
+they are in the original net, so the markings it reaches, and the sequences of its transitions that can occur,
+are those of the original net restricted to its nodes. Properties about only those nodes, such as whether a
+marking of the target places is reachable or whether a target transition can occur, can be checked on the slice.
+Deadlocks cannot, as the transitions left out may still be enabled.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> a, b, noise = Place(name="A"), Place(name="B"), Place(name="Noise")
+    >>> f, flip = Transition(name="F"), Transition(name="Flip")
+    >>> net = PetriNet.new(a, b, noise, f, flip, a >> f, f >> b, noise >> flip, flip >> noise)
+    >>> sliced = slice_net(net, places=[b])
+    >>> sorted(place.name for place in sliced.places), sorted(transition.name for transition in sliced.transitions)
+    (['A', 'B'], ['F'])
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from carladam.petrinet.arc import ArcKind, CompletedArcPT, inhibit
+from carladam.petrinet.compose import compose
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.transition import Transition
+
+
+def changers(net: PetriNet) -> dict[Place, set[Transition]]:
+    """Returns the transitions that change the tokens in each place."""
+    result = defaultdict(set)
+    for transition in net.transitions:
+        for arc in net.node_inputs.get(transition, ()):
+            if arc.kind is not ArcKind.READ and arc.guard is not inhibit:
+                result[arc.src].add(transition)
+        for arc in net.node_outputs.get(transition, ()):
+            result[arc.dest].add(transition)
+    return result
+
+
+def cone_of_influence(
+    net: PetriNet, places: Iterable[Place] = (), transitions: Iterable[Transition] = ()
+) -> tuple[frozenset[Place], frozenset[Transition]]:
+    """Returns the places and transitions of the net that can influence the given places and transitions."""
+    changed_by = changers(net)
+    relevant_places: set[Place] = set()
+    relevant_transitions: set[Transition] = set()
+    pending = [*places, *transitions]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, Place):
+            if node not in relevant_places:
+                relevant_places.add(node)
+                pending.extend(changed_by[node])
+        elif node not in relevant_transitions:
+            relevant_transitions.add(node)
+            pending.extend(arc.src for arc in net.node_inputs.get(node, ()))
+    return frozenset(relevant_places), frozenset(relevant_transitions)
+
+
+def slice_net(net: PetriNet, places: Iterable[Place] = (), transitions: Iterable[Transition] = ()) -> PetriNet:
+    """
+    Returns the part of the net that can influence the given places and transitions.
+
+    Arcs from the transitions kept to places left out are dropped; as those places are read by no transition kept,
+    dropping them changes nothing else.
+    """
+    relevant_places, relevant_transitions = cone_of_influence(net, places, transitions)
+    arcs = [
+        arc
+        for transition in relevant_transitions
+        for arc in (*net.node_inputs.get(transition, ()), *net.node_outputs.get(transition, ()))
+        if (arc.src if isinstance(arc, CompletedArcPT) else arc.dest) in relevant_places
+    ]
+    return compose([*relevant_places, *relevant_transitions, *arcs])
@@ -0,0 +1,135 @@
+"""
+Stubborn sets, for exploring fewer of the interleavings of independent transitions.
+
+In a marking, a stubborn set is a set of transitions that transitions outside it cannot interfere with:
+they can neither disable an enabled transition in the set nor enable a disabled one. Firing only the enabled
+transitions of a stubborn set, rather than every enabled transition, still reaches every deadlock, while nets
+with many independent parts explore a small fraction of their markings.
+
+Stubborn sets are computed from the structure of the net alone: which places each transition reads (the input
+places of its arcs, of any kind) and which it changes (the places it consumes from, resets, or produces to).
+Two transitions are dependent if either changes a place the other reads. This is conservative for colored nets,
+as adding tokens to a place can change which of them a transition selects.
+
+To also preserve whether markings of interest are reachable, give the places those markings concern as `visible`.
+Transitions changing visible places are then either all fired or none are, and a marking whose reduced successors
+include one already found is explored in full, so no transition is postponed forever around a cycle.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Callable, Iterable
+
+from carladam.petrinet.arc import ArcKind, inhibit
+from carladam.petrinet.marking import PMarking
+from carladam.petrinet.occurrence import Occurrence
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.transition import Transition
+
+
+class StubbornSets:
+    """Structural relations between the transitions of a net, and the stubborn sets they give in each marking."""
+
+    def __init__(self, net: PetriNet, visible: Iterable[Place] | None = None):
+        self.net = net
+        self.transitions = sorted(net.transitions)
+        self.reads: dict[Transition, frozenset[Place]] = {}
+        self.changes: dict[Transition, frozenset[Place]] = {}
+        self.producers: dict[Place, set[Transition]] = defaultdict(set)
+        self.consumers: dict[Place, set[Transition]] = defaultdict(set)
+        for transition in self.transitions:
+            inputs = net.node_inputs.get(transition, ())
+            outputs = net.node_outputs.get(transition, ())
+            removes = {arc.src for arc in inputs if arc.kind is not ArcKind.READ and arc.guard is not inhibit}
+            removes.update(arc.transfer_from for arc in outputs if arc.transfer_from is not None)
+            adds = {arc.dest for arc in outputs}
+            for place in removes:
+                self.consumers[place].add(transition)
+            for place in adds:
+                self.producers[place].add(transition)
+            self.reads[transition] = frozenset(arc.src for arc in inputs)
+            self.changes[transition] = frozenset(removes | adds)
+        readers = defaultdict(set)
+        for transition, places in self.reads.items():
+            for place in places:
+                readers[place].add(transition)
+        self.dependent: dict[Transition, frozenset[Transition]] = {
+            transition: frozenset(
+                other for place in self.reads[transition] for other in self.producers[place] | self.consumers[place]
+            )
+            | frozenset(other for place in self.changes[transition] for other in readers[place])
+            for transition in self.transitions
+        }
+        self.visible = None if visible is None else frozenset(visible)
+        self.visible_transitions = frozenset(
+            transition for transition in self.transitions if self.visible and self.changes[transition] & self.visible
+        )
+
+    def blockers(self, marking: PMarking, transition: Transition) -> Iterable[Transition]:
+        """
+        Returns transitions that include every transition able to enable a disabled transition.
+
+        If an input arc lacks tokens of some color, only the transitions producing to its place are needed;
+        if an inhibitor arc's place holds tokens, only those consuming from it. Transitions disabled by guards
+        or transforms need every transition changing any place they read.
+        """
+        if self.net.compiled.weight_only[self.net.compiled.transition_index[transition]]:
+            for arc in sorted(self.net.node_inputs.get(transition, ())):
+                tokens = marking.get(arc.src, ())
+                if arc.guard is inhibit:
+                    if tokens:
+                        return self.consumers[arc.src]
+                    continue
+                for color, quantity in arc.weight.items():
+                    if sum(1 for token in tokens if token.color == color) < quantity:
+                        return self.producers[arc.src]
+        return {other for place in self.reads[transition] for other in self.producers[place] | self.consumers[place]}
+
+    def stubborn_set(self, marking: PMarking, enabled: set[Transition], seed: Transition) -> set[Transition]:
+        """Returns the stubborn set containing `seed`, an enabled transition, in a marking."""
+        stubborn = {seed}
+        pending = [seed]
+        while pending:
+            transition = pending.pop()
+            needed = self.dependent[transition] if transition in enabled else self.blockers(marking, transition)
+            if transition in self.visible_transitions:
+                needed = needed | self.visible_transitions
+            for other in needed:
+                if other not in stubborn:
+                    stubborn.add(other)
+                    pending.append(other)
+        return stubborn
+
+    def successors(
+        self, marking: PMarking, is_new: Callable[[PMarking], bool] | None = None
+    ) -> list[tuple[Transition, PMarking]]:
+        """
+        Returns the enabled transitions of the smallest stubborn set seeded by any enabled transition,
+        each with the marking that results from it occurring.
+
+        If `visible` places were given, and `is_new` returns False for any resulting marking,
+        every enabled transition is returned instead.
+        """
+        enabled = [
+            transition for transition in self.transitions if Occurrence(self.net, marking, transition).is_enabled()
+        ]
+        enabled_set = set(enabled)
+        chosen = enabled_set
+        for seed in enabled:
+            candidate = self.stubborn_set(marking, enabled_set, seed) & enabled_set
+            if len(candidate) < len(chosen):
+                chosen = candidate
+        fired = {transition: self.fire(marking, transition) for transition in enabled if transition in chosen}
+        if len(chosen) < len(enabled) and self.visible is not None and is_new is not None:
+            if not all(is_new(target) for target in fired.values()):
+                chosen = enabled_set
+        return [
+            (transition, fired[transition] if transition in fired else self.fire(marking, transition))
+            for transition in enabled
+            if transition in chosen
+        ]
+
+    def fire(self, marking: PMarking, transition: Transition) -> PMarking:
+        return Occurrence(self.net, marking, transition).marking_after()
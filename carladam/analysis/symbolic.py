@@ -0,0 +1,272 @@
+"""
+Symbolic reachability for 1-safe nets, whose places each hold at most one token.
+
+The marking of a 1-safe net is an assignment of a boolean variable to each place: whether it holds a token.
+Sets of markings are represented as binary decision diagrams (see `carladam.util.bdd`), whose size depends on the
+structure of the set rather than the number of markings in it, so state spaces of 10^12 markings and more can be
+computed, counted, and searched for deadlocks without enumerating them.
+
+Each transition's effect on a set of markings is derived from its arcs: the places it consumes from or reads must
+be marked, the places inhibiting it unmarked, and the places it consumes from become unmarked while those it
+produces to become marked. The reachable set is computed by chaining: each transition is applied in turn to the
+set reached so far, until a pass adds no markings.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> members, initial = [], {}
+    >>> for index in range(40):
+    ...     off, on = Place(name=f"Off {index}"), Place(name=f"On {index}")
+    ...     up, down = Transition(name=f"Up {index}"), Transition(name=f"Down {index}")
+    ...     members += [off, on, up, down, off >> up, up >> on, on >> down, down >> off]
+    ...     initial[off] = {Token()}
+    >>> space = symbolic_reachability(PetriNet.new(*members), initial)
+    >>> space.count(), space.deadlock_count()
+    (1099511627776, 0)
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, NamedTuple, Sequence
+
+from attr import define
+
+from carladam.petrinet.arc import ArcKind, inhibit
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.token import Token
+from carladam.petrinet.transition import Transition
+from carladam.util.bdd import BDD, FALSE
+
+
+class Action(NamedTuple):
+    """What a transition requires of, and does to, the variable of one place."""
+
+    var: int
+
+    require: bool | None
+    "Whether the place must be marked (True) or unmarked (False) for the transition to be enabled, if either."
+
+    result: bool | None
+    "Whether the place is marked after the transition occurs, or None if unchanged."
+
+    adds: bool
+    "Whether the transition produces a token to the place without consuming one from it."
+
+
+def transition_actions(net: PetriNet, transition: Transition, place_var: Mapping[Place, int]) -> list[Action]:
+    """Returns the actions of a transition on the places of its arcs, in variable order."""
+    require: dict[int, bool] = {}
+    result: dict[int, bool] = {}
+    consumes: set[int] = set()
+    for arc in net.node_inputs.get(transition, ()):
+        var = place_var[arc.src]
+        if arc.guard is inhibit:
+            require[var] = False
+        else:
+            require[var] = True
+            if arc.kind is not ArcKind.READ:
+                result[var] = False
+                consumes.add(var)
+    for arc in net.node_outputs.get(transition, ()):
+        result[place_var[arc.dest]] = True
+    return [
+        Action(var, require.get(var), result.get(var), result.get(var) is True and var not in consumes)
+        for var in sorted(require.keys() | result.keys())
+    ]
+
+
+def check_supported(net: PetriNet):
+    """Raises `ValueError` if the net's transitions are not described by the occupancy of their places alone."""
+    compiled = net.compiled
+    if len(compiled.colors) > 1:
+        raise ValueError("Symbolic reachability requires tokens of a single color.", compiled.colors)
+    # Transitions without arcs are never enabled, and are given no image.
+    unsupported = [
+        transition
+        for index, transition in enumerate(compiled.transitions)
+        if not compiled.weight_only[index]
+        and (net.node_inputs.get(transition) or net.node_outputs.get(transition))
+        or any(
+            getattr(arc, "guard", None) is not inhibit and sum(arc.weight.values()) != 1
+            for arc in (*net.node_inputs.get(transition, ()), *net.node_outputs.get(transition, ()))
+        )
+    ]
+    if unsupported:
+        raise ValueError("Symbolic reachability requires arcs of weight 1, without guards or transforms.", unsupported)
+
+
+def place_order(net: PetriNet) -> tuple[Place, ...]:
+    """
+    Returns the places of a net in an order that keeps decision diagrams small for typical nets:
+    depth first through transitions, so that places connected by a transition are near each other.
+    """
+    compiled = net.compiled
+    neighbors = {place: [] for place in compiled.places}
+    for transition in compiled.transitions:
+        places = sorted(
+            {arc.src for arc in net.node_inputs.get(transition, ())}
+            | {arc.dest for arc in net.node_outputs.get(transition, ())},
+            key=compiled.place_index.__getitem__,
+        )
+        for place in places:
+            neighbors[place].extend(places)
+    order, seen = [], set()
+    for start in compiled.places:
+        stack = [start]
+        while stack:
+            place = stack.pop()
+            if place not in seen:
+                seen.add(place)
+                order.append(place)
+                stack.extend(reversed(neighbors[place]))
+    return tuple(order)
+
+
+@define
+class SymbolicStateSpace:
+    """The reachable markings of a 1-safe net, as a set held in a binary decision diagram."""
+
+    bdd: BDD
+
+    places: tuple[Place, ...]
+    "Places of the net, in the order of their variables."
+
+    reachable: int
+    "Node of the set of reachable markings."
+
+    enabled: Mapping[Transition, int]
+    "Node of the set of markings enabling each transition."
+
+    iterations: int
+    "Number of passes over the transitions until no new markings were reached."
+
+    def count(self) -> int:
+        """Returns the number of reachable markings."""
+        return self.bdd.count(self.reachable)
+
+    def deadlocks(self) -> int:
+        """Returns the node of the set of reachable markings enabling no transition."""
+        return self.bdd.diff(self.reachable, self.bdd.any(self.enabled.values()))
+
+    def deadlock_count(self) -> int:
+        return self.bdd.count(self.deadlocks())
+
+    def example_deadlock(self) -> PMarking | None:
+        """Returns a reachable marking enabling no transition, or None if there is none."""
+        assignment = self.bdd.pick(self.deadlocks())
+        return None if assignment is None else self.marking(assignment)
+
+    def contains(self, marking: Marking) -> bool:
+        """Returns True if the marking is reachable."""
+        assignment = {var: bool(marking.get(place)) for var, place in enumerate(self.places)}
+        return self.bdd.and_(self.reachable, self.bdd.cube(assignment)) != FALSE
+
+    def marking(self, assignment: Mapping[int, bool]) -> PMarking:
+        """Returns a marking with a token in the place of each true variable; other places are empty."""
+        return pmarking({self.places[var]: {Token()} for var, value in assignment.items() if value})
+
+
+class Image:
+    """The markings resulting from one transition occurring in any of a set of markings."""
+
+    def __init__(self, bdd: BDD, actions: Sequence[Action]):
+        self.bdd = bdd
+        self.actions = actions
+        self._cache: dict[tuple[int, int], int] = {}
+
+    def __call__(self, node: int, position: int = 0) -> int:
+        # An explicit stack rather than recursion, as nets may have more places than Python's recursion limit.
+        # A node is visited by pushing a step to combine the images of its parts, then visits of those parts,
+        # whose images are left on the stack of values for the combining step to take.
+        work, values = [(node, position, 0)], []
+        while work:
+            top, at, parts = work.pop()
+            if parts:
+                images = values[-parts:]
+                del values[-parts:]
+                result = self._cache[top, at] = self._combine(top, at, images)
+                values.append(result)
+            elif (result := self._result(top, at)) is not None:
+                values.append(result)
+            else:
+                needed = self._parts(top, at)
+                work.append((top, at, len(needed)))
+                work.extend((*part, 0) for part in reversed(needed))
+        return values.pop()
+
+    def _result(self, node: int, position: int) -> int | None:
+        """Returns the image of a node from an action onwards, if it is trivial or already computed."""
+        if node == FALSE or position == len(self.actions):
+            return node
+        return self._cache.get((node, position))
+
+    def _parts(self, node: int, position: int) -> list[tuple[int, int]]:
+        """Returns the nodes and positions whose images give the image of a node from an action onwards."""
+        bdd = self.bdd
+        var, require, _, _ = self.actions[position]
+        top = bdd.top(node)
+        if top < var:
+            low, high = bdd.children(node)
+            return [(low, position), (high, position)]
+        low, high = bdd.children(node) if top == var else (node, node)
+        if require is None:
+            return [(low, position + 1), (high, position + 1)]
+        return [(high if require else low, position + 1)]
+
+    def _combine(self, node: int, position: int, images: list[int]) -> int:
+        bdd = self.bdd
+        var, require, value, _ = self.actions[position]
+        top = bdd.top(node)
+        if top < var:
+            return bdd.node(top, *images)
+        rest = bdd.or_(*images) if require is None else images[0]
+        marked = require if value is None else value
+        return bdd.node(var, FALSE, rest) if marked else bdd.node(var, rest, FALSE)
+
+
+def symbolic_reachability(
+    net: PetriNet, initial_marking: Marking, order: Sequence[Place] | None = None
+) -> SymbolicStateSpace:
+    """
+    Computes the markings reachable from `initial_marking` in a 1-safe net, symbolically.
+
+    Places are given variables in `order`, or in the order returned by `place_order` by default;
+    decision diagrams stay small when places that interact are near each other in the order.
+    Raises `ValueError` if the initial marking or any reachable marking is not 1-safe, or if any transition has
+    guards, transforms, arcs of weight other than 1, or reset or transfer arcs.
+    """
+    check_supported(net)
+    places = tuple(order) if order is not None else place_order(net)
+    if set(places) != set(net.places) or len(places) != len(net.places):
+        raise ValueError("The order must list each place of the net once.")
+    place_var = {place: var for var, place in enumerate(places)}
+    if any(len(tokens) > 1 for tokens in initial_marking.values()):
+        raise ValueError("The initial marking is not 1-safe.")
+    bdd = BDD(len(places))
+    reachable = bdd.cube({var: bool(initial_marking.get(place)) for var, place in enumerate(places)})
+    images, enabled, unsafe = {}, {}, {}
+    # Transitions are chained in the order of the first variable they act on.
+    actions_by_transition = {
+        transition: actions
+        for transition in sorted(net.transitions)
+        if (actions := transition_actions(net, transition, place_var))
+    }
+    for transition, actions in sorted(actions_by_transition.items(), key=lambda item: item[1][0].var):
+        images[transition] = Image(bdd, actions)
+        enabled[transition] = bdd.cube({action.var: action.require for action in actions if action.require is not None})
+        # Producing to a place not consumed from while it is marked would put a second token there.
+        unsafe[transition] = bdd.and_(
+            enabled[transition], bdd.any(bdd.var(action.var) for action in actions if action.adds)
+        )
+    iterations = 0
+    while True:
+        iterations += 1
+        previous = reachable
+        for image in images.values():
+            reachable = bdd.or_(reachable, image(reachable))
+        if reachable == previous:
+            break
+    for transition, markings in unsafe.items():
+        if bdd.and_(reachable, markings) != FALSE:
+            raise ValueError("The net is not 1-safe: a transition can produce a token to a marked place.", transition)
+    return SymbolicStateSpace(bdd, places, reachable, enabled, iterations)
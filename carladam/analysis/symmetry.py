@@ -0,0 +1,160 @@
+"""
+Symmetry reduction: treating markings as the same state when they differ only by swapping interchangeable copies.
+
+`canonical_key` already treats markings as the same state when they differ only in token IDs. Nets built from
+identical copies of a part, such as production lines or workers, have a further symmetry: swapping the contents
+of two copies gives a marking that behaves the same way. A `Symmetry` declares such copies, listing each copy's
+places and transitions in corresponding order. `symmetric_key` then compares markings by the multiset of the
+copies' contents, without regard to which copy holds which, dividing the number of states by up to the number of
+ways to order the copies.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> from carladam.analysis.reachability import reachability_graph
+    >>> a, b = Place(name="A"), Place(name="B")
+    >>> f, g = Transition(name="F"), Transition(name="G")
+    >>> net = PetriNet.new(a, b, f, g, a >> f, b >> g)
+    >>> key = symmetric_key(net, [Symmetry(places=[[a], [b]], transitions=[[f], [g]])])
+    >>> initial = {a: {Token()}, b: {Token()}}
+    >>> [reachability_graph(net, initial, **options).exploration.states for options in ({}, {"key": key})]
+    [4, 3]
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from types import FunctionType
+from typing import AbstractSet, Any, Hashable, Mapping, Sequence
+
+import attrs
+from attr import define, field
+
+from carladam.analysis.reachability import MarkingKey, contents_key
+from carladam.petrinet.compose import remap_arc
+from carladam.petrinet.marking import Marking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.transition import Transition
+from carladam.petrinet.types import CompletedArc, PetriNetNode
+
+
+def behavior_key(value: Any, _visiting: frozenset[int] = frozenset()) -> Hashable:
+    """
+    Returns a key that is equal for values that behave the same way.
+
+    Functions made by the same code, with equal defaults and closed-over values, have equal keys, so that separate
+    calls of a factory such as `passthrough` give interchangeable functions. Mappings, sets, lists, and tuples are
+    keyed by their contents, other hashable values are their own key, and other unhashable values are keyed by
+    identity.
+    """
+    if isinstance(value, FunctionType):
+        if id(value) in _visiting:
+            return value.__code__
+        visiting = _visiting | {id(value)}
+        return (
+            value.__code__,
+            tuple(behavior_key(default, visiting) for default in value.__defaults__ or ()),
+            tuple((name, behavior_key(default, visiting)) for name, default in (value.__kwdefaults__ or {}).items()),
+            tuple(behavior_key(cell.cell_contents, visiting) for cell in value.__closure__ or ()),
+        )
+    if isinstance(value, Mapping):
+        return Mapping, frozenset((key, behavior_key(item, _visiting)) for key, item in value.items())
+    if isinstance(value, AbstractSet):
+        return AbstractSet, frozenset(behavior_key(item, _visiting) for item in value)
+    if isinstance(value, (list, tuple)):
+        return tuple, tuple(behavior_key(item, _visiting) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return Unhashable, id(value)
+    return value
+
+
+class Unhashable:
+    """Marks the key of an unhashable value, which is compared by identity."""
+
+
+def arc_key(arc: CompletedArc) -> Hashable:
+    """Returns a key that is equal for arcs joining the same nodes in the same way, with the same behavior."""
+    return type(arc), tuple(behavior_key(getattr(arc, field_.name)) for field_ in attrs.fields(type(arc)))
+
+
+@define(frozen=True)
+class Symmetry:
+    """Interchangeable copies of part of a net, any of which may be swapped for any other."""
+
+    places: Sequence[Sequence[Place]] = field(converter=lambda copies: tuple(map(tuple, copies)))
+    "Places of each copy, in the same order for every copy."
+
+    transitions: Sequence[Sequence[Transition]] = field(default=(), converter=lambda copies: tuple(map(tuple, copies)))
+    "Transitions of each copy, in the same order for every copy."
+
+    def swap(self, first: int, second: int) -> dict[PetriNetNode, PetriNetNode]:
+        """Returns the mapping of nodes that exchanges two copies."""
+        mapping = {}
+        for nodes in (self.places, self.transitions):
+            if nodes:
+                for node, other in zip(nodes[first], nodes[second]):
+                    mapping[node] = other
+                    mapping[other] = node
+        return mapping
+
+    def check(self, net: PetriNet):
+        """
+        Raises `ValueError` unless every exchange of two copies maps the net's arcs onto its arcs,
+        and each transition onto one with the same guard and function,
+        so that swapping the contents of copies cannot change the behavior of the net.
+
+        Guards, functions, and arc transforms are compared with `behavior_key`.
+        Functions of one copy that refer to its nodes through other objects, such as globals, are not detected.
+        """
+        copy_sizes = {len(copy) for copy in self.places} | {len(copy) for copy in self.transitions}
+        if len(copy_sizes) > 1 or (self.transitions and len(self.transitions) != len(self.places)):
+            raise ValueError("Each copy must list the same number of places and transitions.", self)
+        identity = {node: node for node in (*net.places, *net.transitions)}
+        arcs = {arc_key(arc) for arc in net.arcs}
+        # Exchanges of the first copy with each other copy generate every reordering of the copies.
+        for other in range(1, len(self.places)):
+            mapping = identity | self.swap(0, other)
+            if {arc_key(remap_arc(arc, mapping)) for arc in net.arcs} != arcs:
+                raise ValueError("Exchanging copies changes the net.", self.places[0], self.places[other])
+            if self.transitions and any(
+                behavior_key(transition.guard) != behavior_key(swapped.guard)
+                or behavior_key(transition.fn) != behavior_key(swapped.fn)
+                for transition, swapped in zip(self.transitions[0], self.transitions[other])
+            ):
+                raise ValueError(
+                    "Exchanging copies changes the guards or functions of transitions.",
+                    self.transitions[0],
+                    self.transitions[other],
+                )
+
+
+def symmetric_key(net: PetriNet, symmetries: Sequence[Symmetry]) -> MarkingKey:
+    """
+    Returns a marking key, for `explore`, that is equal for markings differing only in token IDs or in which of the
+    interchangeable copies of each symmetry holds which tokens.
+
+    Raises `ValueError` if a symmetry does not hold for the net, or if symmetries share places.
+    """
+    declared: set[Place] = set()
+    for symmetry in symmetries:
+        symmetry.check(net)
+        places = {place for copy in symmetry.places for place in copy}
+        if places & declared:
+            raise ValueError("Symmetries must not share places.", places & declared)
+        declared |= places
+
+    def key(marking: Marking) -> Hashable:
+        contents = {place: contents_key(tokens) for place, tokens in marking.items() if tokens}
+        empty = frozenset()
+        return (
+            frozenset((place, content) for place, content in contents.items() if place not in declared),
+            tuple(
+                frozenset(
+                    Counter(tuple(contents.get(place, empty) for place in copy) for copy in symmetry.places).items()
+                )
+                for symmetry in symmetries
+            ),
+        )
+
+    return key
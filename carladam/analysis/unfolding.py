@@ -0,0 +1,360 @@
+"""
+Unfoldings of 1-safe nets: finite prefixes of their branching processes that represent every reachable marking.
+
+An unfolding records the occurrences of transitions (events) and the tokens they consume and produce (conditions),
+without ever merging histories, so concurrent events are simply unordered rather than interleaved in every order.
+A set of events closed under causal predecessors and free of conflicts is a configuration, and the conditions it
+produces but does not consume (its cut) mark a reachable marking.
+
+The unfolding is infinite for nets with cycles, so `unfold` builds a complete finite prefix, using the algorithm of
+Esparza, Römer and Vogler: events are added in the order of their local configurations (all of their causal
+predecessors) under the ERV adequate order, comparing size, then the multiset of transitions, then the Foata normal
+form. An event whose local configuration reaches a marking already reached by a smaller one is a cutoff: it is kept,
+but nothing is built after it. The resulting prefix contains a configuration for every reachable marking, and is
+often exponentially smaller than the reachability graph of a highly concurrent net.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> members, initial = [], {}
+    >>> for index in range(20):
+    ...     off, on = Place(name=f"Off {index}"), Place(name=f"On {index}")
+    ...     up, down = Transition(name=f"Up {index}"), Transition(name=f"Down {index}")
+    ...     members += [off, on, up, down, off >> up, up >> on, on >> down, down >> off]
+    ...     initial[off] = {Token()}
+    >>> prefix = unfold(PetriNet.new(*members), initial)
+    >>> len(prefix.events), len(prefix.cutoffs()), prefix.deadlock()
+    (40, 20, None)
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import defaultdict
+from itertools import count
+from typing import Iterator, NamedTuple
+
+from attr import define, field
+
+from carladam.analysis.symbolic import check_supported
+from carladam.petrinet.arc import ArcKind, inhibit
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.token import Token
+from carladam.petrinet.transition import Transition
+
+
+class Condition(NamedTuple):
+    """A token in a place, produced by an event or present initially."""
+
+    place: Place
+
+    event: int | None
+    "Index of the event producing the condition, or None for a condition of the initial marking."
+
+
+class Event(NamedTuple):
+    """An occurrence of a transition, consuming and producing conditions."""
+
+    transition: Transition
+
+    preset: int
+    "Bit mask of the conditions consumed."
+
+    postset: int
+    "Bit mask of the conditions produced."
+
+    local: int
+    "Bit mask of the events in the local configuration: the event and all of its causal predecessors."
+
+    cutoff: bool
+    "Whether the event is a cutoff, after which the prefix is not extended."
+
+
+def bits(mask: int) -> Iterator[int]:
+    """Generates the positions of the set bits of a bit mask, in increasing order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@define
+class Configuration:
+    """A set of events of a prefix, with the conditions they consume and the conditions of its cut."""
+
+    events: int = 0
+    "Bit mask of the events."
+
+    consumed: int = 0
+    "Bit mask of the conditions consumed by the events."
+
+    cut: int = 0
+    "Bit mask of the conditions produced (or present initially) and not consumed."
+
+
+@define
+class Prefix:
+    """
+    A finite prefix of the unfolding of a 1-safe net.
+
+    Its queries search the configurations without cutoffs, which represent every reachable marking if it is complete.
+    """
+
+    net: PetriNet
+
+    conditions: list[Condition] = field(factory=list)
+
+    events: list[Event] = field(factory=list)
+
+    initial: int = 0
+    "Bit mask of the conditions of the initial marking."
+
+    complete: bool = True
+    "False if `max_events` stopped the prefix from being extended to completeness."
+
+    def cutoffs(self) -> list[int]:
+        """Returns the indexes of the cutoff events."""
+        return [index for index, event in enumerate(self.events) if event.cutoff]
+
+    def marking(self, cut: int) -> PMarking:
+        """Returns the marking of a set of conditions."""
+        return pmarking({self.conditions[condition].place: {Token()} for condition in bits(cut)})
+
+    def extend(self, configuration: Configuration, event: int) -> Configuration | None:
+        """
+        Returns a configuration extended with an event's local configuration,
+        or None if the result would include a cutoff or conflicting events.
+        """
+        consumed, produced, events = configuration.consumed, configuration.cut | configuration.consumed, 0
+        for index in bits(self.events[event].local & ~configuration.events):
+            added = self.events[index]
+            if added.cutoff or added.preset & consumed:
+                return None
+            consumed |= added.preset
+            produced |= added.postset
+            events |= 1 << index
+        return Configuration(configuration.events | events, consumed, produced & ~consumed)
+
+    def enabled(self, configuration: Configuration) -> Iterator[int]:
+        """Generates the events, including cutoffs, whose consumed conditions are all in a configuration's cut."""
+        for index, event in enumerate(self.events):
+            if event.preset & ~configuration.cut == 0:
+                yield index
+
+    def consumers(self) -> dict[int, list[int]]:
+        """Returns the events consuming each condition, leaving out cutoffs."""
+        consumers = defaultdict(list)
+        for index, event in enumerate(self.events):
+            if not event.cutoff:
+                for condition in bits(event.preset):
+                    consumers[condition].append(index)
+        return consumers
+
+    def producers(self) -> dict[Place, list[int]]:
+        """Returns the events producing a condition of each place, leaving out cutoffs."""
+        producers = defaultdict(list)
+        for index, event in enumerate(self.events):
+            if not event.cutoff:
+                for condition in bits(event.postset):
+                    producers[self.conditions[condition].place].append(index)
+        return producers
+
+    def search(self, branches) -> Configuration | None:
+        """
+        Returns a configuration for which `branches` returns None, searching depth first from the initial one.
+
+        `branches` returns None for a configuration that is found, or else the events whose local configurations
+        might extend it towards one that is.
+        """
+        pending = [Configuration(cut=self.initial)]
+        seen = set()
+        while pending:
+            configuration = pending.pop()
+            if configuration.events in seen:
+                continue
+            seen.add(configuration.events)
+            options = branches(configuration)
+            if options is None:
+                return configuration
+            for event in options:
+                extended = self.extend(configuration, event)
+                if extended is not None:
+                    pending.append(extended)
+        return None
+
+    def deadlock(self) -> PMarking | None:
+        """Returns a reachable marking that enables no transition, or None if there is none."""
+        consumers = self.consumers()
+
+        def branches(configuration: Configuration) -> list[int] | None:
+            # A deadlock extending this configuration either includes an enabled event, or disables it by
+            # consuming one of its conditions with a conflicting event.
+            options = None
+            for event in self.enabled(configuration):
+                candidates = [] if self.events[event].cutoff else [event]
+                for condition in bits(self.events[event].preset):
+                    candidates += [other for other in consumers[condition] if other != event]
+                if options is None or len(candidates) < len(options):
+                    options = candidates
+            return options
+
+        found = self.search(branches)
+        return None if found is None else self.marking(found.cut)
+
+    def is_reachable(self, marking: Marking) -> bool:
+        """Returns True if the marking is reachable."""
+        target = {place for place, tokens in marking.items() if tokens}
+        consumers, producers = self.consumers(), self.producers()
+
+        def branches(configuration: Configuration) -> list[int] | None:
+            places = {}
+            for condition in bits(configuration.cut):
+                places[self.conditions[condition].place] = condition
+            for place, condition in places.items():
+                if place not in target:
+                    return consumers[condition]
+            missing = target - places.keys()
+            if missing:
+                return producers[min(missing, key=lambda place: len(producers[place]))]
+            return None
+
+        return self.search(branches) is not None
+
+
+def erv_key(transitions: list[int], depths: list[int]) -> tuple:
+    """
+    Returns the position of a local configuration, given the index and causal depth of each of its transitions,
+    in the ERV adequate order: its size, then its multiset of transitions, then its Foata normal form (the multiset
+    of transitions at each depth).
+
+    Multisets are compared as sorted tuples ending with a sentinel above every index, so that of two multisets
+    differing first in how many times they include a transition, the one including it more often comes first.
+    """
+    levels = defaultdict(list)
+    for transition, depth in zip(transitions, depths):
+        levels[depth].append(transition)
+    end = (math.inf,)
+    foata = tuple(tuple(sorted(levels[depth])) + end for depth in sorted(levels))
+    return len(transitions), tuple(sorted(transitions)) + end, foata
+
+
+def unfold(net: PetriNet, initial_marking: Marking, max_events: int | None = None) -> Prefix:
+    """
+    Builds a complete finite prefix of the unfolding of a 1-safe net.
+
+    Read arcs are treated as consuming and producing the token they read. Raises `ValueError` if the net has
+    inhibitor arcs, transitions without input places, or any of the features `symbolic_reachability` rejects, or
+    if it is not 1-safe. If `max_events` is given, no more events are added, and the prefix may be incomplete.
+    """
+    check_supported(net)
+    transitions = sorted(transition for transition in net.transitions if net.node_inputs.get(transition))
+    for transition in net.transitions:
+        if net.node_outputs.get(transition) and not net.node_inputs.get(transition):
+            raise ValueError("Unfoldings require every transition to have input places.", transition)
+    inputs, outputs = {}, {}
+    for transition in transitions:
+        arcs = net.node_inputs[transition]
+        if any(arc.guard is inhibit for arc in arcs):
+            raise ValueError("Unfoldings do not support inhibitor arcs.", transition)
+        inputs[transition] = sorted({arc.src for arc in arcs})
+        outputs[transition] = {arc.dest for arc in net.node_outputs.get(transition, ())}
+        # A read arc consumes and reproduces the token it reads.
+        outputs[transition] |= {arc.src for arc in arcs if arc.kind is ArcKind.READ}
+    consuming = defaultdict(list)
+    for transition in transitions:
+        for place in inputs[transition]:
+            consuming[place].append(transition)
+    transition_index = {transition: index for index, transition in enumerate(transitions)}
+    if any(len(tokens) > 1 for tokens in initial_marking.values()):
+        raise ValueError("The initial marking is not 1-safe.")
+
+    prefix = Prefix(net)
+    co: list[int] = []  # Bit mask of the conditions concurrent with each condition.
+    usable = defaultdict(list)  # Conditions of each place that events may consume: those not produced by cutoffs.
+    depths: list[int] = []
+    queue: list = []
+    tiebreak = count()
+    queued: set[tuple[Transition, int]] = set()
+
+    def add_conditions(places, event, concurrent) -> int:
+        postset = 0
+        for place in places:
+            postset |= 1 << len(prefix.conditions)
+            prefix.conditions.append(Condition(place, event))
+            co.append(0)
+        for condition in bits(postset):
+            co[condition] = concurrent | (postset & ~(1 << condition))
+            for other in bits(co[condition]):
+                if prefix.conditions[other].place == prefix.conditions[condition].place:
+                    raise ValueError("The net is not 1-safe.", prefix.conditions[condition].place)
+        for other in bits(concurrent):
+            co[other] |= postset
+        return postset
+
+    def find_extensions(condition: int):
+        place = prefix.conditions[condition].place
+        for transition in consuming[place]:
+            others = [other for other in inputs[transition] if other != place]
+            choices = [[candidate for candidate in usable[other] if co[condition] >> candidate & 1] for other in others]
+            for preset in presets(choices, 1 << condition):
+                if (transition, preset) not in queued:
+                    queued.add((transition, preset))
+                    ancestors = 0
+                    for index in bits(preset):
+                        event = prefix.conditions[index].event
+                        if event is not None:
+                            ancestors |= prefix.events[event].local
+                    depth = 1 + max((depths[index] for index in bits(ancestors)), default=0)
+                    key = erv_key(
+                        [
+                            *(transition_index[prefix.events[index].transition] for index in bits(ancestors)),
+                            transition_index[transition],
+                        ],
+                        [*(depths[index] for index in bits(ancestors)), depth],
+                    )
+                    heapq.heappush(queue, (key, next(tiebreak), transition, preset, ancestors, depth))
+
+    def presets(choices, chosen) -> Iterator[int]:
+        if not choices:
+            yield chosen
+            return
+        for candidate in choices[0]:
+            if all(co[candidate] >> other & 1 for other in bits(chosen)):
+                yield from presets(choices[1:], chosen | 1 << candidate)
+
+    initial_places = [place for place in net.compiled.places if initial_marking.get(place)]
+    prefix.initial = add_conditions(initial_places, None, 0)
+    for condition in bits(prefix.initial):
+        usable[prefix.conditions[condition].place].append(condition)
+    markings = {frozenset(initial_places)}
+    for condition in bits(prefix.initial):
+        find_extensions(condition)
+
+    while queue:
+        if max_events is not None and len(prefix.events) >= max_events:
+            prefix.complete = False
+            break
+        _, _, transition, preset, ancestors, depth = heapq.heappop(queue)
+        index = len(prefix.events)
+        local = ancestors | 1 << index
+        # The marking reached by the local configuration: conditions produced and not consumed.
+        produced, consumed = prefix.initial, preset
+        for ancestor in bits(ancestors):
+            produced |= prefix.events[ancestor].postset
+            consumed |= prefix.events[ancestor].preset
+        concurrent = co[next(bits(preset))]
+        for condition in bits(preset):
+            concurrent &= co[condition]
+        postset = add_conditions(sorted(outputs[transition]), index, concurrent)
+        places = frozenset(prefix.conditions[condition].place for condition in bits((produced | postset) & ~consumed))
+        cutoff = places in markings
+        markings.add(places)
+        prefix.events.append(Event(transition, preset, postset, local, cutoff))
+        depths.append(depth)
+        if not cutoff:
+            for condition in bits(postset):
+                usable[prefix.conditions[condition].place].append(condition)
+            for condition in bits(postset):
+                find_extensions(condition)
+    return prefix
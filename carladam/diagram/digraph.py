@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from functools import lru_cache
 from textwrap import dedent, wrap
 from typing import Callable, DefaultDict, FrozenSet, Optional, Set, Tuple
 
@@ -12,12 +11,13 @@ from pyrsistent import pmap
 
 from carladam import Place, Transition
 from carladam.petrinet import defaults
-from carladam.petrinet.arc import ArcPT, CompletedArcPT
+from carladam.petrinet.arc import ArcKind, ArcPT, CompletedArcPT
 from carladam.petrinet.color import colorset_string
 from carladam.petrinet.marking import PMarking
 from carladam.petrinet.petrinet import PetriNet
 from carladam.petrinet.token import Token
 from carladam.petrinet.types import CompletedArc
+from carladam.util.cache import cached
 
 PLACE_ATTRIBUTES = "[shape=oval]"
 TRANSITION_ATTRIBUTES = "[shape=box]"
@@ -31,6 +31,8 @@ DISABLED_ARC_PT_ATTRIBUTES = "[color=gray]"
 DISABLED_ARC_TP_ATTRIBUTES = "[color=skyblue]"
 ENABLED_ARC_PT_ATTRIBUTES = "[color=black,penwidth=2]"
 ENABLED_ARC_TP_ATTRIBUTES = "[color=blue,penwidth=2]"
+READ_ARC_ATTRIBUTES = "[arrowhead=none,style=dashed]"
+BULK_ARC_ATTRIBUTES = "[arrowhead=normalnormal]"
 
 DEFAULT_LEGEND_WIDTH = 25
 
@@ -56,7 +58,12 @@ def always_none(transition):
     return None
 
 
-@lru_cache
+def arc_is_bulk(arc: CompletedArc) -> bool:
+    """Reset and transfer arcs move all tokens of a place at once."""
+    return getattr(arc, "kind", None) is ArcKind.RESET or getattr(arc, "transfer_from", None) is not None
+
+
+@cached
 def graphviz_digraph(
     net: PetriNet,
     marking: PMarking = pmap(),
@@ -73,10 +80,12 @@ def graphviz_digraph(
         place: "".join(token_held_by_place_repr(token) for token in sorted(tokens)) for place, tokens in marking.items()
     }
 
-    arcs = set(net.arcs)
+    arcs = {arc for arc in net.arcs if getattr(arc, "kind", None) is not ArcKind.READ}
+    read_arcs = net.arcs.difference(arcs)
+    bulk_arcs = {arc for arc in arcs if arc_is_bulk(arc)}
     double_arcs = set()
     edge_arcs: EdgeArcs = defaultdict(set)
-    for arc in arcs:
+    for arc in arcs.difference(bulk_arcs):
         if isinstance(arc, ArcPT):
             place = arc.src
             transition = arc.dest
@@ -98,6 +107,7 @@ def graphviz_digraph(
     sorted_enabled_transitions = list(sorted(enabled_transitions))
     sorted_disabled_transitions = list(sorted(disabled_transitions))
     graphviz_source = GRAPHVIZ_DIGRAPH_TEMPLATE.render(
+        BULK_ARC_ATTRIBUTES=BULK_ARC_ATTRIBUTES,
         DISABLED_ARC_PT_ATTRIBUTES=DISABLED_ARC_PT_ATTRIBUTES,
         DISABLED_ARC_TP_ATTRIBUTES=DISABLED_ARC_TP_ATTRIBUTES,
         DISABLED_TRANSITION_ATTRIBUTES=DISABLED_TRANSITION_ATTRIBUTES,
@@ -107,8 +117,10 @@ def graphviz_digraph(
         ENABLED_TRANSITION_ATTRIBUTES=ENABLED_TRANSITION_ATTRIBUTES,
         PLACE_ATTRIBUTES=PLACE_ATTRIBUTES,
         PLACE_WITH_TOKEN_ATTRIBUTES=PLACE_WITH_TOKEN_ATTRIBUTES,
+        READ_ARC_ATTRIBUTES=READ_ARC_ATTRIBUTES,
         TRANSITION_ATTRIBUTES=TRANSITION_ATTRIBUTES,
         arcs=sorted(arcs),
+        bulk_arcs=bulk_arcs,
         clusters=getattr(net.structure, "clusters", {}),
         colorset_string=colorset_string,
         disabled_transitions=sorted_disabled_transitions,
@@ -120,6 +132,7 @@ def graphviz_digraph(
         marking=marking,
         marking_repr=marking_repr,
         places=sorted_places,
+        read_arcs=sorted(read_arcs),
         rotate=rotate,
         sorted=sorted,
         str=str,
@@ -171,6 +184,7 @@ GRAPHVIZ_DIGRAPH_TEMPLATE = Template(
             {% for arc in arcs %}
                 n_{{ arc.src.id }}->n_{{ arc.dest.id }}
                 [label="{{ colorset_string(arc.weight) }}{% if arc.annotation %} {{ wrapped(arc.annotation) }}{% endif %}"]
+                {% if arc in bulk_arcs %}{{ BULK_ARC_ATTRIBUTES }}{% endif %}
                 {% if arc.src in places -%}
                     {%- if arc.dest in enabled_transitions -%}
                         {{ ENABLED_ARC_PT_ATTRIBUTES }}
@@ -197,6 +211,17 @@ GRAPHVIZ_DIGRAPH_TEMPLATE = Template(
                 {%- endif -%}
             {% endfor %}
 
+            {% for arc in read_arcs %}
+                n_{{ arc.src.id }}->n_{{ arc.dest.id }}
+                [label="{{ colorset_string(arc.weight) }}{% if arc.annotation %} {{ wrapped(arc.annotation) }}{% endif %}"]
+                {{ READ_ARC_ATTRIBUTES }}
+                {%- if arc.dest in enabled_transitions -%}
+                    {{ ENABLED_ARC_PT_ATTRIBUTES }}
+                {%- else -%}
+                    {{ DISABLED_ARC_PT_ATTRIBUTES }}
+                {%- endif -%}
+            {% endfor %}
+
             {% for index, (name, cluster) in enumerate(clusters.items()) %}
                 subgraph cluster_{{ index }} {
                     label="{{ name }}"
@@ -16,6 +16,7 @@ from carladam import (
     PetriNet,
     Place,
     Token,
+    TransformBatch,
     TransformEach,
     Transition,
     __,
@@ -34,6 +35,7 @@ __all__ = [
     "PetriNet",
     "Place",
     "Token",
+    "TransformBatch",
     "TransformEach",
     "Transition",
     "__",
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
+import typing
+from collections import Counter
 from textwrap import wrap
 from typing import Sequence
 
@@ -10,7 +11,21 @@ from pyrsistent import plist, pmap
 from pyrsistent.typing import PList as PListType
 
 from carladam import PetriNet, Place, Token, Transition
+from carladam.petrinet.arc import ArcKind, CompletedArcPT, CompletedArcTP
+from carladam.petrinet.effects import (
+    Consume,
+    ConsumeMany,
+    Effect,
+    Produce,
+    ProduceMany,
+    Reset,
+    Transfer,
+    apply_effects_to_marking,
+)
 from carladam.petrinet.marking import PMarking, pmarking
+from carladam.petrinet.occurrence import Occurrence
+from carladam.petrinet.types import CompletedArc
+from carladam.util.cache import cached
 
 
 def token_held_by_place_repr(token: Token) -> str:
@@ -20,6 +35,36 @@ def token_held_by_place_repr(token: Token) -> str:
         return f"{token.color!r} {token.name}"
 
 
+def input_arrow(arc: CompletedArcPT) -> str:
+    """Read arcs are shown as dotted arrows since they do not consume tokens, and reset arcs as double arrows."""
+    if arc.kind is ArcKind.READ:
+        return "-->"
+    if arc.kind is ArcKind.RESET:
+        return "->>"
+    return "x->"
+
+
+def output_arrow(arc: CompletedArcTP) -> str:
+    """Transfer arcs are shown as double arrows since they move all tokens of a place at once."""
+    return "->>" if arc.transfer_from is not None else "->o"
+
+
+def arc_quantities(effects: Sequence[Effect]) -> typing.Counter[CompletedArc]:
+    """Return the number of tokens each arc removed from or added to a place, given the effects of an occurrence."""
+    quantities: typing.Counter[CompletedArc] = Counter()
+    for effect in effects:
+        if isinstance(effect, (Consume, Produce)):
+            quantities[effect.arc] += 1
+        elif isinstance(effect, (ConsumeMany, ProduceMany, Reset, Transfer)):
+            quantities[effect.arc] += len(effect.tokens)
+    return quantities
+
+
+def quantity_label(quantity: int) -> str:
+    """Arrows moving more than one token are labeled with the quantity moved."""
+    return f" : ×{quantity}" if quantity > 1 else ""
+
+
 def wrapped(s: str, width: int = 12) -> str:
     return "\\n".join(wrap(s, width=width))
 
@@ -37,7 +82,7 @@ def plantuml_sequence_diagram(
     )
 
 
-@lru_cache
+@cached
 def _plantuml_sequence_diagram(
     net: PetriNet,
     initial_marking: PMarking = pmap(),
@@ -79,14 +124,21 @@ def _plantuml_sequence_diagram(
         )
         events.append(marking_notes)
 
-    def add_transition_event(transition: Transition):
+    def add_transition_event(transition: Transition, effects: Sequence[Effect]):
         print("add_transition_event", transition)
         add_transition(transition)
+        quantities = arc_quantities(effects)
         transition_arcs = "".join(
             [
-                "\n& ".join(f"p_{arc.src.id} x-> t_{transition.id}" for arc in net.node_inputs.get(transition, ())),
+                "\n& ".join(
+                    f"p_{arc.src.id} {input_arrow(arc)} t_{transition.id}{quantity_label(quantities[arc])}"
+                    for arc in net.node_inputs.get(transition, ())
+                ),
                 f"\nactivate t_{transition.id} #skyblue\n",
-                "\n& ".join(f"t_{transition.id} ->o p_{arc.dest.id}" for arc in net.node_outputs.get(transition, ())),
+                "\n& ".join(
+                    f"t_{transition.id} {output_arrow(arc)} p_{arc.dest.id}{quantity_label(quantities[arc])}"
+                    for arc in net.node_outputs.get(transition, ())
+                ),
                 f"\ndeactivate t_{transition.id}\n",
             ]
         )
@@ -95,8 +147,9 @@ def _plantuml_sequence_diagram(
     current_marking = initial_marking
     add_marking_event(current_marking)
     for current_transition in transitions:
-        add_transition_event(current_transition)
-        current_marking = net.marking_after_transition(current_marking, current_transition)
+        effects = Occurrence(net, current_marking, current_transition).bulk_effects()
+        add_transition_event(current_transition, effects)
+        current_marking = apply_effects_to_marking(current_marking, effects)
         add_marking_event(current_marking)
 
     return "\n".join(header + participants + participants + events)
@@ -1,4 +1,3 @@
-from functools import lru_cache
 from typing import Mapping
 
 from pyrsistent import freeze
@@ -6,6 +5,7 @@ from pyrsistent.typing import PMap
 
 from carladam import Color, PetriNet, Token
 from carladam.petrinet.marking import MutableMarking, PMarking, pmarking
+from carladam.util.cache import cached
 
 
 def decode_marking_from_json(net: PetriNet, colors: Mapping[str, Color], marking_json: Mapping) -> PMarking:
@@ -16,7 +16,7 @@ def decode_marking_from_json(net: PetriNet, colors: Mapping[str, Color], marking
     return _decode_marking_from_json(net, colors, marking_json)
 
 
-@lru_cache
+@cached
 def _decode_marking_from_json(net: PetriNet, colors: Mapping[str, Color], marking_json: PMap) -> PMarking:
     _initial_marking: MutableMarking = {}
     for place in net.places:
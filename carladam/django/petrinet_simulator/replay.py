@@ -0,0 +1,77 @@
+"""
+Replay of the simulator's transition list, resuming from markings cached for earlier requests.
+
+Each simulator page is addressed by its initial marking and the full list of transitions taken since.
+Rather than firing every transition on every request, `ReplayCache.marking_after` finds the longest prefix of the
+list whose resulting marking is cached, and fires only the transitions after it.
+Clicking an enabled transition therefore costs one firing, however long the session.
+"""
+
+from __future__ import annotations
+
+from hashlib import blake2b
+from typing import Hashable, Sequence
+
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.transition import Transition
+from carladam.util.cache import LRUCache
+
+DIGEST_SIZE = 16
+"Size in bytes of the digest identifying each prefix of a transition list."
+
+
+def prefix_digests(transitions: Sequence[Transition]) -> list[bytes]:
+    """
+    Returns a digest of each prefix of `transitions`, from the empty prefix to the whole list.
+
+    Each digest is computed from the previous one and a single transition ID, so all of them take linear time.
+    """
+    digests = [b""]
+    for transition in transitions:
+        digests.append(blake2b(digests[-1] + transition.id.encode(), digest_size=DIGEST_SIZE).digest())
+    return digests
+
+
+class ReplayCache:
+    """
+    A bounded, thread-safe cache of the markings reached by prefixes of transition lists.
+
+    Markings are cached for the whole list given to each call, and at every `checkpoint_interval` transitions
+    along the way, so requests that branch from an earlier point in a session also resume near it.
+    The least recently used markings are evicted once `maxsize` are cached.
+    """
+
+    def __init__(self, maxsize: int | None = 4096, checkpoint_interval: int = 50):
+        self.checkpoint_interval = checkpoint_interval
+        self._cache = LRUCache(maxsize)
+
+    def marking_after(self, net: PetriNet, initial_marking: Marking, transitions: Sequence[Transition]) -> PMarking:
+        """Returns the marking after firing each of `transitions` in turn, starting from `initial_marking`."""
+        initial_marking = pmarking(initial_marking)
+        digests = prefix_digests(transitions)
+        start, marking = 0, initial_marking
+        for length in range(len(transitions), 0, -1):
+            cached = self._cache.get(self._key(net, initial_marking, digests[length]))
+            if cached is not None:
+                start, marking = length, cached
+                break
+        for length in range(start + 1, len(transitions) + 1):
+            marking = net.marking_after_transition(marking, transitions[length - 1])
+            if length == len(transitions) or not length % self.checkpoint_interval:
+                self._cache.put(self._key(net, initial_marking, digests[length]), marking)
+        return marking
+
+    def clear(self):
+        self._cache.clear()
+
+    def info(self):
+        return self._cache.info()
+
+    @staticmethod
+    def _key(net: PetriNet, initial_marking: PMarking, digest: bytes) -> Hashable:
+        return net, initial_marking, digest
+
+
+replay_cache = ReplayCache()
+"Cache shared by all requests to the simulator view."
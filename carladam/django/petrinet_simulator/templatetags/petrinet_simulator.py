@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import json
-from functools import lru_cache
 from textwrap import dedent
 from typing import Sequence
 from urllib.parse import quote
@@ -18,6 +17,7 @@ from carladam.diagram.kroki import NIOLESK_KROKI_URL, kroki_image_url, niolesk_e
 from carladam.diagram.sequence import plantuml_sequence_diagram
 from carladam.petrinet.marking import PMarking, pmarking
 from carladam.petrinet.types import PetriNetNode
+from carladam.util.cache import cached
 
 register = template.Library()
 
@@ -133,14 +133,14 @@ def marking_encoded(marking: Marking):
     return _marking_encoded(marking)
 
 
-@lru_cache
+@cached
 def _marking_encoded(marking: PMarking):
     marking_json = {
         place.id: [
             {
                 "id": token.id,
                 "color": token.color.label,
-                "data": token.data,
+                "data": dict(token.data),
             }
             for token in tokens
         ]
@@ -154,6 +154,6 @@ def net_subnet(net: PetriNet, node: PetriNetNode):
     return net.subnet(node)
 
 
-@lru_cache
+@cached
 def _image_source(image_url: str) -> str:
     return httpx.get(image_url).text
@@ -10,6 +10,7 @@ from pyrsistent import pmap
 
 from carladam import PetriNet
 from carladam.django.petrinet_simulator.marking import decode_marking_from_json
+from carladam.django.petrinet_simulator.replay import replay_cache
 
 
 def index(request, petrinets: Mapping[str, PetriNet] | None = None):
@@ -48,10 +49,8 @@ def simulator(request, net_name: str, petrinets: Mapping[str, PetriNet] | None =
         transition = transitions_by_id[transition_id]
         transitions.append(transition)
 
-    # Find current marking after transitions.
-    current_marking = initial_marking
-    for transition in transitions:
-        current_marking = net.marking_after_transition(current_marking, transition)
+    # Find current marking after transitions, resuming from the longest prefix replayed before.
+    current_marking = replay_cache.marking_after(net, initial_marking, transitions)
 
     enabled_transitions = list(sorted(net.enabled_transitions(current_marking)))
     enabled_subnet = PetriNet.new(*(net.subnet(transition) for transition in enabled_transitions))
@@ -8,12 +8,14 @@ These will be cleaned up in a future effort that will remove the use of `attrs`
 from __future__ import annotations
 
 from collections import Counter
+from enum import Enum
 from functools import lru_cache
-from typing import AbstractSet, Callable, Iterator, TYPE_CHECKING, overload
+from typing import AbstractSet, Any, Callable, Iterable, Iterator, Sequence, TYPE_CHECKING, overload
 
+import attrs
 from attr import Factory, define, field
 from attr.validators import instance_of, optional
-from pyrsistent import pmap
+from pyrsistent import PSet, pmap, pset
 
 from carladam.petrinet import defaults, errors
 from carladam.petrinet.color import Abstract, Color, ColorSet, colorset_string
@@ -23,7 +25,7 @@ from carladam.petrinet.token import Token, TokenSet
 from carladam.petrinet.transition import Transition
 
 if TYPE_CHECKING:  # pragma: nocover
-    from carladam.petrinet.types import Arc
+    from carladam.petrinet.types import Arc, CompletedArc, PetriNetNode
 
 
 @overload
@@ -35,6 +37,7 @@ def arc(
     annotation: str = None,
     transform: Callable = None,
     guard: Callable = None,
+    kind: ArcKind = None,
 ) -> CompletedArcPT: ...
 
 
@@ -46,7 +49,7 @@ def arc(
     *,
     annotation: str = None,
     transform: Callable = None,
-    guard: Callable = None,
+    transfer_from: Place = None,
 ) -> CompletedArcTP: ...
 
 
@@ -82,6 +85,58 @@ def inhibitor_arc(src: Place, dest: Transition, *args, **kwargs):
     return arc(src, dest, *args, annotation=INHIBITOR, **kwargs, guard=inhibit)
 
 
+def read_arc(src: Place, dest: Transition, *args, **kwargs):
+    """Return an arc that passes tokens from `src` to `dest` as inputs without consuming them."""
+    return arc(src, dest, *args, **kwargs, kind=ArcKind.READ)
+
+
+def reset_arc(src: Place, dest: Transition, *args, **kwargs):
+    """Return an arc that removes all tokens from `src` when `dest` occurs, whether or not any are present."""
+    return arc(src, dest, *args, **kwargs, guard=unconditional, kind=ArcKind.RESET)
+
+
+def transfer_arc(src: Place, via: Transition, dest: Place, *args, **kwargs) -> tuple[CompletedArcPT, CompletedArcTP]:
+    """
+    Return a pair of arcs that move all tokens from `src` to `dest` when `via` occurs.
+
+    The tokens are moved as a whole set, bypassing the transition's `fn`.
+
+    Example:
+
+        >>> from carladam import PetriNet, Place, Token, Transition
+        >>> pallet, truck, ship = Place(), Place(), Transition()
+        >>> net = PetriNet.new(transfer_arc(pallet, ship, truck))
+        >>> len(net.marking_after_transition({pallet: Token() * 3}, ship)[truck])
+        3
+    """
+    return reset_arc(src, via, *args, **kwargs), arc(via, dest, *args, **kwargs, transfer_from=src)
+
+
+def transfer_reset_arc(transfer: CompletedArcTP) -> CompletedArcPT:
+    """Return the reset arc emptying the place that a transfer arc moves tokens from, as made by `transfer_arc`."""
+    return reset_arc(transfer.transfer_from, transfer.src, transfer.weight)
+
+
+def arc_nodes(arc: CompletedArc) -> Iterable[PetriNetNode]:
+    """Returns the nodes an arc refers to: its source, its destination, and the place it transfers tokens from."""
+    if isinstance(arc, CompletedArcTP) and arc.transfer_from is not None:
+        return arc.src, arc.dest, arc.transfer_from
+    return arc.src, arc.dest
+
+
+class ArcKind(Enum):
+    """How an arc from `Place` → `Transition` treats the tokens it passes to the transition."""
+
+    CONSUME = "consume"
+    "Tokens are removed from the place when the transition occurs."
+
+    READ = "read"
+    "Tokens must be present in the place, and remain there when the transition occurs."
+
+    RESET = "reset"
+    "All tokens are removed from the place when the transition occurs, and none are passed to the transition."
+
+
 def __arc_hash__(self):
     """Common implementation of `__hash__` for all Arc types."""
     return hash((self.src, self.dest, frozenset(self.weight.items())))
@@ -106,18 +161,27 @@ def default_arc_weight() -> ColorSet:
 
 
 def weights_are_satisfied(arc: CompletedArcPT, tokens: AbstractSet[Token]) -> bool:
+    """
+    Default arc guard: returns True if the tokens include at least the quantity of each color in the arc weight.
+
+    Tokens of colors the weight does not name are ignored, and stay in the place when the transition occurs.
+    """
     colors: ColorSet = Counter(token.color for token in tokens)
     # Do the tokens have all the colors specified by the arc weight?
     if frozenset(arc.weight) - frozenset(colors):
         return False
     # Do the tokens satisfy all of the quantities specified by the arc weight?
-    return all(arc.weight[color] <= count for color, count in colors.items())
+    return all(quantity <= colors[color] for color, quantity in arc.weight.items())
 
 
 def inhibit(arc: CompletedArcPT, tokens: AbstractSet[Token]) -> bool:
     return not tokens
 
 
+def unconditional(arc: CompletedArcPT, tokens: AbstractSet[Token]) -> bool:
+    return True
+
+
 @define
 class ArcPT:
     """An arc from `Place` → `Transition`."""
@@ -141,11 +205,14 @@ class ArcPT:
     guard: Callable = weights_are_satisfied
     """Function that returns True if the input tokens pass criteria."""
 
+    kind: ArcKind = ArcKind.CONSUME
+    """Whether tokens are consumed from the place or only read."""
+
     completed: bool = False
     """Whether this arc has both a src and dest given."""
 
-    def __lshift__(self, other: Place | Annotate | TransformEach) -> ArcPT:
-        if isinstance(other, (Annotate, TransformEach)):
+    def __lshift__(self, other: Place | Annotate | TransformEach | TransformBatch) -> ArcPT:
+        if isinstance(other, (Annotate, TransformEach, TransformBatch)):
             return other.apply_to_arc(self)
         if self.dest is None:
             raise errors.PetriNetArcIncomplete("Cannot << to an arc not having a dest")
@@ -155,10 +222,11 @@ class ArcPT:
             weight=self.weight,  # type: ignore
             annotation=self.annotation,
             transform=self.transform,
+            kind=self.kind,
         )
 
-    def __rshift__(self, other: Transition | Annotate | TransformEach) -> ArcPT:
-        if isinstance(other, (Annotate, TransformEach)):
+    def __rshift__(self, other: Transition | Annotate | TransformEach | TransformBatch) -> ArcPT:
+        if isinstance(other, (Annotate, TransformEach, TransformBatch)):
             return other.apply_to_arc(self)
         if self.src is None:
             raise errors.PetriNetArcIncomplete("Cannot >> from an arc not having a src")
@@ -168,6 +236,7 @@ class ArcPT:
             weight=self.weight,  # type: ignore
             annotation=self.annotation,
             transform=self.transform,
+            kind=self.kind,
         )
 
     def __call__(self, *args, **kwargs):
@@ -187,6 +256,7 @@ class CompletedArcPT(ArcPT):
     # noinspection PyUnresolvedReferences
     transform: Callable | None = None
     guard: Callable = weights_are_satisfied
+    kind: ArcKind = ArcKind.CONSUME
     completed: bool = True
 
     __hash__ = __arc_hash__
@@ -214,11 +284,14 @@ class ArcTP:
     transform: Callable | None = None
     """Function that will transform each token consumed."""
 
+    transfer_from: Place | None = None
+    """For transfer arcs, the place whose tokens are all moved to the destination place."""
+
     completed: bool = False
     """Whether this arc has both a src and dest given."""
 
-    def __lshift__(self, other: Transition | Annotate | TransformEach) -> ArcTP:
-        if isinstance(other, (Annotate, TransformEach)):
+    def __lshift__(self, other: Transition | Annotate | TransformEach | TransformBatch) -> ArcTP:
+        if isinstance(other, (Annotate, TransformEach, TransformBatch)):
             return other.apply_to_arc(self)
         if self.dest is None:
             raise errors.PetriNetArcIncomplete("Cannot << to an arc not having a dest")
@@ -228,10 +301,11 @@ class ArcTP:
             weight=self.weight,  # type: ignore
             annotation=self.annotation,
             transform=self.transform,
+            transfer_from=self.transfer_from,
         )
 
-    def __rshift__(self, other: Place | Annotate | TransformEach) -> ArcTP:
-        if isinstance(other, (Annotate, TransformEach)):
+    def __rshift__(self, other: Place | Annotate | TransformEach | TransformBatch) -> ArcTP:
+        if isinstance(other, (Annotate, TransformEach, TransformBatch)):
             return other.apply_to_arc(self)
         if self.src is None:
             raise errors.PetriNetArcIncomplete("Cannot >> from an arc not having a src")
@@ -241,6 +315,7 @@ class ArcTP:
             weight=self.weight,  # type: ignore
             annotation=self.annotation,
             transform=self.transform,
+            transfer_from=self.transfer_from,
         )
 
 
@@ -254,6 +329,7 @@ class CompletedArcTP(ArcTP):
     annotation: str | None = None
     # noinspection PyUnresolvedReferences
     transform: Callable | None = None
+    transfer_from: Place | None = None
     completed: bool = True
 
     __hash__ = __arc_hash__
@@ -275,13 +351,7 @@ class Annotate:
     def apply_to_arc(self, arc: ArcTP) -> ArcTP: ...
 
     def apply_to_arc(self, arc: Arc) -> Arc:
-        return type(arc)(
-            src=arc.src,  # type: ignore
-            dest=arc.dest,  # type: ignore
-            weight=arc.weight,  # type: ignore
-            annotation=self.text,
-            transform=arc.transform,
-        )
+        return attrs.evolve(arc, annotation=self.text)
 
 
 @define
@@ -305,10 +375,67 @@ class TransformEach:
         def transform(tokens: TokenSet) -> TokenSet:
             return frozenset(transformed_tokens(tokens))
 
-        return type(arc)(
-            src=arc.src,  # type: ignore
-            dest=arc.dest,  # type: ignore
-            weight=arc.weight,  # type: ignore
-            annotation=arc.annotation,
-            transform=transform,
+        return attrs.evolve(arc, transform=transform)
+
+
+@define(frozen=True)
+class TokenColumns:
+    """
+    Columnar view of the `data` of a set of tokens, passed to the function of a columnar `TransformBatch`.
+
+    Example:
+
+        >>> from carladam import Color
+        >>> Order = Color("Order")
+        >>> columns = TokenColumns((Order(sku="a"), Order(sku="b")))
+        >>> len(columns), columns["sku"]
+        (2, ['a', 'b'])
+        >>> sorted(token.data["price"] for token in columns.with_data(price=[10, 20]))
+        [10, 20]
+    """
+
+    tokens: tuple[Token, ...]
+    "Tokens, in the order of every column."
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __getitem__(self, name: str) -> list[Any]:
+        """Returns the value of the `data` field `name` of each token, or None for tokens lacking the field."""
+        return [token.data.get(name) for token in self.tokens]
+
+    def with_data(self, **columns: Sequence[Any]) -> PSet[Token]:
+        """Returns the tokens with their `data` updated from the given columns, keeping their identities."""
+        names = tuple(columns)
+        rows = zip(self.tokens, *(columns[name] for name in names))
+        return pset(
+            attrs.evolve(token, data=pmap(token.data).update(dict(zip(names, values)))) for token, *values in rows
         )
+
+
+@define
+class TransformBatch:
+    """
+    Sets a function on an `Arc` that transforms all `Token`s passing through it during a `Transition` in one call.
+
+    Unlike `TransformEach`, the function may use bulk lookups or vectorized operations across every token at once.
+    """
+
+    fn: Callable[[TokenSet], Iterable[Token]] | Callable[[TokenColumns], Iterable[Token]]
+    "Function taking a set of `Token`s, or a `TokenColumns` if `columnar` is True, and returning `Token`s."
+
+    columnar: bool = False
+    "Whether `fn` receives a `TokenColumns` rather than a set of `Token`s."
+
+    @overload
+    def apply_to_arc(self, arc: ArcPT) -> ArcPT: ...
+
+    @overload
+    def apply_to_arc(self, arc: ArcTP) -> ArcTP: ...
+
+    def apply_to_arc(self, arc: Arc) -> Arc:
+        def transform(tokens: TokenSet) -> TokenSet:
+            transformed = self.fn(TokenColumns(tuple(tokens)) if self.columnar else tokens)
+            return transformed if isinstance(transformed, PSet) else pset(transformed)
+
+        return attrs.evolve(arc, transform=transform)
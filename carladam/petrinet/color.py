@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from itertools import islice
 from typing import FrozenSet, Iterator, Mapping, MutableMapping, Protocol, Sequence, TYPE_CHECKING, Tuple
 
-from attr import define
-from pyrsistent import pmap
+from attr import define, field
+from attr.converters import optional
+from pyrsistent import pmap, pset
 
 from carladam.petrinet import defaults
+from carladam.petrinet.record import Record, Schema, record_type
 
 if TYPE_CHECKING:  # pragma: nocover
     from carladam.petrinet.token import Token, TokenSet
@@ -20,6 +21,16 @@ class Color:
     label: str
     "Globally unique name of this `Color`."
 
+    schema: Schema | None = field(default=None, converter=optional(dict), eq=False, repr=False)
+    "Optional mapping of `data` field names to types; if given, token `data` is stored as a compact `Record`."
+
+    record_type: type[Record] | None = field(init=False, default=None, eq=False, repr=False)
+    "Record type generated from `schema`, or None if this color has no schema."
+
+    def __attrs_post_init__(self):
+        if self.schema is not None:
+            self.record_type = record_type(self, self.schema)
+
     def __repr__(self):
         return self.label
 
@@ -27,12 +38,24 @@ class Color:
         """Colors with the same name are the same color."""
         return hash(self.label)
 
+    def __reduce__(self):
+        # The generated record type cannot be pickled by reference, so it is regenerated from the schema.
+        return Color, (self.label, self.schema)
+
     def __call__(self, **kwargs) -> Token:
         """Return a `Token` of this `Color`, having its `data` set to the passed-in `kwargs`."""
         from carladam.petrinet.token import Token
 
         return Token(color=self, data=kwargs)
 
+    def token_data(self, data: Mapping) -> Mapping:
+        """Return `data` validated as this color's `Record` if it has a `schema`, otherwise as a `pmap`."""
+        if self.record_type is None:
+            return pmap(data)
+        if isinstance(data, self.record_type):
+            return data
+        return self.record_type(data)
+
     def passthrough(self, quantity: int = 1) -> TransitionFunction:
         """Return a transition function that passes through (unmodified) tokens of this color."""
         from carladam.petrinet.transition import passthrough
@@ -43,15 +66,23 @@ class Color:
         """Return a generator that produces tokens of this color with the given `data`."""
         from carladam.petrinet.token import Token
 
-        pdata = pmap(data)
+        pdata = self.token_data(data)
         while True:
             yield Token(color=self, data=pdata)
 
+    def tokens(self, quantity: int, data: Mapping) -> TokenSet:
+        """Return a set of `quantity` new tokens of this color, all sharing the given `data`."""
+        from carladam.petrinet.token import Token
+
+        pdata = self.token_data(data)
+        return pset([Token(color=self, data=pdata) for _ in range(quantity)])
+
     def produce(self, quantity: int = 1, **kwargs) -> TransitionFunction:
         """Return a transition function that generates a given quantity of this color of token."""
+        data = self.token_data(kwargs)
 
         def transition_fn(inputs: TokenSet) -> Iterator[TokenSet]:
-            yield frozenset(islice(self.token_generator(kwargs), quantity))
+            yield self.tokens(quantity, data)
 
         return transition_fn
 
@@ -0,0 +1,278 @@
+"""
+A `CompiledNet` is an immutable, integer-indexed view of the structure of a `PetriNet`.
+
+Places, transitions, and colors are assigned dense indexes so that a marking can be represented as a count vector
+holding one count per (place, color) slot.
+Count vectors lose the identity and `data` of individual tokens,
+so they are only meaningful for transitions whose behavior depends solely on arc weights;
+see `CompiledNet.weight_only`.
+"""
+
+from __future__ import annotations
+
+from array import array
+from types import MappingProxyType
+from typing import Collection, Iterator, Mapping, Sequence, TYPE_CHECKING
+
+import attrs
+from attr import define, field
+
+from carladam.petrinet.arc import ArcKind, CompletedArcPT, inhibit, weights_are_satisfied
+from carladam.petrinet.color import Color
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.place import Place
+from carladam.petrinet.transition import Transition
+
+if TYPE_CHECKING:  # pragma: nocover
+    from carladam.petrinet.petrinet import PetriNet
+
+COUNT_TYPECODE = "q"
+"Typecode of `array`s and `memoryview`s holding counts (signed 64-bit integers)."
+
+Counts = Sequence[int]
+"A count vector: the quantity of tokens of each color in each place, indexed by `CompiledNet.slot`."
+
+
+def default_transition_guard():
+    """Return the guard that a `Transition` is given when none is passed in."""
+    return attrs.fields(Transition).guard.default
+
+
+def node_sort_key(node: Place | Transition) -> tuple[str, str]:
+    """Sort key giving places and transitions a stable order even when names are shared."""
+    return node.name, node.id
+
+
+def arc_is_weight_only(arc) -> bool:
+    """Returns True if the arc's effect on a transition depends only on its weight."""
+    if arc.transform is not None:
+        return False
+    if isinstance(arc, CompletedArcPT):
+        return arc.kind is not ArcKind.RESET and arc.guard in (weights_are_satisfied, inhibit)
+    return arc.transfer_from is None
+
+
+class CountVectorSemantics:
+    """
+    Firing rules for count vectors.
+
+    Subclasses provide flat, row-major sequences `pre`, `post`, and `test` (transitions × places × colors),
+    `inhibit` (transitions × places), and `weight_only` (transitions), along with `n_transitions`, `n_places`,
+    and `n_colors`.
+    """
+
+    __slots__ = ()
+
+    pre: Sequence[int]
+    post: Sequence[int]
+    test: Sequence[int]
+    inhibit: Sequence[int]
+    weight_only: Sequence[int]
+    n_transitions: int
+    n_places: int
+    n_colors: int
+
+    @property
+    def width(self) -> int:
+        """Length of a count vector for this net."""
+        return self.n_places * self.n_colors
+
+    def is_enabled(self, counts: Counts, transition_index: int, occupied: Collection[int] = ()) -> bool:
+        """
+        Returns True if the transition at `transition_index` is enabled by the weights of its arcs.
+
+        `occupied` holds the indexes of places holding tokens that `counts` leaves out, as returned by
+        `CompiledNet.untracked`; inhibitor arcs from those places disable the transition.
+        """
+        width = self.width
+        offset = transition_index * width
+        pre = self.pre
+        test = self.test
+        for slot in range(width):
+            count = counts[slot]
+            if count < pre[offset + slot] or count < test[offset + slot]:
+                return False
+        n_colors = self.n_colors
+        inhibit_offset = transition_index * self.n_places
+        for place_index in range(self.n_places):
+            if self.inhibit[inhibit_offset + place_index]:
+                start = place_index * n_colors
+                if place_index in occupied or any(counts[start : start + n_colors]):
+                    return False
+        return True
+
+    def enabled(self, counts: Counts, occupied: Collection[int] = ()) -> Iterator[int]:
+        """
+        Generates the indexes of transitions enabled by the given count vector, and places `occupied` as for
+        `is_enabled`.
+
+        Only weight-only transitions are considered; whether others are enabled depends on more than counts.
+        """
+        weight_only = self.weight_only
+        for transition_index in range(self.n_transitions):
+            if weight_only[transition_index] and self.is_enabled(counts, transition_index, occupied):
+                yield transition_index
+
+    def fire(self, counts: Counts, transition_index: int) -> array:
+        """Returns a new count vector resulting from the transition at `transition_index` occurring."""
+        width = self.width
+        offset = transition_index * width
+        pre = self.pre
+        post = self.post
+        return array(COUNT_TYPECODE, (counts[slot] - pre[offset + slot] + post[offset + slot] for slot in range(width)))
+
+
+@define(frozen=True, eq=False)
+class CompiledNet(CountVectorSemantics):
+    """
+    Dense, immutable index of the places, transitions, colors, and arc weights of a `PetriNet`.
+
+    Arrays and mappings are exposed as read-only views, so a compiled net may be shared freely between threads.
+    """
+
+    places: tuple[Place, ...]
+    "Places of the net, sorted by name then ID. A place's position is its index."
+
+    transitions: tuple[Transition, ...]
+    "Transitions of the net, sorted by name then ID. A transition's position is its index."
+
+    colors: tuple[Color, ...]
+    "Colors of the net, sorted by label. A color's position is its index."
+
+    pre: memoryview = field(repr=False)
+    "Quantity of each color consumed from each place by each transition (transitions × places × colors)."
+
+    post: memoryview = field(repr=False)
+    "Quantity of each color produced to each place by each transition (transitions × places × colors)."
+
+    test: memoryview = field(repr=False)
+    "Quantity of each color read, but not consumed, from each place by each transition (transitions × places × colors)."
+
+    inhibit: memoryview = field(repr=False)
+    "1 where a place inhibits a transition, otherwise 0 (transitions × places)."
+
+    weight_only: tuple[bool, ...] = field(repr=False)
+    """
+    For each transition, whether its guards, transforms, and arcs are fully described by the arrays above.
+    Transitions without arcs are never enabled, which the arrays cannot describe, so they are not weight-only.
+    """
+
+    place_index: Mapping[Place, int] = field(repr=False)
+    "Mapping of each place to its index."
+
+    transition_index: Mapping[Transition, int] = field(repr=False)
+    "Mapping of each transition to its index."
+
+    color_index: Mapping[Color, int] = field(repr=False)
+    "Mapping of each color to its index."
+
+    @classmethod
+    def from_net(cls, net: PetriNet) -> CompiledNet:
+        """Return a new `CompiledNet` describing the structure of a `PetriNet`."""
+        places = tuple(sorted(net.places, key=node_sort_key))
+        transitions = tuple(sorted(net.transitions, key=node_sort_key))
+        colors = tuple(sorted(net.colors, key=lambda color: color.label))
+        place_index = {place: index for index, place in enumerate(places)}
+        transition_index = {transition: index for index, transition in enumerate(transitions)}
+        color_index = {color: index for index, color in enumerate(colors)}
+        n_places, n_colors = len(places), len(colors)
+        width = n_places * n_colors
+        pre = array(COUNT_TYPECODE, bytes(8 * len(transitions) * width))
+        post = array(COUNT_TYPECODE, bytes(8 * len(transitions) * width))
+        test = array(COUNT_TYPECODE, bytes(8 * len(transitions) * width))
+        inhibit_ = array(COUNT_TYPECODE, bytes(8 * len(transitions) * n_places))
+        guard = default_transition_guard()
+        weight_only = []
+        for t_index, transition in enumerate(transitions):
+            input_arcs = net.node_inputs.get(transition, ())
+            output_arcs = net.node_outputs.get(transition, ())
+            for arc in input_arcs:
+                p_index = place_index[arc.src]
+                if arc.guard is inhibit:
+                    inhibit_[t_index * n_places + p_index] = 1
+                    continue
+                if arc.kind is ArcKind.RESET:
+                    continue
+                requirement = test if arc.kind is ArcKind.READ else pre
+                for color, quantity in arc.weight.items():
+                    requirement[t_index * width + p_index * n_colors + color_index[color]] += quantity
+            for arc in output_arcs:
+                if arc.transfer_from is not None:
+                    continue
+                p_index = place_index[arc.dest]
+                for color, quantity in arc.weight.items():
+                    post[t_index * width + p_index * n_colors + color_index[color]] += quantity
+            weight_only.append(
+                transition.guard is guard
+                and bool(input_arcs or output_arcs)
+                and all(arc_is_weight_only(arc) for arc in (*input_arcs, *output_arcs))
+            )
+        # Compiled nets are shared between threads, so expose only read-only views of their contents.
+        return cls(
+            places=places,
+            transitions=transitions,
+            colors=colors,
+            pre=memoryview(pre).toreadonly(),
+            post=memoryview(post).toreadonly(),
+            test=memoryview(test).toreadonly(),
+            inhibit=memoryview(inhibit_).toreadonly(),
+            weight_only=tuple(weight_only),
+            place_index=MappingProxyType(place_index),
+            transition_index=MappingProxyType(transition_index),
+            color_index=MappingProxyType(color_index),
+        )
+
+    @property
+    def n_transitions(self) -> int:
+        return len(self.transitions)
+
+    @property
+    def n_places(self) -> int:
+        return len(self.places)
+
+    @property
+    def n_colors(self) -> int:
+        return len(self.colors)
+
+    def slot(self, place: Place, color: Color) -> int:
+        """Returns the index within a count vector holding the quantity of `color` tokens in `place`."""
+        return self.place_index[place] * self.n_colors + self.color_index[color]
+
+    def counts(self, marking: Marking) -> array:
+        """
+        Returns the count vector of a `Marking`.
+
+        Tokens of colors that no arc weight mentions have no slot, so they are not counted;
+        pass the places holding them, given by `untracked`, to `is_enabled` or `enabled` for inhibitor arcs.
+        """
+        counts = array(COUNT_TYPECODE, bytes(8 * self.width))
+        color_index = self.color_index
+        for place, tokens in marking.items():
+            for token in tokens:
+                if token.color in color_index:
+                    counts[self.slot(place, token.color)] += 1
+        return counts
+
+    def untracked(self, marking: Marking) -> frozenset[int]:
+        """
+        Returns the indexes of places holding tokens of colors that no arc weight mentions, which `counts` leaves out.
+
+        Weight-only transitions never consume or produce such tokens, so the places stay the same as they occur.
+        """
+        color_index = self.color_index
+        return frozenset(
+            self.place_index[place]
+            for place, tokens in marking.items()
+            if any(token.color not in color_index for token in tokens)
+        )
+
+    def marking(self, counts: Counts) -> PMarking:
+        """Returns a `Marking` of new, data-less tokens having the quantities given by a count vector."""
+        marking = {}
+        for place_index, place in enumerate(self.places):
+            tokens = set()
+            for color_index, color in enumerate(self.colors):
+                tokens.update(color() for _ in range(counts[place_index * self.n_colors + color_index]))
+            if tokens:
+                marking[place] = tokens
+        return pmarking(marking)
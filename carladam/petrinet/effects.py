@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Iterable, Iterator, Sequence
 
 import attrs
-from pyrsistent import pset
+from pyrsistent import PSet, pset
 
 from carladam.petrinet.arc import CompletedArcPT, CompletedArcTP
-from carladam.petrinet.marking import PMarking
-from carladam.petrinet.token import Token
+from carladam.petrinet.marking import PMarking, empty_tokens, persistent_tokens
+from carladam.petrinet.token import Token, TokenSet
 
 
 @attrs.define
@@ -24,7 +24,28 @@ class Consume:
     def apply_to_marking(self, marking: PMarking) -> PMarking:
         new_place_tokens = marking.get(self.arc.src, pset()).remove(self.token)
         if new_place_tokens:
-            return marking.set(self.arc.src, pset(new_place_tokens))
+            return marking.set(self.arc.src, new_place_tokens)
+        return marking.remove(self.arc.src)
+
+
+@attrs.define
+class ConsumeMany:
+    """
+    Several tokens were consumed from a place by an arc.
+
+    Equivalent to one `Consume` per token, applied to the marking as a single set operation.
+    """
+
+    arc: CompletedArcPT
+    tokens: TokenSet
+
+    def apply_to_marking(self, marking: PMarking) -> PMarking:
+        evolver = marking.get(self.arc.src, pset()).evolver()
+        for token in self.tokens:
+            evolver.remove(token)
+        new_place_tokens = evolver.persistent()
+        if new_place_tokens:
+            return marking.set(self.arc.src, new_place_tokens)
         return marking.remove(self.arc.src)
 
 
@@ -43,6 +64,21 @@ class Input:
         return marking
 
 
+@attrs.define
+class InputMany:
+    """
+    Several tokens were passed to a transition as inputs by an arc.
+
+    Equivalent to one `Input` per token.
+    """
+
+    arc: CompletedArcPT
+    tokens: TokenSet
+
+    def apply_to_marking(self, marking: PMarking) -> PMarking:
+        return marking
+
+
 @attrs.define
 class Output:
     """
@@ -58,6 +94,21 @@ class Output:
         return marking
 
 
+@attrs.define
+class OutputMany:
+    """
+    Several tokens were returned by a transition as outputs for an arc.
+
+    Equivalent to one `Output` per token.
+    """
+
+    arc: CompletedArcTP
+    tokens: TokenSet
+
+    def apply_to_marking(self, marking: PMarking) -> PMarking:
+        return marking
+
+
 @attrs.define
 class Produce:
     """
@@ -71,11 +122,120 @@ class Produce:
     token: Token
 
     def apply_to_marking(self, marking: PMarking) -> PMarking:
-        new_place_tokens = marking.get(self.arc.dest, pset()).add(self.token)
-        return marking.set(self.arc.dest, pset(new_place_tokens))
+        new_place_tokens = marking.get(self.arc.dest, empty_tokens(self.arc.dest)).add(self.token)
+        return marking.set(self.arc.dest, new_place_tokens)
+
+
+@attrs.define
+class ProduceMany:
+    """
+    Several tokens were produced to a place by an arc.
+
+    Equivalent to one `Produce` per token, applied to the marking as a single set operation.
+    """
+
+    arc: CompletedArcTP
+    tokens: TokenSet
+
+    def apply_to_marking(self, marking: PMarking) -> PMarking:
+        place_tokens = marking.get(self.arc.dest)
+        if not place_tokens:
+            return marking.set(self.arc.dest, persistent_tokens(self.arc.dest, self.tokens))
+        return marking.set(self.arc.dest, place_tokens.update(self.tokens))
+
+
+@attrs.define
+class Reset:
+    """
+    All tokens were removed from a place by a reset arc.
+
+    The tokens will always be those present in the place prior to a transition occurrence,
+    less any consumed from the place by the transition's other arcs, whose effects come first.
+    """
+
+    arc: CompletedArcPT
+    tokens: TokenSet
+
+    def apply_to_marking(self, marking: PMarking) -> PMarking:
+        return marking.discard(self.arc.src)
 
 
-Effect = Consume | Input | Output | Produce
+@attrs.define
+class Transfer:
+    """
+    All tokens from a place were moved to another place by a transfer arc.
+
+    The tokens will always be those present in the arc's `transfer_from` place prior to a transition occurrence,
+    less any consumed from the place by the transition's input arcs, whose effects come first.
+    They are added as a set, so an empty destination shares the source's persistent set without copying,
+    unless the destination's `indexes` differ from the source's.
+    """
+
+    arc: CompletedArcTP
+    tokens: TokenSet
+
+    def apply_to_marking(self, marking: PMarking) -> PMarking:
+        if not self.tokens:
+            return marking
+        tokens = persistent_tokens(self.arc.dest, self.tokens)
+        existing_tokens = marking.get(self.arc.dest, empty_tokens(self.arc.dest))
+        if len(existing_tokens) > len(tokens):
+            existing_tokens, tokens = tokens, existing_tokens
+        return marking.set(self.arc.dest, tokens.update(existing_tokens))
+
+
+Effect = Consume | ConsumeMany | Input | InputMany | Output | OutputMany | Produce | ProduceMany | Reset | Transfer
+
+
+def consume_effects(arc: CompletedArcPT, tokens: TokenSet) -> Sequence[Consume | ConsumeMany]:
+    """Return the effect(s) of an arc consuming tokens from its place."""
+    if len(tokens) == 1:
+        return [Consume(arc=arc, token=next(iter(tokens)))]
+    if tokens:
+        return [ConsumeMany(arc=arc, tokens=frozenset(tokens))]
+    return []
+
+
+def produce_effects(arc: CompletedArcTP, tokens: TokenSet) -> Sequence[Produce | ProduceMany]:
+    """Return the effect(s) of an arc producing tokens to its place."""
+    if len(tokens) == 1:
+        return [Produce(arc=arc, token=next(iter(tokens)))]
+    if tokens:
+        return [ProduceMany(arc=arc, tokens=tokens if isinstance(tokens, PSet) else pset(tokens))]
+    return []
+
+
+def input_effects(arc: CompletedArcPT, tokens: TokenSet) -> Sequence[Input | InputMany]:
+    """Return the effect(s) of an arc passing tokens to its transition as inputs."""
+    if len(tokens) == 1:
+        return [Input(arc=arc, token=next(iter(tokens)))]
+    if tokens:
+        return [InputMany(arc=arc, tokens=frozenset(tokens))]
+    return []
+
+
+def output_effects(arc: CompletedArcTP, tokens: TokenSet) -> Sequence[Output | OutputMany]:
+    """Return the effect(s) of a transition returning tokens as outputs for an arc."""
+    if len(tokens) == 1:
+        return [Output(arc=arc, token=next(iter(tokens)))]
+    if tokens:
+        return [OutputMany(arc=arc, tokens=frozenset(tokens))]
+    return []
+
+
+def expand_effects(effects: Iterable[Effect]) -> Iterator[Effect]:
+    """
+    Generates the effects with each effect on several tokens replaced by one effect per token.
+
+    `Reset` and `Transfer` effects, which move the whole contents of a place, are left as they are.
+    """
+    expanded = {ConsumeMany: Consume, InputMany: Input, OutputMany: Output, ProduceMany: Produce}
+    for effect in effects:
+        single = expanded.get(type(effect))
+        if single is None:
+            yield effect
+        else:
+            yield from (single(effect.arc, token) for token in effect.tokens)
 
 
 def apply_effects_to_marking(marking: PMarking, effects: Sequence[Effect]) -> PMarking:
@@ -0,0 +1,525 @@
+"""
+Declarative guard expressions over token `data`.
+
+Expressions are built from `data_field`, `color_is`, and the aggregates `count`, `total`, `minimum`, and `maximum`,
+combined with comparison operators and with `&`, `|`, and `~`:
+
+    >>> from carladam import Color
+    >>> Order = Color("Order")
+    >>> guard = total("amount", where=color_is(Order)) >= 100
+    >>> guard
+    total('amount', where=color_is(Order)) >= 100
+    >>> guard({Order(amount=60), Order(amount=50)})
+    True
+
+A `Condition` such as `guard` above may be used as either a `Transition` guard or an arc guard;
+as an arc guard it replaces the default check of arc weights, like any other arc guard.
+A `Predicate` such as `data_field("amount") > 10` tests a single token, so it may also be passed to `tokens_where`,
+or used to filter a set of tokens with `Predicate.filter`.
+
+When NumPy is installed, large sets of tokens are evaluated column-wise across all tokens at once
+rather than token by token. The columns of a persistent set of tokens, such as the tokens in a place of a marking,
+are built once and reused for as long as the set exists, so guards evaluated again and again over places that have
+not changed only pay for the column-wise comparisons. Guards that are plain callables are evaluated as before.
+"""
+
+from __future__ import annotations
+
+import operator
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Sequence
+
+from attr import define, field
+from pyrsistent import PSet, pset
+
+from carladam.petrinet.color import Color
+from carladam.petrinet.indexed import IndexedTokenSet
+from carladam.petrinet.token import Token, TokenSet
+
+try:
+    import numpy
+except ImportError:  # pragma: nocover
+    numpy = None
+
+VECTORIZE_THRESHOLD = 256
+"Minimum number of tokens for which expressions are evaluated column-wise using NumPy, when it is installed."
+
+_MISSING = object()
+"Sentinel for tokens whose `data` does not contain a field."
+
+OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+"Comparison operators supported by expressions, keyed by symbol."
+
+_columns_of_sets: dict[int, tuple[weakref.ref, Columns]] = {}
+"Columns of persistent sets of tokens, keyed by the identity of the set and dropped when it is garbage collected."
+
+
+def vectorize(tokens: TokenSet, vectorized: bool | None) -> bool:
+    """Returns True if `tokens` should be evaluated column-wise, given an optional explicit choice."""
+    if vectorized is None:
+        return numpy is not None and len(tokens) >= VECTORIZE_THRESHOLD
+    if vectorized and numpy is None:  # pragma: nocover
+        raise RuntimeError("NumPy is required for vectorized evaluation of expressions.")
+    return vectorized
+
+
+class Columns:
+    """Column-wise view of the `data` of a sequence of tokens, built lazily one field at a time."""
+
+    __slots__ = ("tokens", "_fields", "_colors")
+
+    def __init__(self, tokens: Sequence[Token]):
+        self.tokens = tokens
+        self._fields = {}
+        self._colors = {}
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def field(self, name: str) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Returns the values of a field for every token, and whether each token has the field.
+
+        Missing values are filled in with a value present in another token,
+        so that the column keeps the dtype of the values actually present.
+        Values other than all strings or all numbers, such as numbers mixed with strings, or tuples,
+        are kept as Python objects and compared as they are when evaluating token by token.
+        """
+        if name not in self._fields:
+            values = [token.data.get(name, _MISSING) for token in self.tokens]
+            present = numpy.fromiter((value is not _MISSING for value in values), bool, len(values))
+            fill = next((value for value in values if value is not _MISSING), 0)
+            filled = [fill if value is _MISSING else value for value in values]
+            types = {type(value) for value in filled}
+            if types <= {str} or types <= {bool, int, float}:
+                column = numpy.asarray(filled)
+            else:
+                column = numpy.fromiter(filled, object, len(filled))
+            self._fields[name] = column, present
+        return self._fields[name]
+
+    def colors(self, colors: frozenset[Color]) -> numpy.ndarray:
+        """Returns whether each token has one of the given colors."""
+        if colors not in self._colors:
+            self._colors[colors] = numpy.fromiter((token.color in colors for token in self.tokens), bool, len(self))
+        return self._colors[colors]
+
+
+def columns_of(tokens: TokenSet) -> Columns:
+    """Returns a column-wise view of a set of tokens, reusing the one built before for the same persistent set."""
+    if not isinstance(tokens, (PSet, IndexedTokenSet)):
+        return Columns(list(tokens))
+    # Keyed by identity, as comparing equal sets would take as long as building their columns.
+    key = id(tokens)
+    cached = _columns_of_sets.get(key)
+    if cached is not None and cached[0]() is tokens:
+        return cached[1]
+    result = Columns(list(tokens))
+    _columns_of_sets[key] = weakref.ref(tokens, lambda _, key=key: _columns_of_sets.pop(key, None)), result
+    return result
+
+
+def column_operation(expression: Any, operation: Callable[..., Any], *args: Any) -> Any:
+    """Applies an operation to columns, raising `TypeError` if NumPy cannot apply it to their values."""
+    try:
+        return operation(*args)
+    except TypeError as e:
+        # NumPy raises private subclasses of TypeError when a ufunc has no loop for the values' types.
+        raise TypeError(f"{expression!r} cannot be evaluated for these values: {e}") from e
+
+
+@define(frozen=True, eq=False)
+class DataField:
+    """The value of a field of a token's `data`. Compare it to a value or to another field to get a `Predicate`."""
+
+    name: str
+
+    def __repr__(self):
+        return f"data_field({self.name!r})"
+
+    def value(self, token: Token) -> Any:
+        return token.data.get(self.name, _MISSING)
+
+    def column(self, columns: Columns) -> tuple[numpy.ndarray, numpy.ndarray]:
+        return columns.field(self.name)
+
+    def _compare(self, symbol: str, other: Any) -> Comparison:
+        return Comparison(symbol, self, other)
+
+    def __eq__(self, other) -> Comparison:  # type: ignore[override]
+        return self._compare("==", other)
+
+    def __ne__(self, other) -> Comparison:  # type: ignore[override]
+        return self._compare("!=", other)
+
+    def __lt__(self, other) -> Comparison:
+        return self._compare("<", other)
+
+    def __le__(self, other) -> Comparison:
+        return self._compare("<=", other)
+
+    def __gt__(self, other) -> Comparison:
+        return self._compare(">", other)
+
+    def __ge__(self, other) -> Comparison:
+        return self._compare(">=", other)
+
+    __hash__ = object.__hash__
+
+
+def data_field(name: str) -> DataField:
+    """Returns an expression for the value of the field `name` of a token's `data`."""
+    return DataField(name)
+
+
+class Predicate(ABC):
+    """
+    A condition tested against each token.
+
+    Calling a predicate with a token returns True or False; tokens lacking a compared field never match.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, token: Token) -> bool:
+        return self.test(token)
+
+    @abstractmethod
+    def test(self, token: Token) -> bool:
+        """Returns True if the token matches."""
+
+    @abstractmethod
+    def mask(self, columns: Columns) -> numpy.ndarray:
+        """Returns whether each token in `columns` matches."""
+
+    def filter(self, tokens: TokenSet, vectorized: bool | None = None) -> TokenSet:
+        """Returns the tokens that match this predicate."""
+        if not vectorize(tokens, vectorized):
+            return pset(token for token in tokens if self.test(token))
+        view = columns_of(tokens)
+        return pset(token for token, match in zip(view.tokens, self.mask(view)) if match)
+
+    def __and__(self, other: Predicate) -> Predicate:
+        return AllOf((self, other))
+
+    def __or__(self, other: Predicate) -> Predicate:
+        return AnyOf((self, other))
+
+    def __invert__(self) -> Predicate:
+        return Not(self)
+
+
+@define(frozen=True, eq=False)
+class Comparison(Predicate):
+    """Compares a field of each token's `data` with a value or with another field."""
+
+    symbol: str
+    left: DataField
+    right: Any
+
+    def __repr__(self):
+        return f"{self.left!r} {self.symbol} {self.right!r}"
+
+    def test(self, token: Token) -> bool:
+        left = self.left.value(token)
+        right = self.right.value(token) if isinstance(self.right, DataField) else self.right
+        if left is _MISSING or right is _MISSING:
+            return False
+        return bool(OPERATORS[self.symbol](left, right))
+
+    def mask(self, columns: Columns) -> numpy.ndarray:
+        compare = OPERATORS[self.symbol]
+        left, present = self.left.column(columns)
+        if isinstance(self.right, DataField):
+            right, right_present = self.right.column(columns)
+            present = present & right_present
+            elementwise = left.dtype == object or right.dtype == object
+        else:
+            right = self.right
+            # NumPy would compare each item of a sequence to a column of the same length, rather than the sequence.
+            elementwise = left.dtype == object or numpy.ndim(right) != 0
+            if elementwise:
+                right = [right] * len(left)
+        if elementwise:
+            # Python objects are compared one by one, as they are when evaluating token by token.
+            pairs = zip(left, right)
+            return column_operation(self, numpy.fromiter, (compare(*pair) for pair in pairs), bool, len(left)) & present
+        return numpy.asarray(column_operation(self, compare, left, right), dtype=bool) & present
+
+
+@define(frozen=True, eq=False)
+class ColorIs(Predicate):
+    """Tests whether each token has one of the given colors."""
+
+    colors: frozenset[Color] = field(converter=frozenset)
+
+    def __repr__(self):
+        return f"color_is({', '.join(sorted(repr(color) for color in self.colors))})"
+
+    def test(self, token: Token) -> bool:
+        return token.color in self.colors
+
+    def mask(self, columns: Columns) -> numpy.ndarray:
+        return columns.colors(self.colors)
+
+
+def color_is(*colors: Color) -> ColorIs:
+    """Returns a predicate matching tokens having any of the given colors."""
+    return ColorIs(colors)
+
+
+@define(frozen=True, eq=False)
+class AllOf(Predicate):
+    predicates: tuple[Predicate, ...]
+
+    def __repr__(self):
+        return f"({' & '.join(repr(predicate) for predicate in self.predicates)})"
+
+    def test(self, token: Token) -> bool:
+        return all(predicate.test(token) for predicate in self.predicates)
+
+    def mask(self, columns: Columns) -> numpy.ndarray:
+        return numpy.logical_and.reduce([predicate.mask(columns) for predicate in self.predicates])
+
+
+@define(frozen=True, eq=False)
+class AnyOf(Predicate):
+    predicates: tuple[Predicate, ...]
+
+    def __repr__(self):
+        return f"({' | '.join(repr(predicate) for predicate in self.predicates)})"
+
+    def test(self, token: Token) -> bool:
+        return any(predicate.test(token) for predicate in self.predicates)
+
+    def mask(self, columns: Columns) -> numpy.ndarray:
+        return numpy.logical_or.reduce([predicate.mask(columns) for predicate in self.predicates])
+
+
+@define(frozen=True, eq=False)
+class Not(Predicate):
+    predicate: Predicate
+
+    def __repr__(self):
+        return f"~{self.predicate!r}"
+
+    def test(self, token: Token) -> bool:
+        return not self.predicate.test(token)
+
+    def mask(self, columns: Columns) -> numpy.ndarray:
+        return ~self.predicate.mask(columns)
+
+
+class Condition(ABC):
+    """
+    A condition tested against a whole set of tokens.
+
+    Callable as a `Transition` guard, receiving the transition's input tokens,
+    or as an arc guard, receiving the tokens in the arc's place.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, *args) -> bool:
+        # Transition guards receive (tokens,), arc guards receive (arc, tokens).
+        return self.evaluate(args[-1])
+
+    def evaluate(self, tokens: TokenSet, vectorized: bool | None = None) -> bool:
+        """
+        Returns True if the condition holds for `tokens`.
+
+        By default, tokens are evaluated column-wise when NumPy is installed and there are at least
+        `VECTORIZE_THRESHOLD` of them. Pass `vectorized` to choose explicitly.
+        """
+        if vectorize(tokens, vectorized):
+            return self.holds_for_columns(columns_of(tokens))
+        return self.holds_for_tokens(tokens)
+
+    @abstractmethod
+    def holds_for_tokens(self, tokens: TokenSet) -> bool:
+        """Returns True if the condition holds for `tokens`, evaluated token by token."""
+
+    @abstractmethod
+    def holds_for_columns(self, columns: Columns) -> bool:
+        """Returns True if the condition holds for the tokens in `columns`, evaluated column-wise."""
+
+    def __and__(self, other: Condition) -> Condition:
+        return AllConditions((self, other))
+
+    def __or__(self, other: Condition) -> Condition:
+        return AnyCondition((self, other))
+
+    def __invert__(self) -> Condition:
+        return NotCondition(self)
+
+
+@define(frozen=True, eq=False)
+class Aggregate:
+    """
+    A value computed over a set of tokens, such as a count or a sum.
+
+    Compare it to a value to get a `Condition`.
+    `minimum` and `maximum` of no values fail every comparison; `total` of no values is 0.
+    """
+
+    kind: str
+    name: str | None = None
+    where: Predicate | None = None
+
+    def __repr__(self):
+        args = [] if self.name is None else [repr(self.name)]
+        if self.where is not None:
+            args.append(f"where={self.where!r}")
+        return f"{self.kind}({', '.join(args)})"
+
+    def value(self, tokens: TokenSet) -> Any:
+        """Returns the value of this aggregate for a set of tokens."""
+        if self.where is not None:
+            tokens = [token for token in tokens if self.where.test(token)]
+        if self.kind == "count":
+            return len(tokens)
+        values = [value for token in tokens if (value := token.data.get(self.name, _MISSING)) is not _MISSING]
+        if self.kind == "total":
+            return sum(values)
+        if not values:
+            return None
+        return min(values) if self.kind == "minimum" else max(values)
+
+    def column_value(self, columns: Columns) -> Any:
+        """Returns the value of this aggregate for the tokens in `columns`."""
+        mask = numpy.ones(len(columns), dtype=bool) if self.where is None else self.where.mask(columns)
+        if self.kind == "count":
+            return int(numpy.count_nonzero(mask))
+        values, present = columns.field(self.name)
+        values = values[mask & present]
+        if self.kind == "total":
+            return column_operation(self, values.sum) if len(values) else 0
+        if not len(values):
+            return None
+        return column_operation(self, values.min if self.kind == "minimum" else values.max)
+
+    def _compare(self, symbol: str, other: Any) -> Threshold:
+        return Threshold(symbol, self, other)
+
+    def __eq__(self, other) -> Threshold:  # type: ignore[override]
+        return self._compare("==", other)
+
+    def __ne__(self, other) -> Threshold:  # type: ignore[override]
+        return self._compare("!=", other)
+
+    def __lt__(self, other) -> Threshold:
+        return self._compare("<", other)
+
+    def __le__(self, other) -> Threshold:
+        return self._compare("<=", other)
+
+    def __gt__(self, other) -> Threshold:
+        return self._compare(">", other)
+
+    def __ge__(self, other) -> Threshold:
+        return self._compare(">=", other)
+
+    __hash__ = object.__hash__
+
+
+def count(where: Predicate | None = None) -> Aggregate:
+    """Returns an aggregate counting the tokens, optionally only those matching `where`."""
+    return Aggregate("count", where=where)
+
+
+def total(name: str, where: Predicate | None = None) -> Aggregate:
+    """Returns an aggregate summing the field `name` of tokens, optionally only those matching `where`."""
+    return Aggregate("total", name, where)
+
+
+def minimum(name: str, where: Predicate | None = None) -> Aggregate:
+    """Returns an aggregate of the smallest value of the field `name`, optionally only of tokens matching `where`."""
+    return Aggregate("minimum", name, where)
+
+
+def maximum(name: str, where: Predicate | None = None) -> Aggregate:
+    """Returns an aggregate of the largest value of the field `name`, optionally only of tokens matching `where`."""
+    return Aggregate("maximum", name, where)
+
+
+@define(frozen=True, eq=False)
+class Threshold(Condition):
+    """Compares an `Aggregate` with a value."""
+
+    symbol: str
+    aggregate: Aggregate
+    value: Any
+
+    def __repr__(self):
+        return f"{self.aggregate!r} {self.symbol} {self.value!r}"
+
+    def _holds(self, value: Any) -> bool:
+        if value is None:
+            return False
+        return bool(OPERATORS[self.symbol](value, self.value))
+
+    def holds_for_tokens(self, tokens: TokenSet) -> bool:
+        return self._holds(self.aggregate.value(tokens))
+
+    def holds_for_columns(self, columns: Columns) -> bool:
+        return self._holds(self.aggregate.column_value(columns))
+
+
+def any_token(predicate: Predicate) -> Condition:
+    """Returns a condition that holds if at least one token matches `predicate`."""
+    return count(predicate) >= 1
+
+
+def all_tokens(predicate: Predicate) -> Condition:
+    """Returns a condition that holds if every token matches `predicate`, including when there are no tokens."""
+    return count(~predicate) == 0
+
+
+@define(frozen=True, eq=False)
+class AllConditions(Condition):
+    conditions: tuple[Condition, ...]
+
+    def __repr__(self):
+        return f"({' & '.join(repr(condition) for condition in self.conditions)})"
+
+    def holds_for_tokens(self, tokens: TokenSet) -> bool:
+        return all(condition.holds_for_tokens(tokens) for condition in self.conditions)
+
+    def holds_for_columns(self, columns: Columns) -> bool:
+        return all(condition.holds_for_columns(columns) for condition in self.conditions)
+
+
+@define(frozen=True, eq=False)
+class AnyCondition(Condition):
+    conditions: tuple[Condition, ...]
+
+    def __repr__(self):
+        return f"({' | '.join(repr(condition) for condition in self.conditions)})"
+
+    def holds_for_tokens(self, tokens: TokenSet) -> bool:
+        return any(condition.holds_for_tokens(tokens) for condition in self.conditions)
+
+    def holds_for_columns(self, columns: Columns) -> bool:
+        return any(condition.holds_for_columns(columns) for condition in self.conditions)
+
+
+@define(frozen=True, eq=False)
+class NotCondition(Condition):
+    condition: Condition
+
+    def __repr__(self):
+        return f"~{self.condition!r}"
+
+    def holds_for_tokens(self, tokens: TokenSet) -> bool:
+        return not self.condition.holds_for_tokens(tokens)
+
+    def holds_for_columns(self, columns: Columns) -> bool:
+        return not self.condition.holds_for_columns(columns)
@@ -0,0 +1,157 @@
+"""
+Hierarchical nets, composed of instances of child nets that are expanded only when needed.
+
+A `ModuleInstance` refers to a child net (its module) and binds some of the child's places (its ports)
+to places of a parent net. Instances share their module rather than copying it,
+so building a model of many identical instances costs little until its interior is needed.
+An instance may also stand in for a substitution transition of the parent net, which it replaces when expanded.
+
+A `HierarchicalNet` pairs a parent net with its module instances. `HierarchicalNet.flatten` returns an ordinary
+`PetriNet` for simulation and analysis, expanding every instance; `ModuleInstance.expanded` expands just one.
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> station = PetriNet.new(inbox := Place("In"), work := Transition("Work"), outbox := Place("Out"),
+    ...                        inbox >> work, work >> outbox)
+    >>> line = PetriNet.new(a := Place("A"), b := Place("B"), c := Place("C"))
+    >>> plant = HierarchicalNet(line, [
+    ...     ModuleInstance("S1", station, {inbox: a, outbox: b}),
+    ...     ModuleInstance("S2", station, {inbox: b, outbox: c}),
+    ... ])
+    >>> flat = plant.flatten()
+    >>> sorted(transition.name for transition in flat.transitions)
+    ['S1.Work', 'S2.Work']
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping, Sequence
+
+import attrs
+from attr import define, field
+from pyrsistent import pmap
+
+from carladam.petrinet.compose import compose, remap_arc
+from carladam.petrinet.marking import Marking
+from carladam.petrinet.petrinet import PetriNet
+from carladam.petrinet.place import Place
+from carladam.petrinet.transition import Transition
+from carladam.petrinet.types import PetriNetMember, PetriNetNode
+from carladam.util.cache import cached_method
+
+SEPARATOR = "."
+"Separates an instance's name from the names and IDs of the nodes it contains, when expanded."
+
+
+@define(frozen=True, eq=False)
+class ModuleInstance:
+    """An instance of a child net, with some of its places bound to places of a parent net."""
+
+    name: str
+    "Name of this instance, unique within its parent; prefixed to the names and IDs of its expanded nodes."
+
+    module: PetriNet | HierarchicalNet
+    "The child net. It is shared, not copied, by every instance of it."
+
+    bindings: Mapping[Place, Place] = field(factory=pmap, converter=pmap)
+    "Mapping of the module's port places to the parent places they are fused with."
+
+    transition: Transition | None = None
+    "Substitution transition of the parent net that this instance replaces when expanded, if any."
+
+    _caches: dict = field(factory=dict, init=False, eq=False, repr=False)
+
+    def __repr__(self):
+        return f"<ModuleInstance {self.name!r}>"
+
+    @property
+    def module_net(self) -> PetriNet:
+        """The module as a flat net, expanding any module instances it contains itself."""
+        if isinstance(self.module, HierarchicalNet):
+            return self.module.flatten()
+        return self.module
+
+    def node(self, node: PetriNetNode) -> PetriNetNode:
+        """Returns the expanded node corresponding to a node of the module."""
+        return self._node_mapping()[node]
+
+    def marking(self, marking: Marking) -> Marking:
+        """Returns a marking of the module's places as a marking of the corresponding expanded places."""
+        return {self.node(place): tokens for place, tokens in marking.items()}
+
+    @property
+    def expanded(self) -> PetriNet:
+        """A net of this instance's expanded nodes and arcs, including the parent places its ports are bound to."""
+        return self._expanded()
+
+    def members(self) -> Sequence[PetriNetMember]:
+        """Returns the expanded places, transitions, and arcs of this instance."""
+        return self._members()
+
+    @cached_method
+    def _node_mapping(self) -> Mapping[PetriNetNode, PetriNetNode]:
+        module = self.module_net
+        mapping = {}
+        for place in module.places:
+            mapping[place] = self.bindings.get(place) or self._renamed(place)
+        for transition in module.transitions:
+            mapping[transition] = self._renamed(transition)
+        return mapping
+
+    def _renamed(self, node: PetriNetNode) -> PetriNetNode:
+        prefix = f"{self.name}{SEPARATOR}"
+        return attrs.evolve(node, id=prefix + node.id, name=prefix + node.name)
+
+    @cached_method
+    def _members(self) -> Sequence[PetriNetMember]:
+        mapping = self._node_mapping()
+        return (*mapping.values(), *(remap_arc(arc, mapping) for arc in self.module_net.arcs))
+
+    @cached_method
+    def _expanded(self) -> PetriNet:
+        return compose(self.members())
+
+
+@define(frozen=True, eq=False)
+class HierarchicalNet:
+    """A parent net together with instances of child nets, expanded into a flat net only on demand."""
+
+    net: PetriNet
+    "The parent net, including any substitution transitions."
+
+    instances: tuple[ModuleInstance, ...] = field(factory=tuple, converter=tuple)
+    "Module instances within the parent net."
+
+    _caches: dict = field(factory=dict, init=False, eq=False, repr=False)
+
+    def __attrs_post_init__(self):
+        names = [instance.name for instance in self.instances]
+        if len(set(names)) != len(names):
+            raise ValueError("Module instance names must be unique within a net.", names)
+
+    def instance(self, name: str) -> ModuleInstance:
+        """Returns the module instance with the given name."""
+        for instance in self.instances:
+            if instance.name == name:
+                return instance
+        raise KeyError(name)
+
+    def flatten(self) -> PetriNet:
+        """Returns the parent net with every module instance expanded, and substitution transitions replaced."""
+        return self._flatten()
+
+    @cached_method
+    def _flatten(self) -> PetriNet:
+        substituted = {instance.transition for instance in self.instances if instance.transition is not None}
+        return compose(
+            self._parent_members(substituted),
+            *(instance.members() for instance in self.instances),
+            structure=self.net.structure,
+        )
+
+    def _parent_members(self, substituted: set[Transition]) -> Iterable[PetriNetMember]:
+        for member in self.net:
+            if member in substituted:
+                continue
+            if getattr(member, "src", None) in substituted or getattr(member, "dest", None) in substituted:
+                continue
+            yield member
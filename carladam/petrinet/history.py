@@ -0,0 +1,163 @@
+"""
+Navigable history of an interactive simulation, with undo, redo, and random access to every step.
+
+A `History` records each step's transition and its per-place changes (`PlaceDelta`s).
+By default it also keeps the marking after every step; markings are persistent maps,
+so consecutive snapshots share all places a step left unchanged.
+Moving to any step is then a lookup:
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> net = PetriNet.new(a := Place("A"), t := Transition("T"), b := Place("B"), a >> t, t >> b)
+    >>> history = History(net, {a: {Token(), Token()}})
+    >>> _ = history.step(t); _ = history.step(t)
+    >>> len(history.undo()[a]), history.position
+    (1, 1)
+    >>> len(history.redo()[b]), history.position
+    (2, 2)
+
+Given a `checkpoint_interval` of k, a history instead keeps the marking of only every k-th step.
+Undo and redo then apply one step's deltas to the current marking, in reverse or forward,
+and reaching an arbitrary step applies at most k-1 steps' deltas to the nearest checkpoint before it.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, TYPE_CHECKING
+
+from attr import define, field
+
+from carladam.petrinet.effects import apply_effects_to_marking
+from carladam.petrinet.marking import PMarking, empty_tokens, pmarking
+from carladam.petrinet.occurrence import Occurrence
+from carladam.petrinet.trace import PlaceDelta, place_deltas
+from carladam.petrinet.transition import Transition
+
+if TYPE_CHECKING:  # pragma: nocover
+    from carladam.petrinet.petrinet import PetriNet
+
+
+def apply_deltas(marking: PMarking, deltas: Sequence[PlaceDelta], reverse: bool = False) -> PMarking:
+    """
+    Returns the marking after a step that made the given changes; or, if `reverse`, the marking before it.
+
+    Places left without tokens are removed from the marking, as they are when tokens are consumed.
+    """
+    for place, removed, added in deltas:
+        if reverse:
+            removed, added = added, removed
+        evolver = marking.get(place, empty_tokens(place)).evolver()
+        for token in removed:
+            evolver.remove(token)
+        for token in added:
+            evolver.add(token)
+        tokens = evolver.persistent()
+        marking = marking.set(place, tokens) if tokens else marking.discard(place)
+    return marking
+
+
+@define
+class History:
+    """
+    The steps of a simulation, starting from an initial marking, and a position within them.
+
+    Taking a step when the position is not at the end discards the steps after it, as in a text editor.
+    """
+
+    net: PetriNet
+
+    initial_marking: PMarking = field(converter=pmarking)
+
+    checkpoint_interval: int | None = None
+    "Keep the marking of only every this many steps, or of every step if None."
+
+    transitions: list[Transition] = field(factory=list, init=False)
+    "Transition of each step."
+
+    deltas: list[tuple[PlaceDelta, ...]] = field(factory=list, init=False)
+    "Changes made by each step, one `PlaceDelta` per place changed."
+
+    position: int = field(default=0, init=False)
+    "Number of steps taken to reach the current marking."
+
+    marking: PMarking = field(init=False)
+    "Current marking."
+
+    _snapshots: list[PMarking] = field(init=False, repr=False)
+    "Marking after every `checkpoint_interval` steps (or every step), starting with the initial marking."
+
+    def __attrs_post_init__(self):
+        if self.checkpoint_interval is not None and self.checkpoint_interval < 1:
+            raise ValueError("Checkpoint interval must be at least 1.", self.checkpoint_interval)
+        self.marking = self.initial_marking
+        self._snapshots = [self.initial_marking]
+
+    def __len__(self) -> int:
+        """Number of steps recorded, including any that can be redone."""
+        return len(self.transitions)
+
+    @property
+    def interval(self) -> int:
+        """Number of steps between kept markings."""
+        return self.checkpoint_interval or 1
+
+    @property
+    def can_undo(self) -> bool:
+        """True if there is a step before the current position."""
+        return self.position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        """True if there is a recorded step after the current position."""
+        return self.position < len(self)
+
+    def step(self, transition: Transition) -> PMarking:
+        """Fires a transition from the current marking, discarding any steps that could be redone."""
+        effects = Occurrence(self.net, self.marking, transition).bulk_effects(record_io=False)
+        marking = apply_effects_to_marking(self.marking, effects)
+        del self.transitions[self.position :]
+        del self.deltas[self.position :]
+        del self._snapshots[self.position // self.interval + 1 :]
+        self.transitions.append(transition)
+        self.deltas.append(place_deltas(effects))
+        self.position += 1
+        self._keep(marking)
+        return marking
+
+    def undo(self) -> PMarking:
+        """Moves back one step, returning the marking before it."""
+        if not self.can_undo:
+            raise IndexError("Nothing to undo.")
+        return self.go_to(self.position - 1)
+
+    def redo(self) -> PMarking:
+        """Moves forward one step, returning the marking after it."""
+        if not self.can_redo:
+            raise IndexError("Nothing to redo.")
+        return self.go_to(self.position + 1)
+
+    def go_to(self, position: int) -> PMarking:
+        """Moves to the given step, returning the marking after it."""
+        self.marking = self.marking_at(position)
+        self.position = position
+        return self.marking
+
+    def marking_at(self, position: int) -> PMarking:
+        """Returns the marking after the given number of steps, without moving to it."""
+        if not 0 <= position <= len(self):
+            raise IndexError("Step out of range.", position)
+        checkpoint, offset = divmod(position, self.interval)
+        if not offset:
+            return self._snapshots[checkpoint]
+        if position == self.position - 1:
+            return apply_deltas(self.marking, self.deltas[position], reverse=True)
+        if position == self.position + 1:
+            return apply_deltas(self.marking, self.deltas[self.position])
+        marking = self._snapshots[checkpoint]
+        for deltas in self.deltas[position - offset : position]:
+            marking = apply_deltas(marking, deltas)
+        return marking
+
+    def _keep(self, marking: PMarking):
+        self.marking = marking
+        if not self.position % self.interval:
+            self._snapshots.append(marking)
@@ -0,0 +1,169 @@
+"""
+Persistent token sets with hash indexes on fields of token `data`.
+
+A `Place` declares the fields to index using its `indexes` attribute.
+Markings then hold an `IndexedTokenSet` for that place, whose indexes are kept up to date
+as tokens are consumed and produced, so that lookups by field value do not scan every token.
+
+Arc guards receive all the tokens of their place as an `IndexedTokenSet`, so they benefit from its indexes.
+Transition guards and functions, and arc transforms, receive the tokens selected from input places,
+which are not indexed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Set
+from typing import Any, Hashable, Iterable, Iterator
+
+from pyrsistent import PMap, PSet, pmap, pset
+
+from carladam.petrinet.token import Token, TokenFilter, TokenSet
+
+_MISSING = object()
+"Sentinel for tokens whose `data` does not contain an indexed field."
+
+
+class IndexedTokenSet(Set):
+    """
+    A persistent set of tokens, indexed by the values of one or more fields of their `data`.
+
+    Equal to, and hashed the same as, a `pset` containing the same tokens.
+    Indexed field values must be hashable; tokens lacking an indexed field are not included in that field's index.
+
+    Example:
+
+        >>> from carladam import Token
+        >>> t1, t2 = Token(data={"order_id": 1}), Token(data={"order_id": 2})
+        >>> tokens = IndexedTokenSet.create(["order_id"], [t1, t2])
+        >>> tokens.where("order_id", 2) == {t2}
+        True
+        >>> len(tokens.remove(t2).where("order_id", 2))
+        0
+    """
+
+    __slots__ = ("fields", "_tokens", "_indexes", "__weakref__")
+
+    fields: tuple[str, ...]
+    _tokens: PSet[Token]
+    _indexes: PMap[str, PMap[Hashable, PSet[Token]]]
+
+    def __init__(self, fields: tuple[str, ...], tokens: PSet[Token], indexes: PMap[str, PMap[Hashable, PSet[Token]]]):
+        self.fields = fields
+        self._tokens = tokens
+        self._indexes = indexes
+
+    @classmethod
+    def create(cls, fields: Iterable[str], tokens: Iterable[Token] = ()) -> IndexedTokenSet:
+        """Return a new set indexing the given `fields`, containing the given `tokens`."""
+        fields = tuple(fields)
+        return cls(fields, pset(), pmap((field, pmap()) for field in fields)).update(tokens)
+
+    def __contains__(self, token: object) -> bool:
+        return token in self._tokens
+
+    def __iter__(self) -> Iterator[Token]:
+        return iter(self._tokens)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __hash__(self):
+        return hash(self._tokens)
+
+    def __repr__(self):
+        return f"IndexedTokenSet({list(self.fields)!r}, {list(self._tokens)!r})"
+
+    def evolver(self) -> IndexedTokenSetEvolver:
+        """Return a mutable view of this set that produces a new persistent set when done."""
+        return IndexedTokenSetEvolver(self)
+
+    def add(self, token: Token) -> IndexedTokenSet:
+        return self.evolver().add(token).persistent()
+
+    def remove(self, token: Token) -> IndexedTokenSet:
+        """Return a new set without `token`, raising `KeyError` if it is not present."""
+        return self.evolver().remove(token).persistent()
+
+    def discard(self, token: Token) -> IndexedTokenSet:
+        return self.remove(token) if token in self else self
+
+    def update(self, tokens: Iterable[Token]) -> IndexedTokenSet:
+        evolver = self.evolver()
+        for token in tokens:
+            evolver.add(token)
+        return evolver.persistent()
+
+    def where(self, field: str, value: Any) -> PSet[Token]:
+        """Return the tokens whose `data[field]` equals `value`, using an index if `field` is indexed."""
+        if field in self._indexes:
+            return self._indexes[field].get(value, pset())
+        return pset(token for token in self._tokens if token.data.get(field, _MISSING) == value)
+
+
+class IndexedTokenSetEvolver:
+    """Accumulates changes to an `IndexedTokenSet`; see `pyrsistent`'s evolvers."""
+
+    __slots__ = ("_original", "_tokens", "_indexes")
+
+    def __init__(self, original: IndexedTokenSet):
+        self._original = original
+        self._tokens = original._tokens.evolver()
+        self._indexes = {field: index.evolver() for field, index in original._indexes.items()}
+
+    def add(self, token: Token) -> IndexedTokenSetEvolver:
+        # Adding a token already present leaves both the set and its index entries unchanged.
+        self._tokens.add(token)
+        for field, index in self._indexes.items():
+            value = token.data.get(field, _MISSING)
+            if value is _MISSING:
+                continue
+            index[value] = (index[value] if value in index else pset()).add(token)
+        return self
+
+    def remove(self, token: Token) -> IndexedTokenSetEvolver:
+        self._tokens.remove(token)
+        for field, index in self._indexes.items():
+            value = token.data.get(field, _MISSING)
+            if value is _MISSING:
+                continue
+            remaining = index[value].remove(token)
+            if remaining:
+                index[value] = remaining
+            else:
+                index.remove(value)
+        return self
+
+    def persistent(self) -> IndexedTokenSet:
+        if not self._tokens.is_dirty():
+            return self._original
+        indexes = pmap((field, index.persistent()) for field, index in self._indexes.items())
+        return IndexedTokenSet(self._original.fields, self._tokens.persistent(), indexes)
+
+
+def tokens_with(**data) -> TokenFilter:
+    """
+    Return a function that filters a set of tokens to those whose `data` has all of the given values.
+
+    When given an `IndexedTokenSet`, indexed fields are looked up by hash rather than by scanning every token.
+    Arc guards receive such a set for an indexed place; transition guards receive a plain set, and scan it.
+
+    Example:
+
+        >>> from carladam import Token
+        >>> t1, t2 = Token(data={"order_id": 1}), Token(data={"order_id": 2})
+        >>> tokens_with(order_id=1)({t1, t2}) == {t1}
+        True
+    """
+
+    def with_token_filter(tokens: TokenSet) -> TokenSet:
+        items = data.items()
+        if isinstance(tokens, IndexedTokenSet):
+            indexed = [(field, value) for field, value in items if field in tokens.fields]
+            if indexed:
+                # Narrow down using the smallest matching index entry, then check the remaining fields.
+                tokens = min((tokens.where(field, value) for field, value in indexed), key=len)
+        return pset(
+            token for token in tokens if all(token.data.get(field, _MISSING) == value for field, value in items)
+        )
+
+    return with_token_filter
@@ -3,10 +3,11 @@ from __future__ import annotations
 from collections import Counter
 from typing import AbstractSet, Mapping, MutableMapping
 
-from pyrsistent import pmap, pset
+from pyrsistent import PMap, PSet, pmap, pset
 from pyrsistent.typing import PMap as PMapType, PSet as PSetType
 
 from carladam.petrinet.color import ColorSet
+from carladam.petrinet.indexed import IndexedTokenSet
 from carladam.petrinet.place import Place
 from carladam.petrinet.token import Token
 
@@ -16,6 +17,30 @@ Marking = Mapping[Place, AbstractSet[Token]]
 MutableMarking = MutableMapping[Place, AbstractSet[Token]]
 
 PMarking = PMapType[Place, PSetType[Token]]
+"An immutable `Marking`. Places with `indexes` hold an `IndexedTokenSet` rather than a `PSet`."
+
+
+def empty_tokens(place: Place) -> PSet[Token] | IndexedTokenSet:
+    """Returns an empty persistent token set suited to the given `Place`."""
+    if place.indexes:
+        return IndexedTokenSet.create(place.indexes)
+    return pset()
+
+
+def persistent_tokens(place: Place, tokens: AbstractSet[Token]) -> PSet[Token] | IndexedTokenSet:
+    """
+    Returns `tokens` as a persistent token set suited to the given `Place`.
+
+    Places with `indexes` get an `IndexedTokenSet` on those fields; other places get a `PSet`.
+    Token sets that are already suitable are returned as-is rather than copied.
+    """
+    if place.indexes:
+        if isinstance(tokens, IndexedTokenSet) and tokens.fields == place.indexes:
+            return tokens
+        return IndexedTokenSet.create(place.indexes, tokens)
+    if isinstance(tokens, PSet):
+        return tokens
+    return pset(tokens)
 
 
 def marking_colorset(marking: Marking) -> Mapping[Place, ColorSet]:
@@ -29,5 +54,17 @@ def marking_colorset(marking: Marking) -> Mapping[Place, ColorSet]:
 
 
 def pmarking(marking: Marking | MutableMarking | PMarking) -> PMarking:
-    """Returns an immutable marking given a mutable or immutable marking."""
-    return pmap((place, pset(tokens)) for place, tokens in marking.items())
+    """
+    Returns an immutable marking given a mutable or immutable marking.
+
+    Token sets that are already suited to their place are kept as-is rather than copied;
+    see `persistent_tokens`.
+    """
+    if isinstance(marking, PMap):
+        evolver = marking.evolver()
+        for place, tokens in marking.items():
+            place_tokens = persistent_tokens(place, tokens)
+            if place_tokens is not tokens:
+                evolver[place] = place_tokens
+        return evolver.persistent()
+    return pmap((place, persistent_tokens(place, tokens)) for place, tokens in marking.items())
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 from collections import Counter
-from typing import Mapping, Sequence, TYPE_CHECKING
+from typing import Iterator, Mapping, Sequence, TYPE_CHECKING
 
 import attrs
-from pyrsistent import plist, pmap, pset
+from pyrsistent import PSet, plist, pmap, pset
 from pyrsistent.typing import PList
 
-from carladam.petrinet.arc import CompletedArcPT, CompletedArcTP
+from carladam.petrinet.arc import ArcKind, CompletedArcPT, CompletedArcTP
 from carladam.petrinet.color import ColorSet
-from carladam.petrinet.effects import Consume, Effect, Input, Output, Produce
+from carladam.petrinet.effects import (
+    Effect,
+    Reset,
+    Transfer,
+    consume_effects,
+    expand_effects,
+    input_effects,
+    output_effects,
+    produce_effects,
+)
 from carladam.petrinet.errors import (
     ArcGuardRaisesException,
     ArcGuardReturnsFalse,
@@ -20,6 +29,7 @@ from carladam.petrinet.errors import (
     TransitionNotEnabled,
 )
 from carladam.petrinet.marking import PMarking
+from carladam.petrinet.place import Place
 from carladam.petrinet.token import TokenSet
 from carladam.petrinet.transition import Transition
 
@@ -84,37 +94,82 @@ class Occurrence:
     def transition_inputs(self):
         inputs = set()
         for arc in self.input_arcs():
-            place = arc.src
-            new_place_tokens = set(self.marking.get(place) or set())
-            colors_left = dict(arc.weight)
-            for token in new_place_tokens.copy():
-                if colors_left.get(token.color, 0):
-                    inputs.add(token)
-                    new_place_tokens.remove(token)
-                    colors_left[token.color] -= 1
+            if arc.kind is ArcKind.RESET:
+                continue
+            inputs.update(self._matching_tokens(arc))
         return pset(inputs)
 
-    def effects(self) -> PList[Effect]:
+    def _matching_tokens(self, arc: CompletedArcPT) -> set:
+        """Select tokens from the arc's place, up to the quantity of each color given by its weight."""
+        colors_left = dict(arc.weight)
+        quantity_left = sum(colors_left.values())
+        matching_tokens = set()
+        for token in self.marking.get(arc.src, ()):
+            if not quantity_left:
+                break
+            if colors_left.get(token.color, 0):
+                matching_tokens.add(token)
+                colors_left[token.color] -= 1
+                quantity_left -= 1
+        return matching_tokens
+
+    def effects(self, record_io: bool = True) -> PList[Effect]:
+        """
+        Returns the effects of the transition occurring, with one effect per token, such as `Consume` or `Input`.
+
+        `Input` and `Output` effects leave the marking unchanged, so they are left out when `record_io` is False.
+        `Reset` and `Transfer` effects move the whole contents of a place.
+        """
+        return plist(expand_effects(self.bulk_effects(record_io)))
+
+    def bulk_effects(self, record_io: bool = True) -> PList[Effect]:
+        """
+        Returns the effects of the transition occurring, as `effects` does,
+        but with tokens moved together by an arc given a single effect, such as `ConsumeMany` or `InputMany`.
+
+        Applying these to a marking updates each place once per arc rather than once per token.
+        """
+        self.check_enabled()
+        return plist(self._effects(record_io))
+
+    def marking_after(self) -> PMarking:
+        """
+        Returns the marking after the transition occurs.
+
+        Effects are applied to the marking as they are made, without building a list of them.
+        """
         self.check_enabled()
-        effects = []
-        # Consume inputs.
+        marking = self.marking
+        for effect in self._effects(record_io=False):
+            marking = effect.apply_to_marking(marking)
+        return marking
+
+    def _effects(self, record_io: bool) -> Iterator[Effect]:
+        # Consume inputs. Tokens matched by read arcs are passed as inputs but left in place.
+        # Each arc consumes its tokens with a single effect, so marking updates scale with arcs rather than tokens.
         inputs = set()
+        resets = []
+        consumed: dict[Place, set] = {}
         for arc in self.input_arcs():
-            place = arc.src
-            colors_left = dict(arc.weight)
-            inputs_to_add = set()
-            tokens = self.marking.get(place, ())
-            for token in tokens:
-                if colors_left.get(token.color, 0):
-                    inputs_to_add.add(token)
-                    effects.append(Consume(arc=arc, token=token))
-                    colors_left[token.color] -= 1
+            if arc.kind is ArcKind.RESET:
+                resets.append(arc)
+                continue
+            inputs_to_add = self._matching_tokens(arc)
+            if arc.kind is not ArcKind.READ:
+                consumed.setdefault(arc.src, set()).update(inputs_to_add)
+                yield from consume_effects(arc, inputs_to_add)
             if callable(arc.transform):
                 inputs_to_add = arc.transform(inputs_to_add)
-            effects.extend(Input(arc=arc, token=token) for token in inputs_to_add)
+            if record_io:
+                yield from input_effects(arc, inputs_to_add)
             inputs.update(inputs_to_add)
+        # Reset places after other arcs consume from them, removing the tokens those arcs leave behind.
+        for arc in resets:
+            yield Reset(arc=arc, tokens=self._tokens_left(arc.src, consumed))
         # Calculate outputs.
-        output_tokensets = pset(pset(tokenset) for tokenset in self.transition.fn(pset(inputs)))
+        output_tokensets = pset(
+            tokenset if isinstance(tokenset, PSet) else pset(tokenset) for tokenset in self.transition.fn(pset(inputs))
+        )
         # Ensure each output's colorset is unique amongst all outputs.
         # This is to avoid ambiguity when placing tokens into destinations.
         output_tokensets_by_colorset: Mapping[ColorSet, TokenSet] = {
@@ -124,12 +179,22 @@ class Occurrence:
             raise PetriNetTransitionFunctionOutputHasOverlappingColorsets()
         # Produce outputs.
         for arc in self.output_arcs():
+            if arc.transfer_from is not None:
+                yield Transfer(arc=arc, tokens=self._tokens_left(arc.transfer_from, consumed))
+                continue
             outputs_for_place = output_tokensets_by_colorset[arc.weight]
-            effects.extend(Output(arc=arc, token=token) for token in outputs_for_place)
+            if record_io:
+                yield from output_effects(arc, outputs_for_place)
             if callable(arc.transform):
                 outputs_for_place = arc.transform(outputs_for_place)
-            effects.extend(Produce(arc=arc, token=token) for token in outputs_for_place)
-        return plist(effects)
+            yield from produce_effects(arc, outputs_for_place)
+
+    def _tokens_left(self, place: Place, consumed: Mapping[Place, set]) -> PSet:
+        """Returns the tokens of a place that the transition's input arcs leave behind, for reset and transfer arcs."""
+        tokens = self.marking.get(place, pset())
+        if place in consumed:
+            tokens = pset(token for token in tokens if token not in consumed[place])
+        return tokens
 
     def output_arcs(self) -> Sequence[CompletedArcTP]:
         return self.net.node_outputs.get(self.transition, ())
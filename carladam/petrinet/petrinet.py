@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from collections.abc import Generator, Iterable
-from functools import lru_cache
 from itertools import chain
 from typing import AbstractSet, Iterator, Mapping, Type, cast
 
@@ -9,9 +8,10 @@ from attr import Factory, define, field
 from pyrsistent import PList, PMap, PSet, pmap, pset
 
 from carladam.petrinet import errors
+from carladam.petrinet.arc import ArcKind, CompletedArcTP, arc_nodes, transfer_reset_arc
 from carladam.petrinet.color import Abstract, Color
-from carladam.petrinet.effects import apply_effects_to_marking
-from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.compiled import CompiledNet
+from carladam.petrinet.marking import Marking, PMarking, empty_tokens, pmarking
 from carladam.petrinet.occurrence import Occurrence
 from carladam.petrinet.place import Place
 from carladam.petrinet.transition import Transition
@@ -24,6 +24,7 @@ from carladam.petrinet.types import (
     PetriNetNode,
 )
 from carladam.util.autoname import autoname
+from carladam.util.cache import cached_method
 
 
 class PetriNetMeta(type):
@@ -57,6 +58,9 @@ class PetriNet(metaclass=PetriNetMeta):
     structure: object = field(default=Factory(lambda self: self.Structure(), takes_self=True), eq=False, repr=False)
     """Instance of the net structure class for this net."""
 
+    _caches: dict = field(factory=dict, init=False, eq=False, repr=False)
+    """Thread-safe caches of this net's methods, discarded whenever the net is updated."""
+
     class Structure:
         """Net structure class intended to contain the definition of the Petri net."""
 
@@ -95,12 +99,21 @@ class PetriNet(metaclass=PetriNetMeta):
         """Returns a list of all unique colors specified by the arcs in this net."""
         return self._colors()
 
-    @lru_cache
+    @cached_method
     def _colors(self):
         if self.arcs:
             return pset(color for arc in self.arcs for color in arc.weight.keys())
         return pset({Abstract})
 
+    @property
+    def compiled(self) -> CompiledNet:
+        """Returns an immutable, integer-indexed index of this net's structure."""
+        return self._compiled()
+
+    @cached_method
+    def _compiled(self):
+        return CompiledNet.from_net(self)
+
     def copy(self) -> PetriNet:
         """Returns a new net based on this one."""
         # noinspection PyArgumentList
@@ -113,7 +126,7 @@ class PetriNet(metaclass=PetriNetMeta):
             structure=self.structure,
         )
 
-    @lru_cache
+    @cached_method
     def subnet(self, node: PetriNetNode) -> PetriNet:
         """Return a new net containing only the given node, its input nodes, output nodes, and related arcs."""
         net = PetriNet.new(node)
@@ -124,13 +137,31 @@ class PetriNet(metaclass=PetriNetMeta):
         return net
 
     def update(self, *others: PetriNetMemberOrSet) -> PetriNet:
-        """Returns a new net based on incorporating the given object(s) into the current net."""
+        """
+        Returns a new net based on incorporating the given object(s) into the current net.
+
+        A transfer arc added without a reset arc emptying the place it transfers from is given one,
+        so that the tokens are moved rather than copied; `transfer_arc` returns both arcs.
+        """
+        transfers: list[CompletedArcTP] = []
+        new = self._incorporate(others, transfers)
+        for transfer in transfers:
+            if not any(
+                arc.kind is ArcKind.RESET and arc.src == transfer.transfer_from
+                for arc in new.node_inputs.get(transfer.src, ())
+            ):
+                new = new._incorporate([transfer_reset_arc(transfer)], transfers)
+        new._reset_caches()
+        return new
+
+    def _incorporate(self, others: Iterable[PetriNetMemberOrSet], transfers: list[CompletedArcTP]) -> PetriNet:
+        """Returns a copy of the net with the given object(s) added, appending transfer arcs added to `transfers`."""
         new = self.copy()
         for other in others:
             if isinstance(other, (list, set, tuple, PList, PSet, Generator)):
-                new = new.update(*other)
+                new = new._incorporate(other, transfers)
             elif isinstance(other, type):
-                new = new.update(*other.__dict__.values())
+                new = new._incorporate(other.__dict__.values(), transfers)
             elif isinstance(other, Place) and other not in new.places:
                 new.places = new.places.add(other)
             elif isinstance(other, Transition) and other not in new.transitions:
@@ -138,8 +169,10 @@ class PetriNet(metaclass=PetriNetMeta):
             elif isinstance(other, ArcTypes) and not other.completed:
                 raise errors.PetriNetArcIncomplete(other.dest)
             elif isinstance(other, CompletedArcTypes) and other not in new.arcs:
-                new = new.update(other.src, other.dest)
+                new = new._incorporate(arc_nodes(other), transfers)
                 new.arcs = new.arcs.add(other)
+                if isinstance(other, CompletedArcTP) and other.transfer_from is not None:
+                    transfers.append(other)
                 if other.dest is not None:
                     new_inputs = new.node_inputs.get(other.dest, pset())
                     new_inputs = new_inputs.add(other)
@@ -149,8 +182,7 @@ class PetriNet(metaclass=PetriNetMeta):
                     new_outputs = new_outputs.add(other)
                     new.node_outputs = new.node_outputs.set(other.src, new_outputs)
             elif isinstance(other, PetriNet):
-                new = new.update(other.places, other.transitions, other.arcs)
-        new._reset_caches()
+                new = new._incorporate((other.places, other.transitions, other.arcs), transfers)
         return new
 
     def update_from_structure(self, structure: object) -> PetriNet:
@@ -161,7 +193,7 @@ class PetriNet(metaclass=PetriNetMeta):
 
     def empty_marking(self) -> PMarking:
         """Returns an empty marking of all places in the net."""
-        return pmap((place, pset()) for place in self.places)
+        return pmap((place, empty_tokens(place)) for place in self.places)
 
     def enabled_transitions(self, marking: Marking) -> Iterator[Transition]:
         """Generates the transitions enabled in this net given a `Marking`."""
@@ -173,16 +205,15 @@ class PetriNet(metaclass=PetriNetMeta):
         """Returns the `Marking` that results from a `Transition` occuring in this net given an initial `Marking`."""
         return self._marking_after_transition(pmarking(marking), transition)
 
-    @lru_cache
+    @cached_method
     def _marking_after_transition(self, marking: PMarking, transition: Transition) -> PMarking:
-        effects = Occurrence(self, marking, transition).effects()
-        return apply_effects_to_marking(marking, effects)
+        return Occurrence(self, marking, transition).marking_after()
 
     def transition_is_enabled(self, marking: Marking, transition: Transition) -> bool:
         """Returns True if the given `Transition` is enabled in this net given a `Marking`."""
         return self._transition_is_enabled(pmarking(marking), transition)
 
-    @lru_cache
+    @cached_method
     def _transition_is_enabled(self, marking: PMarking, transition: Transition) -> bool:
         return Occurrence(self, marking, transition).is_enabled()
 
@@ -191,7 +222,4 @@ class PetriNet(metaclass=PetriNetMeta):
         return not self.node_outputs.get(transition) or not self.node_inputs.get(transition)
 
     def _reset_caches(self):
-        self._colors.cache_clear()
-        self._marking_after_transition.cache_clear()
-        self._transition_is_enabled.cache_clear()
-        self.subnet.cache_clear()
+        self._caches.clear()
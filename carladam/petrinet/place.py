@@ -27,6 +27,12 @@ class Place:
     icon: str | None = defaults.PLACE
     "Icon/emoji to use when decorating this transition visually."
 
+    indexes: tuple[str, ...] = field(default=(), converter=tuple, repr=False)
+    """
+    Names of token `data` fields to maintain hash indexes on, for tokens held by this place.
+    Arc guards on arcs from this place can use them through `tokens_with`.
+    """
+
     # noinspection PyUnresolvedReferences
     @name.default
     def _default_name_is_id(self):
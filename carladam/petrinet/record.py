@@ -0,0 +1,113 @@
+"""
+Compact, typed records for the `data` of tokens whose `Color` declares a `schema`.
+
+Each schema generates a `Record` subclass with one slot per field.
+Records are immutable mappings, so they can be used anywhere token `data` is read,
+and their fields can also be read as attributes:
+
+    >>> from carladam import Color
+    >>> Order = Color("Order", schema={"order_id": int, "amount": (int, float)})
+    >>> token = Order(order_id=1, amount=9.5)
+    >>> token.data.amount, token.data["order_id"]
+    (9.5, 1)
+    >>> token.data
+    Order.record(order_id=1, amount=9.5)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, ClassVar, Iterator, TYPE_CHECKING
+
+from pyrsistent import pmap
+
+if TYPE_CHECKING:  # pragma: nocover
+    from carladam.petrinet.color import Color
+
+Schema = Mapping[str, type | tuple[type, ...]]
+"Mapping of field names to the type (or tuple of types) that values of each field must be an instance of."
+
+
+class Record(Mapping):
+    """
+    Base class of the record types generated for each `Color` having a `schema`.
+
+    Values are validated once, when the record is created; a `TypeError` is raised for missing, unexpected,
+    or mistyped fields.
+    """
+
+    __slots__ = ()
+
+    color: ClassVar[Color]
+    "Color whose schema generated this record type."
+
+    fields: ClassVar[tuple[str, ...]]
+    "Names of fields, in schema order."
+
+    types: ClassVar[tuple[type | tuple[type, ...], ...]]
+    "Types of fields, in schema order."
+
+    def __init__(self, data: Mapping[str, Any] = (), **kwargs):
+        values = dict(data, **kwargs)
+        if unexpected := values.keys() - set(self.fields):
+            raise TypeError(f"Unexpected fields for {self.color!r}: {', '.join(sorted(unexpected))}")
+        for name, type_ in zip(self.fields, self.types):
+            try:
+                value = values[name]
+            except KeyError:
+                raise TypeError(f"Missing field for {self.color!r}: {name}") from None
+            if not isinstance(value, type_):
+                raise TypeError(f"Field {name!r} of {self.color!r} must be {type_!r}, got {value!r}")
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.fields:
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __hash__(self):
+        # Records equal the equivalent `PMap`, so they must hash like one.
+        return hash(pmap(self.items()))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{self.color!r}.record({values})"
+
+    def __reduce__(self):
+        return self.color.token_data, (dict(self),)
+
+    def set(self, name: str, value: Any) -> Record:
+        """Returns a copy of this record with one field changed, like `PMap.set`."""
+        return type(self)(self, **{name: value})
+
+    def update(self, *mappings: Mapping[str, Any]) -> Record:
+        """Returns a copy of this record with fields changed by the given mappings, like `PMap.update`."""
+        values = dict(self)
+        for mapping in mappings:
+            values.update(mapping)
+        return type(self)(values)
+
+
+def record_type(color: Color, schema: Schema) -> type[Record]:
+    """
+    Generate a slotted `Record` subclass for the `data` of tokens of the given `color` and `schema`.
+
+    Field names must not shadow attributes of `Record`, such as `color`, `get`, or `items`.
+    """
+    fields = tuple(schema)
+    if reserved := set(fields) & set(dir(Record)):
+        raise ValueError(f"Schema fields of {color!r} shadow record attributes: {', '.join(sorted(reserved))}")
+    return type(
+        f"{color.label}Record",
+        (Record,),
+        {"__slots__": fields, "color": color, "fields": fields, "types": tuple(schema.values())},
+    )
@@ -0,0 +1,217 @@
+"""
+Count-vector markings and compiled net indexes that live in `multiprocessing.shared_memory`.
+
+A parent process publishes a `SharedNetIndex` once; worker processes attach to it read-only using its
+small, picklable `SharedNetHandle`, avoiding a pickled copy of the net per worker.
+A `SharedCountMarking` is a count vector that every attached process reads and writes in place.
+
+Both classes pickle as a reference to their shared memory block, so they may be passed directly to
+`multiprocessing` workers. Access to a `SharedCountMarking` is not synchronized;
+coordinate writers with a `multiprocessing.Lock` or by giving each worker its own marking.
+"""
+
+from __future__ import annotations
+
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+
+from attr import define, field
+
+from carladam.petrinet.compiled import COUNT_TYPECODE, CompiledNet, CountVectorSemantics, Counts
+
+COUNT_SIZE = array(COUNT_TYPECODE).itemsize
+"Size in bytes of each count stored in shared memory."
+
+
+def _count_view(buffer: memoryview, offset: int, length: int, readonly: bool = False) -> memoryview:
+    """Return a view of `length` counts, starting `offset` counts into `buffer`."""
+    view = buffer[offset * COUNT_SIZE : (offset + length) * COUNT_SIZE]
+    if readonly:
+        view = view.toreadonly()
+    return view.cast(COUNT_TYPECODE)
+
+
+def _shared_memory(length: int) -> SharedMemory:
+    """Create a new shared memory block large enough to hold `length` counts."""
+    # Zero-sized blocks cannot be created, so always allocate at least one count.
+    return SharedMemory(create=True, size=max(length, 1) * COUNT_SIZE)
+
+
+@define(frozen=True)
+class SharedNetHandle:
+    """Picklable reference to a `SharedNetIndex`, used to attach to it from another process."""
+
+    name: str
+    "Name of the shared memory block."
+
+    place_ids: tuple[str, ...]
+    "IDs of places, in index order."
+
+    transition_ids: tuple[str, ...]
+    "IDs of transitions, in index order."
+
+    color_labels: tuple[str, ...]
+    "Labels of colors, in index order."
+
+    @property
+    def n_transitions(self) -> int:
+        return len(self.transition_ids)
+
+    @property
+    def n_places(self) -> int:
+        return len(self.place_ids)
+
+    @property
+    def n_colors(self) -> int:
+        return len(self.color_labels)
+
+    @property
+    def layout(self) -> tuple[int, int, int, int, int]:
+        """Lengths of the `pre`, `post`, `test`, `inhibit`, and `weight_only` segments of the shared memory block."""
+        t, p, c = self.n_transitions, self.n_places, self.n_colors
+        return t * p * c, t * p * c, t * p * c, t * p, t
+
+
+@define(eq=False)
+class SharedNetIndex(CountVectorSemantics):
+    """The arc weights of a `CompiledNet`, stored in shared memory."""
+
+    handle: SharedNetHandle
+    "Reference used by other processes to attach to this index."
+
+    shm: SharedMemory = field(repr=False)
+    "Shared memory block holding `pre`, `post`, `test`, `inhibit`, and `weight_only`, in that order."
+
+    pre: memoryview = field(repr=False)
+    post: memoryview = field(repr=False)
+    test: memoryview = field(repr=False)
+    inhibit: memoryview = field(repr=False)
+
+    weight_only: memoryview = field(repr=False)
+    "1 for each transition fully described by `pre`, `post`, `test`, and `inhibit`, otherwise 0."
+
+    @classmethod
+    def publish(cls, compiled: CompiledNet) -> SharedNetIndex:
+        """Copy a `CompiledNet` into a new shared memory block and return an index attached to it."""
+        segments = (
+            compiled.pre,
+            compiled.post,
+            compiled.test,
+            compiled.inhibit,
+            array(COUNT_TYPECODE, compiled.weight_only),
+        )
+        shm = _shared_memory(sum(len(segment) for segment in segments))
+        offset = 0
+        for segment in segments:
+            shm.buf[offset * COUNT_SIZE : (offset + len(segment)) * COUNT_SIZE] = segment.tobytes()
+            offset += len(segment)
+        handle = SharedNetHandle(
+            name=shm.name,
+            place_ids=tuple(place.id for place in compiled.places),
+            transition_ids=tuple(transition.id for transition in compiled.transitions),
+            color_labels=tuple(color.label for color in compiled.colors),
+        )
+        return cls._from_shared_memory(handle, shm, readonly=False)
+
+    @classmethod
+    def attach(cls, handle: SharedNetHandle) -> SharedNetIndex:
+        """Attach read-only to an index previously published by this or another process."""
+        return cls._from_shared_memory(handle, SharedMemory(name=handle.name), readonly=True)
+
+    @classmethod
+    def _from_shared_memory(cls, handle: SharedNetHandle, shm: SharedMemory, readonly: bool) -> SharedNetIndex:
+        views = []
+        offset = 0
+        for length in handle.layout:
+            views.append(_count_view(shm.buf, offset, length, readonly=readonly))
+            offset += length
+        return cls(handle, shm, *views)
+
+    def __reduce__(self):
+        return self.attach, (self.handle,)
+
+    def __enter__(self) -> SharedNetIndex:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def n_transitions(self) -> int:
+        return self.handle.n_transitions
+
+    @property
+    def n_places(self) -> int:
+        return self.handle.n_places
+
+    @property
+    def n_colors(self) -> int:
+        return self.handle.n_colors
+
+    def close(self):
+        """Detach this process from the shared memory block."""
+        for view in (self.pre, self.post, self.test, self.inhibit, self.weight_only):
+            view.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Request that the shared memory block be destroyed once all processes have closed it."""
+        self.shm.unlink()
+
+
+@define(eq=False)
+class SharedCountMarking:
+    """A count vector stored in shared memory."""
+
+    shm: SharedMemory = field(repr=False)
+    "Shared memory block holding the counts."
+
+    counts: memoryview
+    "Writable view of the counts, indexed by `CompiledNet.slot`."
+
+    @classmethod
+    def create(cls, counts: Counts) -> SharedCountMarking:
+        """Copy a count vector into a new shared memory block and return a marking attached to it."""
+        marking = cls._from_shared_memory(_shared_memory(len(counts)), len(counts))
+        marking.counts[:] = array(COUNT_TYPECODE, counts)
+        return marking
+
+    @classmethod
+    def attach(cls, name: str, width: int) -> SharedCountMarking:
+        """Attach to a marking previously created by this or another process."""
+        return cls._from_shared_memory(SharedMemory(name=name), width)
+
+    @classmethod
+    def _from_shared_memory(cls, shm: SharedMemory, width: int) -> SharedCountMarking:
+        return cls(shm, _count_view(shm.buf, 0, width))
+
+    def __reduce__(self):
+        return self.attach, (self.name, len(self.counts))
+
+    def __enter__(self) -> SharedCountMarking:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self.shm.name
+
+    def snapshot(self) -> array:
+        """Returns a private copy of the current counts."""
+        return array(COUNT_TYPECODE, self.counts)
+
+    def update(self, counts: Counts):
+        """Overwrite the shared counts with the given count vector."""
+        self.counts[:] = array(COUNT_TYPECODE, counts)
+
+    def close(self):
+        """Detach this process from the shared memory block."""
+        self.counts.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Request that the shared memory block be destroyed once all processes have closed it."""
+        self.shm.unlink()
@@ -31,6 +31,12 @@ class Token:
         """By default, `name` is set to the `id` if not passed in."""
         return self.id
 
+    def __attrs_post_init__(self):
+        """Tokens of a `Color` having a `schema` store their `data` as that color's `Record`."""
+        record_type = self.color.record_type
+        if record_type is not None and not isinstance(self.data, record_type):
+            self.data = record_type(self.data)
+
     def replace(self, **kwargs) -> Token:
         """Return a copy of this `Token` but with `data` replaced with `kwargs`."""
         return Token(id=self.id, name=self.name, color=self.color, data=kwargs)
@@ -0,0 +1,237 @@
+"""
+Traces of simulation runs, recorded at a chosen level of detail.
+
+Each `TraceLevel` has a matching trace type that stores only what that level needs,
+so long runs can trade detail for memory:
+
+- `TraceLevel.NONE` keeps only the number of steps (`StepCount`).
+- `TraceLevel.TRANSITIONS` keeps the sequence of transitions, as one small integer per step (`TransitionTrace`).
+- `TraceLevel.DELTAS` also keeps the tokens removed from and added to each place per step (`DeltaTrace`).
+- `TraceLevel.FULL` also keeps every effect, including `Input` and `Output` (`EffectTrace`).
+
+`simulate` fires a sequence of transitions and records a trace at the level given:
+
+    >>> from carladam import PetriNet, Place, Token, Transition
+    >>> net = PetriNet.new(a := Place("A"), t := Transition("T"), b := Place("B"), a >> t, t >> b)
+    >>> result = simulate(net, {a: {Token()}}, [t], TraceLevel.TRANSITIONS)
+    >>> len(result.marking[b]), list(result.trace.ids())
+    (1, ['T'])
+"""
+
+from __future__ import annotations
+
+from array import array
+from enum import IntEnum
+from typing import Iterable, Iterator, NamedTuple, Sequence, TYPE_CHECKING
+
+from attr import define, field
+from pyrsistent import plist
+from pyrsistent.typing import PList
+
+from carladam.petrinet.effects import (
+    Consume,
+    ConsumeMany,
+    Effect,
+    Produce,
+    ProduceMany,
+    Reset,
+    Transfer,
+    apply_effects_to_marking,
+)
+from carladam.petrinet.marking import Marking, PMarking, pmarking
+from carladam.petrinet.occurrence import Occurrence
+from carladam.petrinet.place import Place
+from carladam.petrinet.token import Token
+from carladam.petrinet.transition import Transition
+
+if TYPE_CHECKING:  # pragma: nocover
+    from carladam.petrinet.petrinet import PetriNet
+
+STEP_TYPECODE = "L"
+"Typecode of the `array` holding each step's transition, as an index into the trace's table of transitions."
+
+
+class TraceLevel(IntEnum):
+    """How much detail of each step a trace records. Each level includes the detail of the levels below it."""
+
+    NONE = 0
+    "Record only the number of steps; the resulting marking is all that is kept."
+
+    TRANSITIONS = 1
+    "Record the transition of each step."
+
+    DELTAS = 2
+    "Record the tokens removed from and added to each place at each step."
+
+    FULL = 3
+    "Record every effect of each step, including `Input` and `Output`."
+
+
+class PlaceDelta(NamedTuple):
+    """Tokens removed from and added to one place by one step."""
+
+    place: Place
+    removed: tuple[Token, ...]
+    added: tuple[Token, ...]
+
+
+def place_deltas(effects: Iterable[Effect]) -> tuple[PlaceDelta, ...]:
+    """Returns the per-place changes made by a step's effects, in order of the places first changed."""
+    removed: dict[Place, list[Token]] = {}
+    added: dict[Place, list[Token]] = {}
+    for effect in effects:
+        if isinstance(effect, Consume):
+            removed.setdefault(effect.arc.src, []).append(effect.token)
+        elif isinstance(effect, (ConsumeMany, Reset)):
+            removed.setdefault(effect.arc.src, []).extend(effect.tokens)
+        elif isinstance(effect, Produce):
+            added.setdefault(effect.arc.dest, []).append(effect.token)
+        elif isinstance(effect, (ProduceMany, Transfer)):
+            added.setdefault(effect.arc.dest, []).extend(effect.tokens)
+    places = dict.fromkeys([*removed, *added])
+    return tuple(PlaceDelta(place, tuple(removed.get(place, ())), tuple(added.get(place, ()))) for place in places)
+
+
+@define
+class StepCount:
+    """Trace recorded at `TraceLevel.NONE`: the number of steps, and nothing else."""
+
+    level = TraceLevel.NONE
+
+    steps: int = 0
+
+    def __len__(self) -> int:
+        return self.steps
+
+    def record(self, transition: Transition, effects: Sequence[Effect]):
+        self.steps += 1
+
+
+@define
+class TransitionTrace:
+    """
+    Trace recorded at `TraceLevel.TRANSITIONS`: the transition of each step.
+
+    Each distinct transition is stored once; each step is stored as its index in a compact `array`.
+    """
+
+    level = TraceLevel.TRANSITIONS
+
+    transitions: list[Transition] = field(factory=list)
+    "Distinct transitions, in order of their first occurrence."
+
+    steps: array = field(factory=lambda: array(STEP_TYPECODE))
+    "Index into `transitions` of each step's transition."
+
+    _indexes: dict[Transition, int] = field(factory=dict, init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self._indexes.update((transition, index) for index, transition in enumerate(self.transitions))
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self) -> Iterator[Transition]:
+        """Iterate over the transition of each step."""
+        transitions = self.transitions
+        return (transitions[index] for index in self.steps)
+
+    def __getitem__(self, step: int) -> Transition:
+        return self.transitions[self.steps[step]]
+
+    def ids(self) -> Iterator[str]:
+        """Iterate over the ID of the transition of each step."""
+        return (transition.id for transition in self)
+
+    def record(self, transition: Transition, effects: Sequence[Effect]):
+        index = self._indexes.get(transition)
+        if index is None:
+            index = self._indexes[transition] = len(self.transitions)
+            self.transitions.append(transition)
+        self.steps.append(index)
+
+
+@define
+class DeltaTrace(TransitionTrace):
+    """Trace recorded at `TraceLevel.DELTAS`: the transition of each step, and the changes it made to each place."""
+
+    level = TraceLevel.DELTAS
+
+    deltas: list[tuple[PlaceDelta, ...]] = field(factory=list)
+    "Changes made by each step, one `PlaceDelta` per place changed."
+
+    def record(self, transition: Transition, effects: Sequence[Effect]):
+        super().record(transition, effects)
+        self.deltas.append(place_deltas(effects))
+
+
+@define
+class EffectTrace(TransitionTrace):
+    """Trace recorded at `TraceLevel.FULL`: the transition of each step, and all of its effects."""
+
+    level = TraceLevel.FULL
+
+    effects: list[PList[Effect]] = field(factory=list)
+    "Effects of each step, as returned by `Occurrence.effects`."
+
+    def record(self, transition: Transition, effects: Sequence[Effect]):
+        super().record(transition, effects)
+        self.effects.append(plist(effects))
+
+    @property
+    def deltas(self) -> list[tuple[PlaceDelta, ...]]:
+        """Changes made by each step, derived from its effects."""
+        return [place_deltas(step_effects) for step_effects in self.effects]
+
+
+Trace = StepCount | TransitionTrace | DeltaTrace | EffectTrace
+
+TRACE_TYPES: dict[TraceLevel, type[Trace]] = {
+    TraceLevel.NONE: StepCount,
+    TraceLevel.TRANSITIONS: TransitionTrace,
+    TraceLevel.DELTAS: DeltaTrace,
+    TraceLevel.FULL: EffectTrace,
+}
+"Trace type recording each level."
+
+
+def new_trace(level: TraceLevel) -> Trace:
+    """Returns an empty trace recording at the given level."""
+    return TRACE_TYPES[TraceLevel(level)]()
+
+
+class SimulationResult(NamedTuple):
+    marking: PMarking
+    "Marking after the last step."
+
+    trace: Trace
+    "Trace of the steps taken."
+
+
+def simulate(
+    net: PetriNet,
+    marking: Marking,
+    transitions: Iterable[Transition],
+    level: TraceLevel = TraceLevel.TRANSITIONS,
+) -> SimulationResult:
+    """
+    Fires each of `transitions` in turn, starting from `marking`, and records a trace at the given level.
+
+    Unlike `PetriNet.marking_after_transition`, intermediate markings are not cached,
+    and `Input` and `Output` effects are only built at `TraceLevel.FULL`,
+    so memory use is bounded by the trace alone. Below `TraceLevel.DELTAS`, no list of effects is built at all.
+    Raises `TransitionNotEnabled` (or a subclass) if a transition is not enabled when its turn comes.
+    """
+    trace = new_trace(level)
+    record_io = trace.level is TraceLevel.FULL
+    marking = pmarking(marking)
+    if trace.level < TraceLevel.DELTAS:
+        for transition in transitions:
+            marking = Occurrence(net, marking, transition).marking_after()
+            trace.record(transition, ())
+        return SimulationResult(marking, trace)
+    for transition in transitions:
+        effects = Occurrence(net, marking, transition).bulk_effects(record_io=record_io)
+        marking = apply_effects_to_marking(marking, effects)
+        trace.record(transition, effects)
+    return SimulationResult(marking, trace)
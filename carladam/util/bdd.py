@@ -0,0 +1,225 @@
+"""
+Reduced ordered binary decision diagrams, for representing very large sets of boolean assignments compactly.
+
+A `BDD` manager owns every node. Nodes are integers: `FALSE` and `TRUE` are the terminals, and each other node
+tests one variable, with a `low` child for when it is false and a `high` child for when it is true. Variables are
+tested in increasing order along every path, and a unique table ensures that no two nodes test the same variable
+with the same children, so equal sets are always the same node and can be compared with `==`.
+
+Operations are memoized in caches held by the manager, which can be cleared between computations to free memory.
+
+    >>> bdd = BDD(3)
+    >>> either = bdd.or_(bdd.var(0), bdd.var(2))
+    >>> bdd.count(either)
+    6
+    >>> bdd.and_(either, bdd.not_(bdd.var(0))) == bdd.and_(bdd.var(2), bdd.not_(bdd.var(0)))
+    True
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+FALSE = 0
+TRUE = 1
+
+
+class BDD:
+    """A manager of binary decision diagrams over `n_vars` variables, numbered from 0 in testing order."""
+
+    def __init__(self, n_vars: int):
+        self.n_vars = n_vars
+        # Variable, low child, and high child of each node. Terminals test a variable past the last one.
+        self._var = [n_vars, n_vars]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique: dict[tuple[int, int, int], int] = {}
+        self._apply_cache: dict[tuple[str, int, int], int] = {}
+        self._not_cache: dict[int, int] = {}
+        self._count_cache: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of nodes created, including the terminals."""
+        return len(self._var)
+
+    def node(self, var: int, low: int, high: int) -> int:
+        """Returns the node testing `var` with the given children, creating it only if no equal node exists."""
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = self._unique[key] = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+        return node
+
+    def top(self, node: int) -> int:
+        """Returns the variable a node tests, or `n_vars` for a terminal."""
+        return self._var[node]
+
+    def children(self, node: int) -> tuple[int, int]:
+        """Returns the low and high children of a non-terminal node."""
+        return self._low[node], self._high[node]
+
+    def var(self, var: int) -> int:
+        """Returns the set of assignments in which `var` is true."""
+        return self.node(var, FALSE, TRUE)
+
+    def cube(self, assignment: Mapping[int, bool]) -> int:
+        """Returns the set of assignments agreeing with `assignment` on the variables it gives."""
+        node = TRUE
+        for var in sorted(assignment, reverse=True):
+            node = self.node(var, FALSE, node) if assignment[var] else self.node(var, node, FALSE)
+        return node
+
+    def not_(self, node: int) -> int:
+        # Operations use explicit stacks rather than recursion, as diagrams may test more variables than Python's
+        # recursion limit. A node is visited by pushing a step to build its result, then visits of its children,
+        # whose results are left on the stack of values for the build step to take.
+        work, values = [(node, False)], []
+        while work:
+            top, build = work.pop()
+            if build:
+                high, low = values.pop(), values.pop()
+                result = self._not_cache[top] = self.node(self._var[top], low, high)
+                values.append(result)
+            elif (result := self._negation(top)) is not None:
+                values.append(result)
+            else:
+                work += [(top, True), (self._high[top], False), (self._low[top], False)]
+        return values.pop()
+
+    def _negation(self, node: int) -> int | None:
+        """Returns the negation of a node if it is a terminal or already computed, otherwise None."""
+        if node <= TRUE:
+            return TRUE - node
+        return self._not_cache.get(node)
+
+    def and_(self, first: int, second: int) -> int:
+        return self._apply("and", first, second)
+
+    def or_(self, first: int, second: int) -> int:
+        return self._apply("or", first, second)
+
+    def diff(self, first: int, second: int) -> int:
+        """Returns the assignments in `first` but not in `second`."""
+        return self._apply("diff", first, second)
+
+    def any(self, nodes: Iterable[int]) -> int:
+        """Returns the union of the given sets."""
+        result = FALSE
+        for node in nodes:
+            result = self.or_(result, node)
+        return result
+
+    def _apply(self, op: str, first: int, second: int) -> int:
+        work, values = [(first, second, -1)], []
+        while work:
+            top_first, top_second, var = work.pop()
+            if var >= 0:
+                high, low = values.pop(), values.pop()
+                result = self.node(var, low, high)
+                self._apply_cache[self._apply_key(op, top_first, top_second)] = result
+                values.append(result)
+            elif (result := self._applied(op, top_first, top_second)) is not None:
+                values.append(result)
+            else:
+                var = min(self._var[top_first], self._var[top_second])
+                first_low, first_high = self._cofactors(top_first, var)
+                second_low, second_high = self._cofactors(top_second, var)
+                work += [(top_first, top_second, var), (first_high, second_high, -1), (first_low, second_low, -1)]
+        return values.pop()
+
+    def _applied(self, op: str, first: int, second: int) -> int | None:
+        """Returns the result of an operation if it is a terminal case or already computed, otherwise None."""
+        if first <= TRUE or second <= TRUE or first == second:
+            terminal = self._terminal_case(op, first, second)
+            if terminal is not None:
+                return terminal
+        if op != "diff" and second < first:
+            first, second = second, first
+        return self._apply_cache.get((op, first, second))
+
+    @staticmethod
+    def _apply_key(op: str, first: int, second: int) -> tuple[str, int, int]:
+        if op != "diff" and second < first:
+            first, second = second, first
+        return op, first, second
+
+    @staticmethod
+    def _terminal_case(op: str, first: int, second: int) -> int | None:
+        if op == "and":
+            if first == FALSE or second == FALSE:
+                return FALSE
+            if first == TRUE or first == second:
+                return second
+            if second == TRUE:
+                return first
+        elif op == "or":
+            if first == TRUE or second == TRUE:
+                return TRUE
+            if first == FALSE or first == second:
+                return second
+            if second == FALSE:
+                return first
+        else:
+            if first == FALSE or second == TRUE or first == second:
+                return FALSE
+            if second == FALSE:
+                return first
+        return None
+
+    def _cofactors(self, node: int, var: int) -> tuple[int, int]:
+        """Returns the node restricted to `var` being false, then true."""
+        if self._var[node] != var:
+            return node, node
+        return self._low[node], self._high[node]
+
+    def count(self, node: int) -> int:
+        """Returns the number of assignments to all `n_vars` variables in the set."""
+        return self._count(node) << self._var[node]
+
+    def _count(self, node: int) -> int:
+        # Number of assignments to the variables from the one this node tests onwards.
+        work, values = [(node, False)], []
+        while work:
+            top, build = work.pop()
+            if build:
+                var, low, high = self._var[top], self._low[top], self._high[top]
+                high_count, low_count = values.pop(), values.pop()
+                result = self._count_cache[top] = (low_count << (self._var[low] - var - 1)) + (
+                    high_count << (self._var[high] - var - 1)
+                )
+                values.append(result)
+            elif (result := self._counted(top)) is not None:
+                values.append(result)
+            else:
+                work += [(top, True), (self._high[top], False), (self._low[top], False)]
+        return values.pop()
+
+    def _counted(self, node: int) -> int | None:
+        if node <= TRUE:
+            return node
+        return self._count_cache.get(node)
+
+    def pick(self, node: int) -> dict[int, bool] | None:
+        """Returns one assignment in the set, giving only the variables on its path, or None if the set is empty."""
+        if node == FALSE:
+            return None
+        assignment = {}
+        while node != TRUE:
+            if self._low[node] != FALSE:
+                assignment[self._var[node]] = False
+                node = self._low[node]
+            else:
+                assignment[self._var[node]] = True
+                node = self._high[node]
+        return assignment
+
+    def clear_caches(self):
+        """Frees the memory used by the operation caches; the nodes themselves are kept."""
+        self._apply_cache.clear()
+        self._not_cache.clear()
+        self._count_cache.clear()
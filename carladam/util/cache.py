@@ -0,0 +1,156 @@
+"""
+Thread-safe memoization, for caches shared by concurrent requests to the simulator.
+
+Unlike `functools.lru_cache`, an `LRUCache` computes each missing value at most once at a time:
+threads asking for a value that another thread is already computing wait for that computation
+rather than repeating it.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import update_wrapper
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class LRUCache:
+    """
+    A least-recently-used cache that is safe to share between threads.
+
+    Values are computed outside of the cache's lock, so slow computations of different keys proceed in parallel.
+    A computation that raises an exception is not cached; the exception is raised in every waiting thread.
+    """
+
+    def __init__(self, maxsize: int | None = 128):
+        self.maxsize = maxsize
+        self._lock = Lock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._pending: dict[Hashable, Future] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the value cached for `key`, calling `compute` to produce it if no other thread already is."""
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            computing = self._pending.get(key)
+            if computing is None:
+                self._misses += 1
+                pending = self._pending[key] = Future()
+                generation = self._generation
+            else:
+                self._hits += 1
+        if computing is not None:
+            # Another thread is computing this value; wait for its result.
+            return computing.result()
+        return self._compute(key, compute, pending, generation)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value cached for `key`, or `default` if there is none."""
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """Caches a value for `key`, evicting the least recently used value if the cache is full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _compute(self, key: Hashable, compute: Callable[[], Any], pending: Future, generation: int) -> Any:
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+            # Values computed before the cache was cleared may be stale, so they are returned but not kept.
+            if generation == self._generation:
+                self._entries[key] = value
+                if self.maxsize is not None and len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        pending.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._hits = self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+
+def cache_key(args: tuple, kwargs: dict) -> Hashable:
+    """Returns a key for a call with the given arguments. Keyword argument order is significant, as in `lru_cache`."""
+    if kwargs:
+        return args, tuple(kwargs.items())
+    return args
+
+
+def cached(fn: Callable | None = None, *, maxsize: int | None = 128):
+    """
+    Decorate a function to memoize its results in a thread-safe `LRUCache`.
+
+    Usable bare (`@cached`) or with arguments (`@cached(maxsize=None)`).
+    Like `lru_cache`, the wrapper provides `cache_clear()` and `cache_info()`.
+    """
+    if fn is None:
+        return lambda fn: cached(fn, maxsize=maxsize)
+
+    cache = LRUCache(maxsize)
+
+    def wrapper(*args, **kwargs):
+        return cache.get_or_compute(cache_key(args, kwargs), lambda: fn(*args, **kwargs))
+
+    wrapper.cache = cache
+    wrapper.cache_clear = cache.clear
+    wrapper.cache_info = cache.info
+    return update_wrapper(wrapper, fn)
+
+
+def cached_method(fn: Callable | None = None, *, maxsize: int | None = 128):
+    """
+    Decorate a method to memoize its results per instance, in thread-safe `LRUCache`s.
+
+    The instance must have a `_caches` attribute holding a dict, which is where each method's cache is kept.
+    Clearing that dict discards all cached results of the instance's methods.
+    """
+    if fn is None:
+        return lambda fn: cached_method(fn, maxsize=maxsize)
+
+    name = fn.__name__
+
+    def wrapper(self, *args, **kwargs):
+        caches = self._caches
+        cache = caches.get(name)
+        if cache is None:
+            # dict.setdefault is atomic, so threads racing to create the cache all use the same one.
+            cache = caches.setdefault(name, LRUCache(maxsize))
+        return cache.get_or_compute(cache_key(args, kwargs), lambda: fn(self, *args, **kwargs))
+
+    return update_wrapper(wrapper, fn)
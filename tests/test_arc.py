@@ -4,16 +4,25 @@ from pyrsistent import pset
 from carladam.petrinet import errors
 from carladam.petrinet.arc import (
     Annotate,
+    ArcKind,
+    ArcTP,
     CompletedArcPT,
     CompletedArcTP,
+    TransformBatch,
     TransformEach,
     arc,
     arc_path,
     inhibitor_arc,
+    read_arc,
+    reset_arc,
+    transfer_arc,
     weights_are_satisfied,
 )
 from carladam.petrinet.color import Abstract, Color
-from carladam.petrinet.marking import marking_colorset
+from carladam.petrinet.compose import compose
+from carladam.petrinet.effects import Consume, Input, Produce, Reset, Transfer
+from carladam.petrinet.marking import marking_colorset, pmarking
+from carladam.petrinet.occurrence import Occurrence
 from carladam.petrinet.petrinet import PetriNet
 from carladam.petrinet.place import Place
 from carladam.petrinet.token import Token
@@ -166,6 +175,36 @@ def test_transform_each():
     assert token.data["x"] == -1
 
 
+def test_transform_batch_receives_all_tokens_at_once():
+    # Given: a place -> transition arc, and a transition -> place arc, each transforming tokens in a batch
+    calls = []
+
+    def x_plus_1(tokens):
+        calls.append(len(tokens))
+        return [token.replace(x=token.data.get("x", 0) + 1) for token in tokens]
+
+    def x_times_10(columns):
+        return columns.with_data(x=[x * 10 for x in columns["x"]])
+
+    net = PetriNet.new(
+        p := Place(),
+        t := Transition(fn=passthrough()),
+        p >> {Abstract: 3} >> t >> TransformBatch(x_plus_1),
+        t >> {Abstract: 3} >> p >> TransformBatch(x_times_10, columnar=True),
+    )
+
+    # When: the transition occurs
+    m0 = {p: {Token(), Token(), Token()}}
+    m1 = net.marking_after_transition(m0, t)
+
+    # Then: each transform was called once for all tokens
+    assert calls == [3]
+    assert sorted(token.data["x"] for token in m1[p]) == [10, 10, 10]
+
+    # And: produced tokens keep their identities
+    assert {token.id for token in m1[p]} == {token.id for token in m0[p]}
+
+
 def test_sorts_by_src_name_then_dest_name():
     p = Place("P")
     t = Transition("T")
@@ -267,6 +306,32 @@ def test_arc_factory_place_transition():
     assert a.guard is weights_are_satisfied
 
 
+def test_weights_are_satisfied_ignores_other_colors():
+    c, d = Color("c"), Color("d")
+    a = arc(Place(), Transition(), {c: 2})
+    assert weights_are_satisfied(a, {c(), c(), d()})
+    assert not weights_are_satisfied(a, {c(), d(), d()})
+
+
+def test_tokens_of_other_colors_do_not_disable_transitions():
+    c, d = Color("c"), Color("d")
+    net = PetriNet.new(
+        p0 := Place(),
+        t0 := Transition(fn=c.produce()),
+        p1 := Place(),
+        arc(p0, t0, c),
+        arc(t0, p1, c),
+    )
+    other = d()
+    marking = {p0: {c(), other}}
+
+    # Places holding tokens of colors the weight does not name used to make the default guard raise KeyError.
+    assert net.transition_is_enabled(marking, t0)
+    after = net.marking_after_transition(marking, t0)
+    assert after[p0] == {other}
+    assert [token.color for token in after[p1]] == [c]
+
+
 def test_arc_factory_place_transition_colorset():
     p = Place()
     t = Transition()
@@ -343,3 +408,191 @@ def test_inhibitor_arc():
     )
     assert marking_colorset(net.marking_after_transition({}, t)) == {p1: {Abstract: 1}}
     assert not net.transition_is_enabled({p0: {Abstract()}}, t)
+
+
+def test_read_arc():
+    resource = Color("R")
+    seen = []
+
+    def guard(inputs):
+        seen.append(inputs)
+        return True
+
+    net = PetriNet.new(
+        p_resource := Place(),
+        p_input := Place(),
+        p_output := Place(),
+        t := Transition(guard=guard),
+        read_arc(p_resource, t, resource),
+        arc(p_input, t),
+        arc(t, p_output),
+    )
+    r = resource()
+    m0 = pmarking({p_resource: {r}, p_input: {Abstract(), Abstract()}})
+    assert not net.transition_is_enabled({p_input: {Abstract()}}, t)
+    assert net.transition_is_enabled(m0, t)
+    assert r in seen[-1]
+
+    # The resource token is passed as an input, but is not consumed.
+    effects = Occurrence(net, m0, t).effects()
+    assert Input(arc=read_arc(p_resource, t, resource), token=r) in effects
+    assert [effect.arc.src for effect in effects if isinstance(effect, Consume)] == [p_input]
+
+    m1 = net.marking_after_transition(m0, t)
+    assert m1[p_resource] == {r}
+    m2 = net.marking_after_transition(m1, t)
+    assert m2[p_resource] == {r}
+    assert marking_colorset(m2) == {p_resource: {resource: 1}, p_output: {Abstract: 2}}
+    assert not net.transition_is_enabled(m2, t)
+
+
+def test_read_arc_kind_is_kept_when_completing_or_decorating():
+    p = Place()
+    t = Transition()
+    assert (p >> Abstract >> t)(kind=ArcKind.READ).kind is ArcKind.READ
+    assert ((p >> Abstract)(kind=ArcKind.READ) >> t).kind is ArcKind.READ
+    assert ((t << Abstract)(kind=ArcKind.READ) << p).kind is ArcKind.READ
+    a = read_arc(p, t) >> Annotate("A") >> TransformEach(lambda token: token)
+    assert a.kind is ArcKind.READ
+    assert a.annotation == "A"
+    assert inhibitor_arc(p, t) >> Annotate("A") == arc(p, t, annotation="A", guard=inhibitor_arc(p, t).guard)
+
+
+def test_reset_arc():
+    net = PetriNet.new(
+        p0 := Place(),
+        p1 := Place(),
+        t := Transition(fn=passthrough()),
+        reset_arc(p0, t),
+        arc(p1, t),
+        arc(t, p1),
+    )
+    # Reset arcs do not require tokens to be present.
+    m0 = pmarking({p1: {Abstract()}})
+    assert net.transition_is_enabled(m0, t)
+    assert net.marking_after_transition(m0, t) == m0
+
+    tokens = pmarking({p0: Abstract() * 100})[p0]
+    m1 = m0.set(p0, tokens)
+    effects = Occurrence(net, m1, t).effects()
+    assert Reset(arc=reset_arc(p0, t), tokens=tokens) in effects
+    assert not [effect for effect in effects if isinstance(effect, Consume) and effect.arc.src == p0]
+    # Reset tokens are not passed to the transition.
+    assert Occurrence(net, m1, t).transition_inputs() == m0[p1]
+    assert net.marking_after_transition(m1, t) == m0
+
+
+def test_reset_arc_alongside_consume_from_the_same_place():
+    net = PetriNet.new(
+        p0 := Place(),
+        p1 := Place(),
+        t := Transition(fn=passthrough()),
+        reset_arc(p0, t),
+        arc(p0, t),
+        arc(t, p1),
+    )
+    m0 = pmarking({p0: Abstract() * 4})
+
+    class ResetFirst(Occurrence):
+        def input_arcs(self):
+            return sorted(super().input_arcs(), key=lambda arc: arc.kind is not ArcKind.RESET)
+
+    # Whatever order the arcs are in, the reset comes after the consume, and removes only the tokens left behind.
+    for occurrence in Occurrence(net, m0, t), ResetFirst(net, m0, t):
+        effects = occurrence.effects(record_io=False)
+        assert [type(effect) for effect in effects] == [Consume, Reset, Produce]
+        (consumed,) = (effect.token for effect in effects if isinstance(effect, Consume))
+        (reset,) = (effect for effect in effects if isinstance(effect, Reset))
+        assert reset.tokens == m0[p0] - {consumed}
+        assert occurrence.marking_after() == pmarking({p1: {consumed}})
+
+
+def test_transfer_arc_alongside_consume_from_the_same_place():
+    net = PetriNet.new(
+        src := Place(),
+        dest := Place(),
+        out := Place(),
+        t := Transition(fn=passthrough()),
+        transfer_arc(src, t, dest),
+        arc(src, t),
+        arc(t, out),
+    )
+    m0 = pmarking({src: Abstract() * 3})
+    effects = Occurrence(net, m0, t).effects(record_io=False)
+    (consumed,) = (effect.token for effect in effects if isinstance(effect, Consume))
+    (transfer,) = (effect for effect in effects if isinstance(effect, Transfer))
+
+    # The consumed token is an input, and only the tokens left behind are transferred.
+    assert transfer.tokens == m0[src] - {consumed}
+    m1 = net.marking_after_transition(m0, t)
+    assert m1[out] == {consumed}
+    assert m1[dest] == m0[src] - {consumed}
+    assert not m1.get(src)
+
+
+def test_transfer_arcs_are_given_reset_arcs():
+    src, dest, t = Place(), Place(), Transition()
+    transfer = arc(t, dest, transfer_from=src)
+    tokens = Abstract() * 3
+
+    for net in (PetriNet.new(transfer), compose([t, dest, transfer])):
+        # The tokens are moved rather than copied.
+        assert src in net.places
+        assert reset_arc(src, t) in net.node_inputs[t]
+        assert marking_colorset(net.marking_after_transition({src: tokens}, t)) == {dest: {Abstract: 3}}
+    # A reset arc given along with the transfer arc, in either order, is not doubled.
+    assert len(PetriNet.new(*transfer_arc(src, t, dest)).arcs) == 2
+    assert len(PetriNet.new(*reversed(transfer_arc(src, t, dest))).arcs) == 2
+    assert len(compose(transfer_arc(src, t, dest, annotation="Move")).arcs) == 2
+
+
+def test_transfer_arc():
+    part = Color("Part")
+    net = PetriNet.new(
+        pallet := Place(),
+        truck := Place(),
+        ship := Transition(),
+        *transfer_arc(pallet, ship, truck),
+    )
+    assert not net.transition_is_external(ship)
+
+    # The whole set of tokens is moved, sharing the set when the destination is empty.
+    m0 = pmarking({pallet: part() * 500})
+    tokens = m0[pallet]
+    effects = Occurrence(net, m0, ship).effects()
+    assert [type(effect) for effect in effects] == [Reset, Transfer]
+    m1 = net.marking_after_transition(m0, ship)
+    assert pallet not in m1
+    assert m1[truck] is tokens
+
+    # Transferring into a non-empty place merges the two sets.
+    m2 = net.marking_after_transition(m1.set(pallet, pmarking({pallet: part() * 2})[pallet]), ship)
+    assert marking_colorset(m2) == {truck: {part: 502}}
+    m3 = net.marking_after_transition(m1.set(pallet, pmarking({pallet: part() * 600})[pallet]), ship)
+    assert marking_colorset(m3) == {truck: {part: 1100}}
+
+    # Transferring nothing leaves the marking unchanged.
+    assert net.marking_after_transition(m1, ship) == m1
+
+
+def test_transfer_arc_alongside_produce():
+    net = PetriNet.new(
+        src := Place(),
+        dest := Place(),
+        done := Place(),
+        t := Transition(),
+        *transfer_arc(src, t, dest),
+        arc(t, done),
+    )
+    m1 = net.marking_after_transition({src: Abstract() * 2}, t)
+    assert marking_colorset(m1) == {dest: {Abstract: 2}, done: {Abstract: 1}}
+    effects = Occurrence(net, pmarking({}), t).effects()
+    assert [type(effect) for effect in effects if isinstance(effect, Produce)] == [Produce]
+
+
+def test_transfer_from_is_kept_when_completing():
+    p = Place()
+    q = Place()
+    t = Transition()
+    assert (ArcTP(src=t, transfer_from=q) >> p).transfer_from == q
+    assert (ArcTP(dest=p, transfer_from=q) << t).transfer_from == q
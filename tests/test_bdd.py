@@ -0,0 +1,58 @@
+import sys
+
+from carladam.util.bdd import BDD, FALSE, TRUE
+
+
+def test_operations_share_nodes():
+    bdd = BDD(3)
+    a, b, c = bdd.var(0), bdd.var(1), bdd.var(2)
+
+    assert bdd.and_(a, b) == bdd.and_(b, a)
+    assert bdd.or_(bdd.and_(a, b), bdd.and_(a, bdd.not_(b))) == a
+    assert bdd.not_(bdd.not_(c)) == c
+    assert bdd.diff(a, a) == FALSE
+    assert bdd.diff(a, FALSE) == a
+    assert bdd.diff(bdd.or_(a, b), a) == bdd.and_(b, bdd.not_(a))
+    assert bdd.and_(a, TRUE) == bdd.and_(TRUE, a) == a
+    assert bdd.or_(a, FALSE) == bdd.or_(a, a) == a
+    assert bdd.or_(TRUE, a) == TRUE
+    assert bdd.any([]) == FALSE
+    assert bdd.any([a, b, c]) == bdd.not_(bdd.cube({0: False, 1: False, 2: False}))
+    assert bdd.top(a) == 0 and bdd.top(TRUE) == 3
+    assert bdd.children(a) == (FALSE, TRUE)
+
+
+def test_counts_and_picks_assignments():
+    bdd = BDD(4)
+    cube = bdd.cube({1: True, 3: False})
+
+    assert bdd.count(cube) == 4
+    assert bdd.count(TRUE) == 16
+    assert bdd.count(FALSE) == 0
+    assert bdd.count(bdd.or_(cube, bdd.var(0))) == 10
+    assert bdd.pick(cube) == {1: True, 3: False}
+    assert bdd.pick(FALSE) is None
+    assert bdd.pick(TRUE) == {}
+
+
+def test_caches_can_be_cleared_without_losing_nodes():
+    bdd = BDD(2)
+    both = bdd.and_(bdd.var(0), bdd.var(1))
+    bdd.count(both)
+    size = len(bdd)
+
+    bdd.clear_caches()
+
+    assert bdd.and_(bdd.var(0), bdd.var(1)) == both
+    assert len(bdd) == size
+
+
+def test_diagrams_deeper_than_the_recursion_limit():
+    n_vars = sys.getrecursionlimit() * 2
+    bdd = BDD(n_vars)
+    cube = bdd.cube({var: True for var in range(n_vars)})
+
+    assert len(bdd) == n_vars + 2
+    assert bdd.count(bdd.not_(cube)) == 2**n_vars - 1
+    assert bdd.diff(TRUE, cube) == bdd.not_(cube)
+    assert bdd.and_(cube, bdd.or_(cube, bdd.var(0))) == cube
@@ -0,0 +1,187 @@
+import threading
+
+import pytest
+
+from carladam import PetriNet, Place, Token, Transition
+from carladam.util.cache import CacheInfo, LRUCache, cached, cached_method
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("b", lambda: 2) == 2
+    assert cache.get_or_compute("a", lambda: None) == 1
+    assert cache.get_or_compute("c", lambda: 3) == 3
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    assert cache.info() == (1, 4, 2, 2)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 2, 0)
+
+
+def test_unbounded_cache_keeps_everything():
+    cache = LRUCache(maxsize=None)
+    for i in range(1000):
+        cache.get_or_compute(i, lambda i=i: i)
+    assert cache.info().currsize == 1000
+
+
+def test_exceptions_are_not_cached():
+    cache = LRUCache()
+
+    def fail():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("a", fail)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+
+
+def test_concurrent_misses_compute_once():
+    # Given: a slow computation that will be requested by several threads at once
+    cache = LRUCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "value"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+    first.start()
+    started.wait()
+    waiters = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute))) for _ in range(4)]
+    for thread in waiters:
+        thread.start()
+
+    # When: the computation finishes
+    release.set()
+    for thread in [first, *waiters]:
+        thread.join()
+
+    # Then: every thread got the single computed value
+    assert calls == [1]
+    assert results == ["value"] * 5
+
+
+def test_waiting_threads_receive_exceptions():
+    cache = LRUCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        started.set()
+        release.wait()
+        raise ValueError("failed")
+
+    errors = []
+
+    def get():
+        try:
+            cache.get_or_compute("key", compute)
+        except ValueError as e:
+            errors.append(e)
+
+    first = threading.Thread(target=get)
+    first.start()
+    started.wait()
+    waiter = threading.Thread(target=get)
+    waiter.start()
+    release.set()
+    first.join()
+    waiter.join()
+    assert len(errors) == 2
+
+
+def test_values_computed_before_clear_are_not_kept():
+    cache = LRUCache()
+
+    def compute():
+        cache.clear()
+        return 1
+
+    assert cache.get_or_compute("a", compute) == 1
+    assert cache.info().currsize == 0
+
+
+def test_cached_function():
+    calls = []
+
+    @cached(maxsize=None)
+    def add(a, b=0):
+        calls.append((a, b))
+        return a + b
+
+    assert add(1, b=2) == add(1, b=2) == 3
+    assert add(1) == 1
+    assert calls == [(1, 2), (1, 0)]
+    assert add.cache_info().hits == 1
+    add.cache_clear()
+    assert add.cache_info().currsize == 0
+    assert add.__name__ == "add"
+
+    @cached
+    def identity(x):
+        return x
+
+    assert identity(1) == 1
+
+
+def test_cached_method_is_per_instance():
+    class Counter:
+        def __init__(self):
+            self._caches = {}
+            self.calls = 0
+
+        @cached_method(maxsize=1)
+        def value(self, x):
+            self.calls += 1
+            return x
+
+    a, b = Counter(), Counter()
+    assert a.value(1) == a.value(1) == b.value(1) == 1
+    assert (a.calls, b.calls) == (1, 1)
+    a._caches.clear()
+    a.value(1)
+    assert a.calls == 2
+
+
+def test_petrinet_caches_are_per_net_and_thread_safe():
+    # Given: a net and a marking
+    p1, p2 = Place(), Place()
+    t = Transition()
+    net = PetriNet.new(p1 >> t, t >> p2)
+    marking = {p1: {Token()}}
+
+    # When: many threads compute the same occurrence at once
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(net.marking_after_transition(marking, t))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Then: they all share one result
+    assert all(result is results[0] for result in results)
+
+    # And: updating a net does not discard the caches of the original net
+    updated = net.update(Place())
+    assert net.marking_after_transition(marking, t) is results[0]
+    assert hash(updated) != hash(net)
+
+
+def test_values_can_be_looked_up_and_stored_directly():
+    cache = LRUCache(maxsize=2)
+    assert cache.get("a", "missing") == "missing"
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.info() == CacheInfo(hits=1, misses=2, maxsize=2, currsize=2)
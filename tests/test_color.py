@@ -23,3 +23,17 @@ def test_color_eq():
     comparator = color_eq(Abstract)
     assert comparator(abstract_token) is True
     assert comparator(non_abstract_token) is False
+
+
+def test_tokens():
+    tokens = A.tokens(3, {"x": 1})
+    assert len(tokens) == 3
+    assert all(token.color == A and token.data == {"x": 1} for token in tokens)
+
+
+def test_token_generator():
+    generator = B.token_generator({"y": 2})
+    t0, t1 = next(generator), next(generator)
+    assert t0 != t1
+    assert t0.color == t1.color == B
+    assert t0.data == t1.data == {"y": 2}
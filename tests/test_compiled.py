@@ -0,0 +1,160 @@
+import pytest
+
+from carladam import Abstract, Color, PetriNet, Place, Transition, arc
+from carladam.analysis.coverability import omega_counts
+from carladam.analysis.enabling import count_tensor
+from carladam.petrinet.arc import inhibitor_arc, read_arc, reset_arc, transfer_arc
+from carladam.petrinet.compiled import CompiledNet
+from carladam.petrinet.marking import marking_colorset
+from carladam.petrinet.token import Token
+
+
+A = Color("A")
+B = Color("B")
+
+
+def test_compiled_indexes():
+    net = PetriNet.new(
+        p1 := Place("P1"),
+        p0 := Place("P0"),
+        t := Transition("T"),
+        arc(p0, t, {A: 2}),
+        arc(t, p1, {B: 1}),
+    )
+    compiled = net.compiled
+    assert compiled.places == (p0, p1)
+    assert compiled.transitions == (t,)
+    assert compiled.colors == (A, B)
+    assert compiled.width == 4
+    assert compiled.slot(p1, B) == 3
+    assert list(compiled.pre) == [2, 0, 0, 0]
+    assert list(compiled.post) == [0, 0, 0, 1]
+    assert compiled.weight_only == (True,)
+
+    # Compiled nets are shared between threads, so their contents are read-only.
+    with pytest.raises(TypeError):
+        compiled.pre[0] = 0
+    with pytest.raises(TypeError):
+        compiled.place_index[p0] = 1
+
+
+def test_compiled_is_cached_until_net_changes():
+    net = PetriNet.new(p := Place(), t := Transition(), arc(p, t))
+    assert net.compiled is net.compiled
+    assert net.update(Place()).compiled is not net.compiled
+
+
+def test_counts_and_firing_match_occurrence():
+    net = PetriNet.new(
+        p0 := Place("P0"),
+        p1 := Place("P1"),
+        t := Transition("T", fn=B.produce()),
+        arc(p0, t, {A: 2}),
+        arc(t, p1, {B: 1}),
+    )
+    compiled = CompiledNet.from_net(net)
+    marking = {p0: {A(), A(), A()}}
+    counts = compiled.counts(marking)
+    assert list(counts) == [3, 0, 0, 0]
+    assert list(compiled.enabled(counts)) == [0]
+    after = compiled.fire(counts, 0)
+    assert list(after) == [1, 0, 0, 1]
+    assert list(compiled.enabled(after)) == []
+    assert marking_colorset(compiled.marking(after)) == marking_colorset(net.marking_after_transition(marking, t))
+
+
+def test_inhibitor_arcs():
+    net = PetriNet.new(
+        p0 := Place("P0"),
+        p1 := Place("P1"),
+        t := Transition("T"),
+        inhibitor_arc(p0, t),
+        arc(t, p1),
+    )
+    compiled = net.compiled
+    assert list(compiled.pre) == [0, 0]
+    assert list(compiled.inhibit) == [1, 0]
+    assert compiled.weight_only == (True,)
+    assert compiled.is_enabled(compiled.counts({}), 0)
+    assert not compiled.is_enabled(compiled.counts({p0: {Token()}}), 0)
+    assert compiled.is_enabled(compiled.counts({p1: {Token()}}), 0)
+
+
+def test_weight_only():
+    def guard(inputs):
+        return True
+
+    net = PetriNet.new(
+        p := Place("P"),
+        t0 := Transition("T0", guard=guard),
+        t1 := Transition("T1"),
+        t2 := Transition("T2"),
+        t3 := Transition("T3"),
+        arc(p, t0),
+        arc(p, t1, transform=lambda tokens: tokens),
+        arc(p, t2, guard=lambda arc, tokens: True),
+        arc(t3, p, transform=lambda tokens: tokens),
+    )
+    assert net.compiled.weight_only == (False, False, False, False)
+    assert net.compiled.colors == (Abstract,)
+
+
+def test_read_arcs():
+    net = PetriNet.new(
+        p0 := Place("P0"),
+        p1 := Place("P1"),
+        t := Transition("T"),
+        read_arc(p0, t, {Abstract: 2}),
+        arc(p0, t),
+        arc(t, p1),
+    )
+    compiled = net.compiled
+    assert list(compiled.pre) == [1, 0]
+    assert list(compiled.test) == [2, 0]
+    assert compiled.weight_only == (True,)
+    assert not compiled.is_enabled(compiled.counts({p0: {Token()}}), 0)
+    counts = compiled.counts({p0: {Token(), Token()}})
+    assert compiled.is_enabled(counts, 0)
+    assert list(compiled.fire(counts, 0)) == [1, 1]
+
+
+def test_reset_and_transfer_arcs_are_not_weight_only():
+    net = PetriNet.new(
+        p0 := Place("P0"),
+        p1 := Place("P1"),
+        t0 := Transition("T0"),
+        t1 := Transition("T1"),
+        reset_arc(p0, t0),
+        *transfer_arc(p0, t1, p1),
+    )
+    compiled = net.compiled
+    assert compiled.weight_only == (False, False)
+    assert list(compiled.pre) == [0, 0, 0, 0]
+    assert list(compiled.post) == [0, 0, 0, 0]
+
+
+def test_tokens_of_colors_no_arc_mentions_are_not_counted():
+    net = PetriNet.new(p := Place("P"), t := Transition("T"), arc(p, t, {A: 1}))
+    compiled = net.compiled
+    marking = {p: {A(), B(), B()}}
+    assert list(compiled.counts(marking)) == [1]
+    assert list(compiled.counts({p: {B()}})) == [0]
+    # Count vectors agree with the batched and omega count vectors of analyses.
+    assert count_tensor(compiled, [marking]).tolist() == [[list(compiled.counts(marking))]]
+    assert omega_counts(compiled, marking) == (1,)
+
+
+def test_inhibitor_arcs_see_tokens_of_colors_no_arc_mentions():
+    net = PetriNet.new(p0 := Place("P0"), p1 := Place("P1"), t := Transition("T"), inhibitor_arc(p0, t), arc(t, p1))
+    compiled = net.compiled
+    marking = {p0: {B()}}
+    assert not net.transition_is_enabled(marking, t)
+
+    # The count vector leaves the token out, so the place holding it is passed separately.
+    counts = compiled.counts(marking)
+    assert not any(counts)
+    assert compiled.untracked(marking) == {compiled.place_index[p0]}
+    assert not compiled.is_enabled(counts, 0, compiled.untracked(marking))
+    assert list(compiled.enabled(counts, compiled.untracked(marking))) == []
+    assert compiled.untracked({p0: {Token()}, p1: {B()}}) == {compiled.place_index[p1]}
+    assert list(compiled.enabled(compiled.counts({p1: {B()}}), compiled.untracked({p1: {B()}}))) == [0]
@@ -0,0 +1,96 @@
+import pytest
+
+from carladam import Color, PetriNet, Place, Token, Transition
+from carladam.petrinet import errors
+from carladam.petrinet.arc import transfer_arc
+from carladam.petrinet.compose import compose
+
+
+def component(index: int) -> PetriNet:
+    """Returns a component that moves tokens from a shared "Bus" place through its own transition and place."""
+    return PetriNet.new(
+        bus := Place(name="Bus"),
+        work := Transition(name="Work"),
+        done := Place(name=f"Done {index}"),
+        bus >> work,
+        work >> done,
+    )
+
+
+def test_compose_without_fusion_matches_update():
+    components = [component(i) for i in range(3)]
+
+    composed = compose(*components)
+
+    assert composed == PetriNet().update(*components)
+    assert len(composed.places) == 6
+
+
+def test_compose_fuses_places_and_transitions_by_name():
+    components = [component(i) for i in range(3)]
+
+    composed = compose(*components, fuse=["Bus", "Work"])
+
+    assert sorted(place.name for place in composed.places) == ["Bus", "Done 0", "Done 1", "Done 2"]
+    (work,) = composed.transitions
+    (bus,) = (place for place in composed.places if place.name == "Bus")
+    assert bus in components[0].places
+    assert {arc.dest.name for arc in composed.node_outputs[work]} == {"Done 0", "Done 1", "Done 2"}
+
+    # The three identical bus arcs are fused into one.
+    assert len(composed.node_inputs[work]) == 1
+    assert composed.node_outputs[bus] == composed.node_inputs[work]
+
+    marking = composed.marking_after_transition({bus: {Token()}}, work)
+    assert {place.name for place, tokens in marking.items() if tokens} == {"Done 0", "Done 1", "Done 2"}
+
+
+def test_compose_never_fuses_places_with_transitions():
+    place, transition = Place(name="X"), Transition(name="X")
+
+    composed = compose([place], [transition], fuse=["X"])
+
+    assert composed.places == {place}
+    assert composed.transitions == {transition}
+
+
+def test_compose_fuses_nodes_first_seen_as_arc_endpoints():
+    first, second = Place(name="Shared"), Place(name="Shared")
+    move = Transition(name="Move")
+    red = Color("Red")
+
+    # The transfer arcs are seen before either place, so the place they refer to is the one kept.
+    composed = compose(
+        [*transfer_arc(second, move, out := Place(name="Out"), red)],
+        [first],
+        [second],
+        fuse=["Shared", "Move"],
+    )
+
+    assert composed.places == {second, out}
+    (transfer,) = composed.node_inputs[out]
+    assert transfer.transfer_from is second
+    token = red()
+    assert composed.marking_after_transition({second: {token}}, move)[out] == {token}
+
+
+def test_compose_accepts_a_structure_and_rejects_incomplete_arcs():
+    structure = component(0).structure
+    assert compose(component(0), structure=structure).structure is structure
+    assert isinstance(compose().structure, PetriNet.Structure)
+
+    with pytest.raises(errors.PetriNetArcIncomplete):
+        compose([Place() >> Color("Blue")])
+
+
+def test_compose_merges_the_arc_sets_of_shared_nodes():
+    # Given: two nets sharing a place, and a member list adding another arc to it
+    shared, first, second, third = Place(name="Shared"), Transition(), Transition(), Transition()
+    one, two = PetriNet.new(shared >> first), PetriNet.new(shared >> second)
+
+    composed = compose(one, two, [shared >> third], one)
+
+    # Then: arc sets of nodes found in only one net are reused, and the rest are combined
+    assert composed == PetriNet().update(one, two, shared >> third)
+    assert composed.node_inputs[second] is two.node_inputs[second]
+    assert len(composed.node_outputs[shared]) == 3
@@ -0,0 +1,96 @@
+import pytest
+
+from carladam import Abstract, Color, PetriNet, Place, Token, Transition, arc, passthrough
+from carladam.analysis.coverability import OMEGA, PathIndex, coverability_graph
+from carladam.petrinet.arc import inhibitor_arc
+
+Red = Color("Red")
+
+
+def test_source_transitions_make_places_unbounded():
+    net = PetriNet.new(
+        source := Transition("Source"),
+        p := Place("P"),
+        q := Place("Q"),
+        sink := Transition("Sink"),
+        source >> p,
+        p >> sink,
+        sink >> q,
+    )
+
+    graph = coverability_graph(net, {})
+
+    assert not graph.is_bounded()
+    assert graph.unbounded_places() == {p, q}
+    assert graph.covers({p: Token() * 1000, q: Token() * 1000})
+    assert graph.dead_transitions() == set()
+
+
+def test_bounded_nets_have_exact_bounds():
+    net = PetriNet.new(
+        free := Place("Free"),
+        full := Place("Full"),
+        put := Transition("Put", fn=passthrough()),
+        take := Transition("Take", fn=passthrough()),
+        idle := Transition("Idle"),
+        arc(free, put, Red),
+        arc(put, full, Red),
+        arc(full, take, Red),
+        arc(take, free, Red),
+    )
+
+    graph = coverability_graph(net, {free: Red() * 3})
+
+    assert graph.is_bounded()
+    assert len(graph.markings) == 4
+    assert graph.place_bounds() == {free: 3, full: 3}
+    assert graph.covers({full: Red() * 3})
+    assert not graph.covers({free: Red() * 2, full: Red() * 2})
+    assert graph.dead_transitions() == {idle}
+
+
+def test_accelerates_pumping_cycles_and_finds_dead_transitions():
+    net = PetriNet.new(
+        a := Place("A"),
+        b := Place("B"),
+        c := Place("C"),
+        pump := Transition("Pump"),
+        back := Transition("Back"),
+        never := Transition("Never"),
+        a >> pump,
+        pump >> b,
+        pump >> c,
+        b >> back,
+        back >> a,
+        c >> {Abstract: 2} >> never,
+        a >> {Abstract: 2} >> never,
+    )
+
+    graph = coverability_graph(net, {a: {Token()}})
+
+    assert graph.place_bounds() == {a: 1, b: 1, c: OMEGA}
+    assert graph.dead_transitions() == {never}
+    assert graph.covers({a: {Token()}, c: Token() * 50})
+    assert not graph.covers({a: {Token()}, b: {Token()}})
+
+
+def test_path_index_only_checks_markings_with_contained_support():
+    index = PathIndex()
+    index.push((1, 0, 0))
+    index.push((0, 1, 0))
+    index.push((1, 1, 0))
+
+    assert list(index.covered_by((2, 0, 1))) == [(1, 0, 0)]
+    assert index.accelerate((1, 2, 0)) == (OMEGA, OMEGA, 0)
+
+    index.pop((1, 1, 0))
+    index.pop((0, 1, 0))
+    assert list(index.covered_by((1, 2, 0))) == [(1, 0, 0)]
+
+
+def test_rejects_transitions_not_described_by_weights():
+    p, t = Place("P"), Transition("T")
+    with pytest.raises(ValueError):
+        coverability_graph(PetriNet.new(p, t, inhibitor_arc(p, t)), {})
+    with pytest.raises(ValueError):
+        coverability_graph(PetriNet.new(p, u := Transition("U", guard=lambda inputs: True), p >> u), {})
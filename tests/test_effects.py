@@ -1,6 +1,27 @@
-from carladam import Abstract, Place, Transition
-from carladam.petrinet.effects import Consume, Input, Output, Produce
-from carladam.petrinet.marking import pmarking
+from pyrsistent import pset
+
+from carladam import Abstract, Color, PetriNet, Place, Transition, arc, passthrough
+from carladam.petrinet.arc import reset_arc, transfer_arc
+from carladam.petrinet.effects import (
+    Consume,
+    ConsumeMany,
+    Input,
+    InputMany,
+    Output,
+    OutputMany,
+    Produce,
+    ProduceMany,
+    Reset,
+    Transfer,
+    apply_effects_to_marking,
+    consume_effects,
+    expand_effects,
+    input_effects,
+    output_effects,
+    produce_effects,
+)
+from carladam.petrinet.marking import marking_colorset, pmarking
+from carladam.petrinet.occurrence import Occurrence
 
 
 def test_consume_place_will_have_remaining_token():
@@ -130,3 +151,125 @@ def test_produce_place_is_empty():
     # Then: the token is added to the place
     expected = pmarking({p: {token}})
     assert marking_after_effect == expected
+
+
+def test_reset():
+    # Given: a reset arc from a place to a transition
+    p = Place()
+    t = Transition()
+    arc = reset_arc(p, t)
+
+    # And: a marking where the place has tokens
+    marking = pmarking({p: Abstract() * 3})
+
+    # When: an effect indicating that the place was reset is applied to the marking
+    marking_after_effect = Reset(arc, marking[p]).apply_to_marking(marking)
+
+    # Then: the place is empty
+    assert marking_after_effect == pmarking({})
+
+
+def test_transfer():
+    # Given: a pair of transfer arcs from one place to another
+    p0, p1 = Place(), Place()
+    t = Transition()
+    _, arc = transfer_arc(p0, t, p1)
+
+    # And: a marking where the destination place already has a token
+    token = Abstract()
+    marking = pmarking({p1: {token}})
+
+    # When: an effect indicating that tokens were transferred is applied to the marking
+    transferred = frozenset(Abstract() * 2)
+    marking_after_effect = Transfer(arc, transferred).apply_to_marking(marking)
+
+    # Then: the tokens are added to the destination place
+    assert marking_after_effect == pmarking({p1: {token, *transferred}})
+
+
+def test_consume_many():
+    # Given: a place, a transition, and an arc from the place to the transition
+    p = Place()
+    t = Transition()
+    arc = p >> {Abstract: 2} >> t
+
+    # And: a marking with three tokens
+    token, *consumed = tokens = Abstract() * 3
+    marking = pmarking({p: tokens})
+
+    # When: an effect indicating that two tokens were consumed is applied to the marking
+    marking_after_effect = ConsumeMany(arc, frozenset(consumed)).apply_to_marking(marking)
+
+    # Then: only the remaining token is left in the place
+    assert marking_after_effect == pmarking({p: {token}})
+
+    # And: consuming all tokens leaves the place empty
+    assert ConsumeMany(arc, frozenset(tokens)).apply_to_marking(marking) == pmarking({})
+
+
+def test_produce_many():
+    # Given: a transition, a place, and an arc from the transition to the place
+    t = Transition()
+    p = Place()
+    arc = t >> {Abstract: 2} >> p
+
+    # When: an effect indicating that tokens were produced is applied to an empty marking
+    produced = pmarking({p: Abstract() * 2})[p]
+    marking = ProduceMany(arc, produced).apply_to_marking(pmarking({}))
+
+    # Then: the produced set is placed directly into the place
+    assert marking[p] is produced
+
+    # And: producing more tokens adds them to the place
+    more = frozenset(Abstract() * 2)
+    assert ProduceMany(arc, more).apply_to_marking(marking) == pmarking({p: {*produced, *more}})
+
+
+def test_bulk_effects_are_used_for_multiple_tokens():
+    # Given: a net moving many tokens along each arc
+    part = Color("Part")
+    net = PetriNet.new(
+        p0 := Place(),
+        p1 := Place(),
+        t := Transition(fn=passthrough()),
+        arc(p0, t, {part: 500}),
+        arc(t, p1, {part: 500}),
+    )
+    marking = pmarking({p0: part() * 501})
+
+    # When: the transition occurs
+    effects = Occurrence(net, marking, t).bulk_effects()
+
+    # Then: the marking changes, and inputs and outputs are recorded, with one effect per arc
+    assert [type(effect) for effect in effects] == [ConsumeMany, InputMany, OutputMany, ProduceMany]
+    assert marking_colorset(net.marking_after_transition(marking, t)) == {p0: {part: 1}, p1: {part: 500}}
+
+    # And: effects can be expanded to one per token on demand
+    expanded = list(expand_effects(effects))
+    assert len(expanded) == 2000
+    assert {type(effect) for effect in expanded} == {Consume, Input, Output, Produce}
+    assert {effect.token for effect in expanded if isinstance(effect, Input)} == effects[1].tokens
+    assert apply_effects_to_marking(marking, effects) == net.marking_after_transition(marking, t)
+
+    # And: the effects of an occurrence are given one per token, as they always have been
+    per_token = Occurrence(net, marking, t).effects()
+    assert {type(effect) for effect in per_token} == {Consume, Input, Output, Produce}
+    assert len(per_token) == 2000
+    assert apply_effects_to_marking(marking, per_token) == net.marking_after_transition(marking, t)
+
+
+def test_effect_factories():
+    p, t = Place(), Transition()
+    token = Abstract()
+    assert input_effects(p >> t, set()) == output_effects(t >> p, set()) == []
+    assert input_effects(p >> t, {token}) == [Input(p >> t, token)]
+    assert output_effects(t >> p, {token}) == [Output(t >> p, token)]
+    assert output_effects(t >> p, [token, token3 := Abstract()]) == [OutputMany(t >> p, frozenset({token, token3}))]
+    assert list(expand_effects([Reset(p >> t, pset([token]))])) == [Reset(p >> t, pset([token]))]
+    assert consume_effects(p >> t, set()) == []
+    assert consume_effects(p >> t, {token}) == [Consume(p >> t, token)]
+    assert produce_effects(t >> p, set()) == []
+    assert produce_effects(t >> p, {token}) == [Produce(t >> p, token)]
+    assert produce_effects(t >> p, {token, token2 := Abstract()}) == [
+        ProduceMany(t >> p, pmarking({p: {token, token2}})[p])
+    ]
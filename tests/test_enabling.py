@@ -0,0 +1,92 @@
+import random
+
+import numpy
+
+from carladam import Color, PetriNet, Place, Token, Transition, arc
+from carladam.analysis import enabling
+from carladam.analysis.enabling import count_tensor, enabled_matrix, enabled_transitions, weight_enabled_matrix
+from carladam.petrinet.arc import inhibitor_arc, read_arc, reset_arc
+
+A = Color("A")
+B = Color("B")
+C = Color("C")
+
+
+def example_net() -> PetriNet:
+    return PetriNet.new(
+        p0 := Place("P0"),
+        p1 := Place("P1"),
+        p2 := Place("P2"),
+        t_weights := Transition("Weights"),
+        t_inhibited := Transition("Inhibited"),
+        t_read := Transition("Read"),
+        t_guarded := Transition("Guarded", guard=lambda tokens: len(tokens) == 2),
+        t_reset := Transition("Reset"),
+        arc(p0, t_weights, {A: 2, B: 1}),
+        arc(t_weights, p1),
+        arc(p1, t_inhibited, {A: 1}),
+        inhibitor_arc(p2, t_inhibited, {A: 1}),
+        read_arc(p0, t_read, {A: 1}),
+        arc(p1, t_read, {B: 1}),
+        arc(p0, t_guarded, {A: 1}),
+        arc(p1, t_guarded, {A: 1}),
+        reset_arc(p2, t_reset),
+        arc(p1, t_reset, {B: 1}),
+    )
+
+
+def random_markings(net: PetriNet, count: int):
+    rng = random.Random(0)
+    markings = []
+    for _ in range(count):
+        marking = {}
+        for place in net.places:
+            tokens = {color() for color in (A, B, C) for _ in range(rng.randrange(3))}
+            if tokens:
+                marking[place] = tokens
+        markings.append(marking)
+    return markings
+
+
+def test_enabled_matrix_matches_transition_is_enabled():
+    net = example_net()
+    markings = random_markings(net, 200)
+    matrix = enabled_matrix(net, markings)
+    expected = [
+        [net.transition_is_enabled(marking, transition) for transition in net.compiled.transitions]
+        for marking in markings
+    ]
+    assert matrix.shape == (200, 5)
+    assert matrix.tolist() == expected
+    # Every transition is enabled somewhere and disabled somewhere, so the comparison is meaningful.
+    assert matrix.any(axis=0).all()
+    assert not matrix.all(axis=0).any()
+
+    sets = enabled_transitions(net, markings)
+    assert sets[0] == {t for t, enabled in zip(net.compiled.transitions, expected[0]) if enabled}
+
+
+def test_transitions_without_arcs_are_never_enabled():
+    net = PetriNet.new(idle := Transition("Idle"))
+    compiled = net.compiled
+
+    assert compiled.weight_only == (False,)
+    assert list(compiled.enabled(compiled.counts({}))) == []
+    assert enabled_matrix(net, [{}]).tolist() == [[False]]
+    assert list(net.enabled_transitions({})) == []
+    assert enabled_transitions(net, [{}]) == [frozenset()]
+    assert idle in net.transitions
+
+
+def test_weight_enabled_matrix_accepts_count_vectors_in_chunks(monkeypatch):
+    monkeypatch.setattr(enabling, "CHUNK_ELEMENTS", 1)
+    net = PetriNet.new(p := Place(), t := Transition(), arc(p, t, {A: 2}))
+    compiled = net.compiled
+    counts = numpy.array([[0], [1], [2], [3]])
+    assert weight_enabled_matrix(compiled, counts).tolist() == [[False], [False], [True], [True]]
+    assert count_tensor(compiled, [{p: {Token(color=A), Token(color=B)}}]).tolist() == [[[1]]]
+
+
+def test_empty_batch():
+    net = example_net()
+    assert enabled_matrix(net, []).shape == (0, 5)
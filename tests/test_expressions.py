@@ -0,0 +1,157 @@
+import gc
+
+import pytest
+from pyrsistent import pset
+
+from carladam import Color, PetriNet, Place, Transition, tokens_where
+from carladam.petrinet import expressions
+from carladam.petrinet.errors import ArcGuardReturnsFalse, TransitionGuardReturnsFalse
+from carladam.petrinet.expressions import (
+    VECTORIZE_THRESHOLD,
+    Condition,
+    Predicate,
+    all_tokens,
+    any_token,
+    color_is,
+    columns_of,
+    count,
+    data_field,
+    maximum,
+    minimum,
+    total,
+)
+from carladam.petrinet.indexed import IndexedTokenSet
+from carladam.petrinet.marking import pmarking
+from carladam.petrinet.occurrence import Occurrence
+
+Order = Color("Order")
+Refund = Color("Refund")
+
+TOKENS = {
+    Order(amount=10, region="east"),
+    Order(amount=25, region="west"),
+    Order(amount=40, region="east", rush=True),
+    Refund(amount=5, region="east"),
+    Refund(region="west"),
+}
+
+CONDITIONS = [
+    (count() == 5, True),
+    (count(color_is(Order)) >= 3, True),
+    (count(data_field("rush") == True) == 1, True),  # noqa: E712
+    (total("amount") == 80, True),
+    (total("amount", where=color_is(Refund)) < 5, False),
+    (total("amount", where=data_field("region") == "north") == 0, True),
+    (minimum("amount", where=color_is(Order)) == 10, True),
+    (maximum("amount") > 40, False),
+    (minimum("amount", where=data_field("amount") > 100) < 1, False),
+    (maximum("missing") == 1, False),
+    (any_token(data_field("amount") >= 40), True),
+    (any_token((data_field("region") == "west") & color_is(Refund)), True),
+    (all_tokens(color_is(Order, Refund)), True),
+    (all_tokens(data_field("amount") > 0), False),
+    (all_tokens((data_field("amount") > 0) | ~color_is(Order)), True),
+    (count(data_field("amount") != 10) == 3, True),
+    (count(data_field("amount") <= 25) == 3, True),
+    (maximum("amount") <= 40, True),
+    ((count() == 5) & (total("amount") > 100), False),
+    ((count() == 4) | (total("amount") == 80), True),
+    (~(count() == 5), False),
+]
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+@pytest.mark.parametrize("condition, expected", CONDITIONS, ids=[repr(c) for c, _ in CONDITIONS])
+def test_conditions_agree_across_evaluation_modes(condition, expected, vectorized):
+    assert condition.evaluate(TOKENS, vectorized=vectorized) is expected
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_predicate_filter(vectorized):
+    predicate = (data_field("amount") > 5) & ~(data_field("region") == "west")
+    assert {token.data["amount"] for token in predicate.filter(TOKENS, vectorized=vectorized)} == {10, 40}
+    # Fields may be compared with other fields; tokens lacking either field never match.
+    tokens = {Order(low=1, high=2), Order(low=3, high=2), Order(low=1)}
+    assert len((data_field("low") < data_field("high")).filter(tokens, vectorized=vectorized)) == 1
+
+
+def test_predicate_is_a_token_condition():
+    predicate = data_field("amount") >= 25
+    assert len(tokens_where(predicate)(TOKENS)) == 2
+    assert not predicate(Refund(region="west"))
+
+
+def test_large_token_sets_are_vectorized_by_default():
+    tokens = {Order(amount=n) for n in range(VECTORIZE_THRESHOLD)}
+    condition = total("amount") == sum(range(VECTORIZE_THRESHOLD))
+    assert condition(tokens)
+    assert len((data_field("amount") < 10).filter(tokens)) == 10
+
+
+def test_columns_are_reused_for_persistent_sets():
+    tokens = pset(TOKENS)
+    indexed = IndexedTokenSet.create(["region"], TOKENS)
+
+    assert columns_of(tokens) is columns_of(tokens)
+    assert columns_of(indexed) is columns_of(indexed)
+    assert columns_of(set(TOKENS)) is not columns_of(set(TOKENS))
+    key = id(tokens)
+    del tokens
+    gc.collect()
+    assert key not in expressions._columns_of_sets
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_fields_of_mixed_types(vectorized):
+    tokens = {Order(code=1), Order(code="1"), Order(code=(1, 2)), Order(code=(3, 4))}
+
+    assert (count(data_field("code") == 1) == 1).evaluate(tokens, vectorized=vectorized)
+    assert len((data_field("code") == (1, 2)).filter(tokens, vectorized=vectorized)) == 1
+    with pytest.raises(TypeError):
+        (data_field("code") < 2).filter(tokens, vectorized=vectorized)
+    with pytest.raises(TypeError) as excinfo:
+        (total("amount") > 0).evaluate({Order(amount=1), Order(amount="2")}, vectorized=vectorized)
+    assert excinfo.type is TypeError
+    # Columns of numbers compared with strings raise TypeError, not NumPy's own subclass of it.
+    with pytest.raises(TypeError) as excinfo:
+        (data_field("amount") < "x").filter(TOKENS, vectorized=vectorized)
+    assert excinfo.type is TypeError
+
+
+def test_bases_are_abstract():
+    with pytest.raises(TypeError):
+        Predicate()
+    with pytest.raises(TypeError):
+        Condition()
+
+
+def test_reprs():
+    assert repr(count()) == "count()"
+    assert repr(~(data_field("a") == 1) | color_is(Order)) == "(~data_field('a') == 1 | color_is(Order))"
+    assert repr(~(maximum("a") != 2) & (count() > 0)) == "(~maximum('a') != 2 & count() > 0)"
+    assert repr((count() > 0) | (count() < 9)) == "(count() > 0 | count() < 9)"
+
+
+def test_expressions_as_transition_and_arc_guards():
+    # Given: a transition guarded by an expression, fed by a place guarded by an expression
+    orders = Place()
+    shipped = Place()
+    ship = Transition(guard=all_tokens(data_field("paid") == True))  # noqa: E712
+    net = PetriNet.new(
+        (orders >> {Order: 2} >> ship)(guard=total("amount") >= 100),
+        ship >> shipped,
+    )
+
+    # When: the orders are paid but too small, the arc guard fails
+    marking = pmarking({orders: {Order(amount=10, paid=True), Order(amount=20, paid=True)}})
+    with pytest.raises(ArcGuardReturnsFalse):
+        Occurrence(net, marking, ship).check_enabled()
+
+    # When: the orders are large enough but one is unpaid, the transition guard fails
+    marking = pmarking({orders: {Order(amount=60, paid=True), Order(amount=50, paid=False)}})
+    with pytest.raises(TransitionGuardReturnsFalse):
+        Occurrence(net, marking, ship).check_enabled()
+
+    # When: both guards pass, the transition occurs
+    marking = pmarking({orders: {Order(amount=60, paid=True), Order(amount=50, paid=True)}})
+    assert ship in set(net.enabled_transitions(marking))
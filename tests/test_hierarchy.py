@@ -0,0 +1,109 @@
+import pytest
+
+from carladam import PetriNet, Place, Token, Transition
+from carladam.petrinet.arc import transfer_arc
+from carladam.petrinet.hierarchy import HierarchicalNet, ModuleInstance
+from carladam.petrinet.marking import marking_colorset
+
+
+def station() -> tuple[PetriNet, Place, Place, Place]:
+    """Returns a module, and its input, interior, and output places."""
+    net = PetriNet.new(
+        inbox := Place("In"),
+        work := Transition("Work"),
+        busy := Place("Busy"),
+        finish := Transition("Finish"),
+        outbox := Place("Out"),
+        inbox >> work,
+        work >> busy,
+        busy >> finish,
+        finish >> outbox,
+    )
+    return net, inbox, busy, outbox
+
+
+def test_instances_are_expanded_lazily_and_share_their_module():
+    # Given: a line of stations, each an instance of the same module
+    module, inbox, busy, outbox = station()
+    places = [Place(f"P{i}") for i in range(4)]
+    instances = [ModuleInstance(f"S{i}", module, {inbox: places[i], outbox: places[i + 1]}) for i in range(3)]
+    plant = HierarchicalNet(PetriNet.new(*places), instances)
+
+    # Then: nothing is expanded until needed, and every instance refers to the same module
+    assert all(instance.module is module for instance in instances)
+    assert all(not instance._caches for instance in instances)
+
+    # When: one instance is expanded
+    s1 = plant.instance("S1")
+    expanded = s1.expanded
+    assert repr(s1) == "<ModuleInstance 'S1'>"
+
+    # Then: only its interior is created, with ports fused to the parent's places
+    assert {place.name for place in expanded.places} == {"P1", "S1.Busy", "P2"}
+    assert {transition.name for transition in expanded.transitions} == {"S1.Work", "S1.Finish"}
+    assert s1.node(busy).id == f"S1.{busy.id}"
+    assert not instances[0]._caches
+
+    # When: the plant is flattened, a token flows through every station
+    flat = plant.flatten()
+    assert plant.flatten() is flat
+    assert len(flat.places) == 4 + 3
+    assert len(flat.transitions) == 6
+    marking = {places[0]: {Token()}}
+    work, finish = sorted(module.transitions, reverse=True)
+    for instance in instances:
+        marking = flat.marking_after_transition(marking, instance.node(work))
+        marking = flat.marking_after_transition(marking, instance.node(finish))
+    assert marking_colorset(marking) == marking_colorset({places[3]: {Token()}})
+
+
+def test_substitution_transitions_are_replaced():
+    # Given: a parent net with a substitution transition standing in for a station
+    module, inbox, busy, outbox = station()
+    parent = PetriNet.new(a := Place("A"), sub := Transition("Station"), b := Place("B"), a >> sub, sub >> b)
+    plant = HierarchicalNet(parent, [ModuleInstance("S", module, {inbox: a, outbox: b}, transition=sub)])
+
+    # When: flattened
+    flat = plant.flatten()
+
+    # Then: the substitution transition and its arcs are gone, replaced by the module's interior
+    assert sub not in flat.transitions
+    assert {transition.name for transition in flat.transitions} == {"S.Work", "S.Finish"}
+    assert all(sub not in (arc.src, arc.dest) for arc in flat.arcs)
+
+    # And: markings of the module map onto the expanded places
+    instance = plant.instance("S")
+    assert instance.marking({busy: {token := Token()}}) == {instance.node(busy): {token}}
+    with pytest.raises(KeyError):
+        plant.instance("missing")
+
+
+def test_nested_hierarchies_and_transfer_arcs():
+    # Given: a module that itself contains instances, one of which uses a transfer arc
+    mover = PetriNet.new(src := Place("Src"), dest := Place("Dest"), *transfer_arc(src, Transition("Move"), dest))
+    middle = Place("Middle")
+    cell = HierarchicalNet(
+        PetriNet.new(cell_in := Place("CellIn"), middle, cell_out := Place("CellOut")),
+        [
+            ModuleInstance("M1", mover, {src: cell_in, dest: middle}),
+            ModuleInstance("M2", mover, {src: middle, dest: cell_out}),
+        ],
+    )
+    plant = HierarchicalNet(
+        PetriNet.new(start := Place("Start"), end := Place("End")),
+        [ModuleInstance("Cell", cell, {cell_in: start, cell_out: end})],
+    )
+
+    # When: flattened
+    flat = plant.flatten()
+
+    # Then: nested names are prefixed at every level, and transfer arcs follow their places
+    assert {transition.name for transition in flat.transitions} == {"Cell.M1.Move", "Cell.M2.Move"}
+    transfer_sources = {arc.transfer_from.name for arc in flat.arcs if getattr(arc, "transfer_from", None)}
+    assert transfer_sources == {"Start", "Cell.Middle"}
+
+
+def test_instance_names_must_be_unique():
+    module, *_ = station()
+    with pytest.raises(ValueError):
+        HierarchicalNet(PetriNet.new(), [ModuleInstance("S", module), ModuleInstance("S", module)])
@@ -0,0 +1,108 @@
+import pytest
+
+from carladam import Color, PetriNet, Place, Token, Transition
+from carladam.petrinet.arc import transfer_arc
+from carladam.petrinet.history import History, apply_deltas
+from carladam.petrinet.trace import PlaceDelta
+
+Red = Color("Red")
+
+
+def counter() -> tuple[PetriNet, Place, Place, Transition]:
+    """Returns a net that moves one token at a time from a supply place to a done place."""
+    net = PetriNet.new(
+        supply := Place("Supply"),
+        done := Place("Done"),
+        move := Transition("Move"),
+        supply >> move,
+        move >> done,
+    )
+    return net, supply, done, move
+
+
+def sizes(marking) -> tuple[int, int]:
+    return tuple(len(marking.get(place, ())) for place in sorted(marking, key=lambda place: place.name))
+
+
+@pytest.mark.parametrize("interval", [None, 1, 3])
+def test_undo_redo_and_random_access_match_replaying(interval):
+    net, supply, done, move = counter()
+    history = History(net, {supply: Token() * 10}, checkpoint_interval=interval)
+
+    replayed = [history.marking]
+    for _ in range(10):
+        replayed.append(history.step(move))
+
+    assert len(history) == history.position == 10
+    assert not history.can_redo
+    for position in reversed(range(10)):
+        assert history.undo() == replayed[position]
+    assert not history.can_undo
+    for position in range(1, 11):
+        assert history.redo() == replayed[position]
+    for position in (7, 2, 10, 0, 5):
+        assert history.marking_at(position) == replayed[position]
+        assert history.go_to(position) == replayed[position]
+
+
+def test_snapshots_share_unchanged_places():
+    net, supply, done, move = counter()
+    idle = Place("Idle")
+    history = History(net, {supply: Token() * 2, idle: Token() * 100})
+
+    history.step(move)
+
+    assert history.marking[idle] is history.initial_marking[idle]
+    assert history.deltas[0][0] == PlaceDelta(supply, history.deltas[0][0].removed, ())
+
+
+def test_checkpoints_are_kept_every_interval():
+    net, supply, done, move = counter()
+    history = History(net, {supply: Token() * 10}, checkpoint_interval=4)
+
+    for _ in range(10):
+        history.step(move)
+
+    assert len(history._snapshots) == 3
+    assert sizes(history.marking_at(9)) == (9, 1)
+    assert sizes(history.marking_at(6)) == (6, 4)
+
+
+def test_stepping_after_undo_discards_later_steps():
+    net, supply, done, move = counter()
+    history = History(net, {supply: Token() * 5}, checkpoint_interval=2)
+    for _ in range(5):
+        history.step(move)
+
+    history.go_to(1)
+    history.step(move)
+
+    assert len(history) == history.position == 2
+    assert len(history._snapshots) == 2
+    assert sizes(history.marking) == (2, 3)
+    assert sizes(history.marking_at(1)) == (1, 4)
+
+
+def test_navigation_errors():
+    net, supply, done, move = counter()
+    history = History(net, {supply: {Token()}})
+    with pytest.raises(IndexError, match="undo"):
+        history.undo()
+    with pytest.raises(IndexError, match="redo"):
+        history.redo()
+    with pytest.raises(IndexError, match="out of range"):
+        history.marking_at(1)
+    with pytest.raises(ValueError, match="at least 1"):
+        History(net, {}, checkpoint_interval=0)
+
+
+def test_deltas_apply_to_transfers_in_both_directions():
+    source, dest, empty = Place("Source"), Place("Dest"), Transition("Empty")
+    net = PetriNet.new(transfer_arc(source, empty, dest, Red))
+    history = History(net, {source: {Red(), Red()}}, checkpoint_interval=5)
+
+    after = history.step(empty)
+
+    assert apply_deltas(history.initial_marking, history.deltas[0]) == after
+    assert apply_deltas(after, history.deltas[0], reverse=True) == history.initial_marking
+    assert history.undo() == history.initial_marking
@@ -0,0 +1,150 @@
+import pytest
+from pyrsistent import pmap, pset
+
+from carladam import Color, PetriNet, Place, Token, Transition, passthrough, tokens_with
+from carladam.petrinet.arc import transfer_arc, weights_are_satisfied
+from carladam.petrinet.effects import Produce, ProduceMany
+from carladam.petrinet.indexed import IndexedTokenSet
+from carladam.petrinet.marking import empty_tokens, persistent_tokens, pmarking
+
+
+def test_indexed_token_set_behaves_like_pset():
+    # Given: tokens, one of which lacks the indexed field
+    t1, t2, t3 = Token(data={"order_id": 1}), Token(data={"order_id": 2}), Token(data={"other": 1})
+
+    # When: an indexed token set is created
+    tokens = IndexedTokenSet.create(["order_id"], [t1, t2, t3])
+
+    # Then: it is equal to, and hashed the same as, a pset of the same tokens
+    assert tokens == pset([t1, t2, t3])
+    assert hash(tokens) == hash(pset([t1, t2, t3]))
+    assert len(tokens) == 3
+    assert t3 in tokens
+    assert set(tokens) == {t1, t2, t3}
+    assert repr(tokens).startswith("IndexedTokenSet(['order_id'], [")
+
+    # And: unchanged sets are returned as-is
+    assert tokens.add(t1) is tokens
+    assert tokens.update([]) is tokens
+    assert tokens.discard(Token()) is tokens
+
+    # And: removing a missing token raises KeyError
+    with pytest.raises(KeyError):
+        tokens.remove(Token())
+
+
+def test_indexes_are_maintained_as_tokens_change():
+    t1, t2, t3 = Token(data={"order_id": 1}), Token(data={"order_id": 1}), Token(data={"other": 1})
+    tokens = IndexedTokenSet.create(["order_id"], [t1, t2, t3])
+    assert tokens.where("order_id", 1) == {t1, t2}
+    assert tokens.where("order_id", 2) == set()
+
+    # Removing one of two tokens with a value keeps the other indexed.
+    tokens = tokens.remove(t1)
+    assert tokens.where("order_id", 1) == {t2}
+
+    # Removing the last token with a value removes it from the index.
+    tokens = tokens.discard(t2)
+    assert tokens.where("order_id", 1) == set()
+    assert tokens._indexes["order_id"] == pmap()
+
+    # Tokens lacking the indexed field are removed without touching the index.
+    tokens = tokens.remove(t3)
+    assert tokens == set()
+
+    # Fields that are not indexed are answered by scanning.
+    assert IndexedTokenSet.create([], [t3]).where("other", 1) == {t3}
+
+
+def test_tokens_with_uses_smallest_index_entry():
+    t1 = Token(data={"order_id": 1, "line": "a"})
+    t2 = Token(data={"order_id": 1, "line": "b"})
+    t3 = Token(data={"order_id": 2, "line": "a"})
+    tokens = IndexedTokenSet.create(["order_id", "line"], [t1, t2, t3])
+
+    assert tokens_with(order_id=1)(tokens) == {t1, t2}
+    assert tokens_with(order_id=1, line="a")(tokens) == {t1}
+    assert tokens_with(order_id=3)(tokens) == set()
+    assert tokens_with(order_id=2, unindexed=True)(tokens) == set()
+    # Plain sets are scanned.
+    assert tokens_with(line="b")({t1, t2, t3}) == {t2}
+
+
+def test_persistent_tokens_suits_place():
+    token = Token(data={"order_id": 1})
+    indexed = Place(indexes=["order_id"])
+    plain = Place()
+    assert indexed.indexes == ("order_id",)
+
+    assert isinstance(empty_tokens(indexed), IndexedTokenSet)
+    assert empty_tokens(plain) == pset()
+
+    tokens = persistent_tokens(indexed, {token})
+    assert isinstance(tokens, IndexedTokenSet)
+    assert persistent_tokens(indexed, tokens) is tokens
+    assert not isinstance(persistent_tokens(plain, tokens), IndexedTokenSet)
+    assert persistent_tokens(Place(indexes=["other"]), tokens).fields == ("other",)
+
+    marking = pmarking({indexed: {token}, plain: {token}})
+    assert isinstance(marking[indexed], IndexedTokenSet)
+    assert pmarking(marking) is marking
+
+
+def test_indexes_are_maintained_through_firings():
+    # Given: orders and payments, matched by order ID via an indexed place
+    Order = Color("Order")
+    Payment = Color("Payment")
+    orders = Place(indexes=["order_id"])
+    payments = Place()
+    paid = Place(indexes=["order_id"])
+    archive = Place()
+
+    guarded = []
+
+    def matching_order(arc, tokens):
+        # Arc guards receive the tokens of their place, so lookups use the place's index.
+        guarded.append(tokens)
+        return weights_are_satisfied(arc, tokens) and bool(tokens_with(order_id=1)(tokens))
+
+    pay = Transition(fn=passthrough())
+    net = PetriNet.new(
+        (orders >> {Order: 2} >> pay)(guard=matching_order),
+        payments >> {Payment: 1} >> pay,
+        pay >> {Order: 2, Payment: 1} >> paid,
+    )
+    order1, order2 = Order(order_id=1), Order(order_id=2)
+    payment = Payment(order_id=1)
+    marking = net.empty_marking().update({orders: pset([order1, order2]), payments: pset([payment])})
+    marking = pmarking(marking)
+    assert isinstance(marking[orders], IndexedTokenSet)
+
+    # When: the transition occurs
+    marking = net.marking_after_transition(marking, pay)
+    assert isinstance(guarded[0], IndexedTokenSet)
+
+    # Then: the index of the destination place reflects the tokens moved
+    assert orders not in marking
+    assert marking[paid].where("order_id", 1) == {order1, payment}
+    assert marking[paid].where("order_id", 2) == {order2}
+    assert tokens_with(order_id=1)(marking[paid]) == {order1, payment}
+
+    # And: transferring tokens to an unindexed place drops the index
+    archive_all, archive_in = transfer_arc(paid, archive_t := Transition(), archive)
+    net = net.update(archive_all, archive_in)
+    marking = net.marking_after_transition(marking, archive_t)
+    assert marking[archive] == {order1, order2, payment}
+    assert not isinstance(marking[archive], IndexedTokenSet)
+
+
+def test_produce_into_empty_indexed_place():
+    Order = Color("Order")
+    place = Place(indexes=["order_id"])
+    t = Transition()
+    arc = t >> {Order: 2} >> place
+    token1, token2 = Order(order_id=1), Order(order_id=2)
+
+    marking = Produce(arc, token1).apply_to_marking(pmap())
+    assert marking[place].where("order_id", 1) == {token1}
+
+    marking = ProduceMany(arc, pset([token1, token2])).apply_to_marking(pmap())
+    assert marking[place].where("order_id", 2) == {token2}
@@ -0,0 +1,121 @@
+import numpy
+import pytest
+
+from carladam import Abstract, Color, PetriNet, Place, Transition, arc, passthrough
+from carladam.analysis.invariants import farkas, incidence_matrix, p_invariants, t_invariants, weighted_count
+from carladam.analysis.reachability import reachability_graph
+from carladam.petrinet.arc import read_arc, reset_arc
+
+Red = Color("Red")
+Blue = Color("Blue")
+
+
+def mutex() -> tuple[PetriNet, dict]:
+    """Returns two processes sharing a lock, and an initial marking with both idle and the lock free."""
+    places = {name: Place(name=name) for name in ("Idle 1", "Busy 1", "Idle 2", "Busy 2", "Lock")}
+    transitions = {name: Transition(name=name) for name in ("Enter 1", "Leave 1", "Enter 2", "Leave 2")}
+    net = PetriNet.new(
+        *places.values(),
+        *transitions.values(),
+        places["Idle 1"] >> transitions["Enter 1"],
+        places["Lock"] >> transitions["Enter 1"],
+        transitions["Enter 1"] >> places["Busy 1"],
+        places["Busy 1"] >> transitions["Leave 1"],
+        transitions["Leave 1"] >> places["Idle 1"],
+        transitions["Leave 1"] >> places["Lock"],
+        places["Idle 2"] >> transitions["Enter 2"],
+        places["Lock"] >> transitions["Enter 2"],
+        transitions["Enter 2"] >> places["Busy 2"],
+        places["Busy 2"] >> transitions["Leave 2"],
+        transitions["Leave 2"] >> places["Idle 2"],
+        transitions["Leave 2"] >> places["Lock"],
+    )
+    return net, {places[name]: Abstract() * 1 for name in ("Idle 1", "Idle 2", "Lock")}
+
+
+def names(invariants) -> list[dict[str, int]]:
+    return [{node.name: weight for node, weight in invariant.items()} for invariant in invariants]
+
+
+def test_p_invariants_are_conserved_in_every_reachable_marking():
+    net, initial = mutex()
+
+    invariants = p_invariants(net)
+
+    assert sorted(map(sorted, names(invariants))) == [
+        ["Busy 1", "Busy 2", "Lock"],
+        ["Busy 1", "Idle 1"],
+        ["Busy 2", "Idle 2"],
+    ]
+    graph = reachability_graph(net, initial)
+    for invariant in invariants:
+        assert {weighted_count(invariant, marking) for marking in graph.markings} == {
+            weighted_count(invariant, initial)
+        }
+
+
+def test_t_invariants_are_cycles():
+    net, _ = mutex()
+
+    assert sorted(map(sorted, names(t_invariants(net)))) == [["Enter 1", "Leave 1"], ["Enter 2", "Leave 2"]]
+
+
+def test_weighted_invariants():
+    net = PetriNet.new(
+        a := Place("A"),
+        b := Place("B"),
+        split := Transition("Split"),
+        join := Transition("Join"),
+        a >> split,
+        split >> {Abstract: 2} >> b,
+        b >> {Abstract: 2} >> join,
+        join >> a,
+    )
+
+    assert p_invariants(net) == [{a: 2, b: 1}]
+    assert t_invariants(net) == [{join: 1, split: 1}]
+    assert weighted_count({a: 2, b: 1}, {a: Abstract() * 1, b: Abstract() * 2}) == 4
+
+
+def test_incidence_matrix_by_color():
+    net = PetriNet.new(
+        p := Place("P"),
+        q := Place("Q"),
+        t := Transition("T", fn=passthrough()),
+        u := Transition("U"),
+        arc(p, t, Red),
+        arc(t, q, Red),
+        read_arc(q, u, Blue),
+    )
+
+    collapsed = incidence_matrix(net)
+    assert collapsed.rows == (p, q)
+    assert collapsed.matrix.tolist() == [[-1, 0], [1, 0]]
+
+    by_color = incidence_matrix(net, by_color=True)
+    assert by_color.rows == ((p, Red), (q, Blue), (q, Red))
+    assert by_color.matrix.tolist() == [[-1, 0], [0, 0], [1, 0]]
+    assert p_invariants(net, by_color=True) == [{(q, Blue): 1}, {(p, Red): 1, (q, Red): 1}]
+    assert weighted_count({(q, Red): 1}, {q: {Red(), Blue()}}) == 1
+    assert t_invariants(net, by_color=True) == [{u: 1}]
+
+
+def test_nets_without_invariants():
+    net = PetriNet.new(p := Place("P"), source := Transition("Source"), source >> p)
+
+    assert p_invariants(net) == []
+    assert t_invariants(net) == []
+
+
+def test_farkas_returns_minimal_generators():
+    matrix = numpy.array([[1, 0, -1, -1], [0, 1, -1, -2]])
+
+    assert farkas(matrix.T).tolist() == [[1, 1, 1, 0], [1, 2, 0, 1]]
+    assert farkas(matrix).shape == (0, 2)
+
+
+def test_rejects_arcs_whose_weights_do_not_describe_counts():
+    net = PetriNet.new(p := Place("P"), t := Transition("T"), reset_arc(p, t))
+
+    with pytest.raises(ValueError):
+        p_invariants(net)
@@ -12,3 +12,11 @@ def test_pmarking():
     assert pmarking(dict_marking) == expected_pmarking
     assert type(pmarking(dict_marking)) == type(expected_pmarking)
     assert pmarking(expected_pmarking) == expected_pmarking
+
+
+def test_pmarking_keeps_persistent_token_sets():
+    p0, p1 = Place(), Place()
+    tokens = s(Token())
+    marking = pmap({p0: tokens})
+    assert pmarking(marking) is marking
+    assert pmarking({p0: tokens, p1: {Token()}})[p0] is tokens
@@ -0,0 +1,104 @@
+import pickle
+import threading
+from multiprocessing import Pipe
+
+import pytest
+
+from carladam import Color, PetriNet, Place, Token, Transition, arc, passthrough
+from carladam.analysis import parallel
+from carladam.analysis.parallel import SEED, Shard, encode_marking, parallel_reachability_graph, serve
+from carladam.analysis.reachability import canonical_key, reachability_graph
+from carladam.petrinet.marking import pmarking
+from examples.manufacturing.pull import Pull
+
+Red = Color("Red")
+
+
+def buffers(count: int, capacity: int) -> tuple[PetriNet, dict]:
+    """Returns `count` independent bounded buffers, with `(capacity + 1) ** count` reachable markings."""
+    members, initial = [], {}
+    for index in range(count):
+        free, full = Place(f"Free {index}"), Place(f"Full {index}")
+        put = Transition(f"Put {index}", fn=passthrough())
+        take = Transition(f"Take {index}", fn=passthrough())
+        members += [free, full, put, take, arc(free, put, Red), arc(put, full, Red), arc(full, take, Red)]
+        members.append(arc(take, free, Red))
+        initial[free] = Red() * capacity
+    return PetriNet.new(*members), initial
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_parallel_graph_matches_serial_graph(workers):
+    net, initial = buffers(3, 2)
+
+    parallel = parallel_reachability_graph(net, initial, workers=workers)
+
+    serial = reachability_graph(net, initial)
+    assert parallel.exploration == serial.exploration
+    assert parallel.exploration.states == 27
+    assert parallel.edges == serial.edges
+    # Which of several equal tokens a transition takes depends on set iteration order, so compare keys.
+    assert list(map(canonical_key, parallel.markings)) == list(map(canonical_key, serial.markings))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("options", [dict(max_depth=4), dict(max_states=50), dict(max_states=1)])
+def test_parallel_bounds_match_serial_bounds(options, workers):
+    net = Pull.new()
+    initial = net.Structure.example_markings["Initialized"]
+
+    parallel = parallel_reachability_graph(net, initial, workers=workers, **options)
+
+    serial = reachability_graph(net, initial, **options)
+    assert parallel.exploration == serial.exploration
+    assert not parallel.exploration.complete
+    assert parallel.edges == serial.edges
+    # Transitions mint new tokens in each exploration, so markings are compared by their keys.
+    assert list(map(canonical_key, parallel.markings)) == list(map(canonical_key, serial.markings))
+
+
+def test_markings_can_be_left_in_workers():
+    net = PetriNet.new(a := Place("A"), t := Transition("T"), b := Place("B"), a >> t, t >> b)
+
+    graph = parallel_reachability_graph(net, {a: {Token()}}, workers=2, keep_markings=False)
+
+    assert graph.markings == []
+    assert [(source, transition, target) for source, transition, target in graph.edges] == [(0, t, 1)]
+    assert graph.exploration.complete
+
+
+def test_workers_serve_their_shard_over_a_connection():
+    net, initial = buffers(1, 1)
+    parent, child = Pipe()
+    shard = Shard(net, canonical_key, 0, 1, keep_markings=True)
+    worker = threading.Thread(target=serve, args=(child, shard))
+    worker.start()
+
+    parent.send(("receive", ([pickle.dumps([(SEED, SEED, encode_marking(pmarking(initial), shard.place_index))])],)))
+    assert parent.recv() == [(SEED, SEED)]
+    parent.send(("number", ([0],)))
+    assert parent.recv() == []
+    parent.send((None, ()))
+    worker.join()
+    assert shard.visited == {canonical_key(initial): 0}
+
+
+def test_shards_exchange_successors_in_batches(monkeypatch):
+    class InProcessPool:
+        """Runs every shard in this process, so the exchange between them is measured by coverage."""
+
+        def __init__(self, net, key, workers, keep_markings):
+            self.shards = [Shard(net, key, index, workers, keep_markings) for index in range(workers)]
+
+        def call(self, method, args=None):
+            return [getattr(shard, method)(*(args[index] if args else ())) for index, shard in enumerate(self.shards)]
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(parallel, "WorkerPool", InProcessPool)
+    net, initial = buffers(3, 2)
+
+    graph = parallel_reachability_graph(net, initial, workers=4)
+
+    assert graph.edges == reachability_graph(net, initial).edges
@@ -0,0 +1,101 @@
+import io
+import json
+
+import pytest
+
+from carladam import Color, PetriNet, Place, Token, Transition, arc, passthrough
+from carladam.analysis.reachability import Order, canonical_key, edge_writer, explore, reachability_graph
+
+Red = Color("Red")
+
+
+def producer_consumer(capacity: int) -> tuple[PetriNet, dict]:
+    """Returns a bounded buffer net and its initial marking, with `capacity + 1` reachable markings."""
+    net = PetriNet.new(
+        free := Place("Free"),
+        full := Place("Full"),
+        put := Transition("Put", fn=passthrough()),
+        take := Transition("Take", fn=passthrough()),
+        arc(free, put, Red),
+        arc(put, full, Red),
+        arc(full, take, Red),
+        arc(take, free, Red),
+    )
+    return net, {free: Red() * capacity}
+
+
+def test_canonical_keys_ignore_token_ids_and_empty_places():
+    place, other = Place("P"), Place("Q")
+    assert canonical_key({place: {Red(), Red()}}) == canonical_key({place: {Red(), Red()}, other: set()})
+    assert canonical_key({place: {Red()}}) != canonical_key({place: {Red(), Red()}})
+    assert canonical_key({place: {Red(n=1)}}) != canonical_key({place: {Red(n=2)}})
+
+
+@pytest.mark.parametrize("order", ["bfs", "dfs", Order.BREADTH_FIRST])
+def test_explores_every_reachable_marking_once(order):
+    net, initial = producer_consumer(3)
+
+    graph = reachability_graph(net, initial, order=order)
+
+    assert len(graph.markings) == graph.exploration.states == 4
+    assert len(graph.edges) == graph.exploration.edges == 6
+    assert graph.exploration.complete
+    assert {len(marking.get(next(iter(initial)), ())) for marking in graph.markings} == {0, 1, 2, 3}
+
+
+def test_breadth_first_numbers_markings_by_distance():
+    net, initial = producer_consumer(3)
+
+    graph = reachability_graph(net, initial)
+
+    assert [(source, transition.name, target) for source, transition, target in graph.edges][:3] == [
+        (0, "Put", 1),
+        (1, "Put", 2),
+        (1, "Take", 0),
+    ]
+    assert graph.exploration.depth == 3
+
+
+def test_bounds_stop_exploration_early():
+    net, initial = producer_consumer(10)
+
+    by_states = explore(net, initial, max_states=4)
+    assert by_states.states == 4
+    assert not by_states.complete
+
+    by_depth = reachability_graph(net, initial, max_depth=2)
+    assert len(by_depth.markings) == 3
+    assert by_depth.exploration.depth == 2
+    assert not by_depth.exploration.complete
+
+    # A bound that is never reached leaves the exploration complete.
+    assert explore(net, initial, max_depth=11).complete
+
+
+def test_markings_with_no_successors_at_the_depth_bound_leave_exploration_complete():
+    net = PetriNet.new(a := Place("A"), t := Transition("T"), b := Place("B"), a >> t, t >> b)
+    assert explore(net, {a: {Token()}}, max_depth=1).complete
+
+
+def test_edges_stream_to_a_file():
+    net, initial = producer_consumer(1)
+    file = io.StringIO()
+    states = []
+
+    explore(net, initial, on_edge=edge_writer(file), on_state=lambda number, marking: states.append(number))
+
+    lines = [json.loads(line) for line in file.getvalue().splitlines()]
+    put, take = sorted(net.transitions)
+    assert lines == [
+        {"source": 0, "transition": put.id, "target": 1},
+        {"source": 1, "transition": take.id, "target": 0},
+    ]
+    assert states == [0, 1]
+
+
+def test_keys_are_pluggable():
+    net, initial = producer_consumer(3)
+    # Treat all markings as one state.
+    result = explore(net, initial, key=lambda marking: None)
+    assert result.states == 1
+    assert result.edges == 1
@@ -0,0 +1,95 @@
+import pickle
+from itertools import islice
+
+import pytest
+from pyrsistent import pmap
+
+from carladam import Color, Token
+from carladam.petrinet.expressions import total
+from carladam.petrinet.record import Record
+
+Order = Color("Order", schema={"order_id": int, "amount": (int, float)})
+
+
+def test_schema_colors_produce_records():
+    token = Order(order_id=1, amount=10)
+    assert isinstance(token.data, Record)
+    assert isinstance(token.data, Order.record_type)
+    assert token.data.order_id == 1
+    assert token.data["amount"] == 10
+    assert token.data.get("missing") is None
+    assert dict(token.data) == {"order_id": 1, "amount": 10}
+    assert len(token.data) == 2
+    assert repr(token) == "Order(order_id=1, amount=10)"
+    assert repr(token.data) == "Order.record(order_id=1, amount=10)"
+
+    # Records are slotted, holding no per-instance dict.
+    assert not hasattr(token.data, "__dict__")
+
+
+def test_records_compare_with_other_mappings():
+    data = Order(order_id=1, amount=10).data
+    assert data == {"order_id": 1, "amount": 10}
+    assert data == pmap({"order_id": 1, "amount": 10})
+    assert data == Order.token_data({"order_id": 1, "amount": 10})
+    assert hash(data) == hash(Order.token_data(data))
+    assert Order.token_data(data) is data
+
+    # Records hash like the maps they equal, so either finds the other in sets and dicts.
+    assert hash(data) == hash(pmap({"order_id": 1, "amount": 10}))
+    assert pmap({"order_id": 1, "amount": 10}) in {data}
+    assert data in {pmap({"order_id": 1, "amount": 10})}
+
+
+def test_records_are_validated_once_at_creation():
+    with pytest.raises(TypeError, match="Missing field for Order: amount"):
+        Order(order_id=1)
+    with pytest.raises(TypeError, match="Unexpected fields for Order: color"):
+        Order(order_id=1, amount=1, color="red")
+    with pytest.raises(TypeError, match="Field 'order_id' of Order must be"):
+        Order(order_id="1", amount=1)
+    with pytest.raises(ValueError, match="shadow record attributes: items"):
+        Color("Bad", schema={"items": int})
+
+
+def test_records_are_immutable():
+    data = Order(order_id=1, amount=10).data
+    with pytest.raises(AttributeError, match="is immutable"):
+        data.amount = 20
+    assert data.set("amount", 20) == {"order_id": 1, "amount": 20}
+    assert data.update({"amount": 5}, {"order_id": 2}) == {"order_id": 2, "amount": 5}
+    assert data.amount == 10
+
+
+def test_tokens_coerce_data_for_schema_colors():
+    # Token data passed as a plain mapping is converted to the color's record type.
+    token = Token(color=Order, data={"order_id": 1, "amount": 10})
+    assert isinstance(token.data, Order.record_type)
+    assert isinstance(token.replace(order_id=2, amount=3).data, Order.record_type)
+    assert token.clone().data is token.data
+
+    # Colors without a schema keep persistent maps.
+    assert Color("Untyped")(x=1).data == pmap({"x": 1})
+
+
+def test_generated_tokens_share_one_record():
+    tokens = list(islice(Order.token_generator({"order_id": 1, "amount": 10}), 3))
+    assert all(token.data is tokens[0].data for token in tokens)
+    assert len({token.data for token in Order.tokens(3, {"order_id": 1, "amount": 10})}) == 1
+    (produced,) = Order.produce(2, order_id=1, amount=2.5)(frozenset())
+    assert {type(token.data) for token in produced} == {Order.record_type}
+
+
+def test_records_pickle_with_their_color():
+    token = Order(order_id=1, amount=10)
+    unpickled = pickle.loads(pickle.dumps(token))
+    assert unpickled == token
+    assert unpickled.color == Order
+    assert unpickled.data == token.data
+    assert isinstance(unpickled.data, Record)
+
+
+def test_records_work_with_expressions():
+    tokens = {Order(order_id=n, amount=n) for n in range(4)}
+    assert (total("amount") == 6).evaluate(tokens, vectorized=False)
+    assert (total("amount") == 6).evaluate(tokens, vectorized=True)
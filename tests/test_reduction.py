@@ -0,0 +1,137 @@
+from carladam import Color, PetriNet, Place, Token, Transition, arc, arc_path, passthrough
+from carladam.analysis.reachability import canonical_key, reachability_graph
+from carladam.analysis.reduction import Rule, reduce_net
+from carladam.analysis.symbolic import symbolic_reachability
+from carladam.petrinet.arc import read_arc
+from carladam.petrinet.marking import pmarking
+
+Red = Color("Red")
+
+
+def processes(count: int, length: int) -> tuple[PetriNet, dict, Place]:
+    """
+    Returns processes that each take a shared lock, pass through `length` steps, and release it,
+    their initial marking, and the lock.
+    """
+    lock = Place(name="Lock")
+    members, initial = [lock], {lock: {Token()}}
+    for index in range(count):
+        idle = Place(name=f"Idle {index}")
+        steps = [Place(name=f"Step {index}.{step}") for step in range(length)]
+        take, release = Transition(name=f"Take {index}"), Transition(name=f"Release {index}")
+        moves = [Transition(name=f"Move {index}.{step}") for step in range(length - 1)]
+        nodes = [take, *(node for pair in zip(steps, moves) for node in pair), steps[-1], release, idle, take]
+        members += [*arc_path(*nodes), lock >> take, release >> lock]
+        initial[idle] = {Token()}
+    return PetriNet.new(*members), initial, lock
+
+
+def test_series_are_fused():
+    net, initial, lock = processes(3, 10)
+
+    reduced = reduce_net(net, initial)
+
+    full = reachability_graph(net, initial)
+    small = reachability_graph(net, initial, reduce=True)
+    assert len(full.markings) == 31
+    # Each process's steps are fused into a single transition.
+    assert len(small.markings) == 1
+    assert len(reduced.net.transitions) == 3
+    assert {rule for rule, *_ in reduced.steps} == {Rule.SERIES_PLACES, Rule.SERIES_TRANSITIONS, Rule.SELF_LOOP_PLACES}
+    assert {canonical_key(marking) for marking in small.markings} <= {canonical_key(m) for m in full.markings}
+
+
+def test_kept_places_are_unchanged():
+    net, initial, lock = processes(2, 5)
+    step = next(place for place in net.places if place.name == "Step 0.2")
+
+    reduced = reduce_net(net, initial, keep=[lock, step])
+
+    assert {lock, step} <= reduced.net.places
+    full = reachability_graph(net, initial)
+    small = reachability_graph(net, initial, reduce=True, visible=[lock, step])
+    assert len(small.markings) < len(full.markings)
+    # Markings with the lock taken and a token elsewhere in the fused steps are passed over.
+    assert {(bool(marking.get(lock)), bool(marking.get(step))) for marking in small.markings} == {
+        (True, False),
+        (False, True),
+    }
+
+
+def test_transitions_stand_for_sequences():
+    net, initial, lock = processes(2, 4)
+
+    reduced = reduce_net(net, initial, keep=[lock])
+    graph = reachability_graph(reduced.net, reduced.initial_marking)
+
+    for source, transition, target in graph.edges:
+        marking = reduced.expand(graph.markings[source])
+        for original in reduced.transitions[transition]:
+            marking = net.marking_after_transition(marking, original)
+        assert canonical_key(marking) == canonical_key(reduced.expand(graph.markings[target]))
+
+
+def test_parallel_places():
+    a, b, c, d = (Place(name=name) for name in "ABCD")
+    f, g = Transition(name="F"), Transition(name="G")
+    net = PetriNet.new(a, b, c, d, f, g, a >> f, b >> f, f >> c, f >> d, c >> g, d >> g, g >> a, g >> b)
+    initial = {a: {Token()}, b: Token() * 2}
+
+    reduced = reduce_net(net, initial, keep=[f, g])
+
+    assert [(step.rule, step.place, step.into) for step in reduced.steps] == [
+        (Rule.PARALLEL_PLACES, b, a),
+        (Rule.PARALLEL_PLACES, d, c),
+    ]
+    assert len(reduced.expand({c: {Token()}})[b]) == 1
+
+
+def test_other_nodes_are_left_alone():
+    a, b, c, d, switch = (Place(name=name) for name in ("A", "B", "C", "D", "Switch"))
+    f, g, h = Transition(name="F"), Transition(name="G"), Transition(name="H")
+    plain = [b >> g, g >> c, c >> h, h >> d]
+    colored = PetriNet.new(a, b, c, d, f, g, h, arc(a, f, Red), arc(f, b, Red), *plain)
+    read = PetriNet.new(a, b, c, d, switch, f, g, h, a >> f, f >> b, read_arc(switch, f), *plain)
+    passing = PetriNet.new(a, b, c, d, f := Transition(name="F", fn=passthrough()), g, h, a >> f, f >> b, *plain)
+    lonely = PetriNet.new(a, f, a >> f, f >> a)
+
+    # B is connected to F, so only C is fused into D.
+    assert [step.place for step in reduce_net(colored, {a: Red() * 1}).steps] == [c]
+    assert [step.place for step in reduce_net(read, {a: {Token()}, switch: {Token()}}).steps] == [c]
+    assert [step.place for step in reduce_net(passing, {a: {Token()}}).steps] == [c]
+    # Removing the self-loop place would leave the transition without arcs, and never enabled.
+    assert reduce_net(lonely, {a: {Token()}}).steps == ()
+
+
+def test_series_that_would_double_arcs_are_left_alone():
+    a, b, c = (Place(name=name) for name in "ABC")
+    f, g = Transition(name="F"), Transition(name="G")
+    # Fusing either way would give F two arcs to C.
+    net = PetriNet.new(a, b, c, f, g, a >> f, f >> b, f >> c, b >> g, g >> c)
+
+    assert reduce_net(net, {a: {Token()}}).steps == ()
+
+
+def test_reduced_exploration_reports_the_given_initial_marking():
+    places = [Place(name=f"Step {index}") for index in range(5)]
+    transitions = [Transition(name=f"Move {index}") for index in range(4)]
+    net = PetriNet.new(*arc_path(*(node for pair in zip(places, transitions) for node in pair), places[-1]))
+    initial = pmarking({places[0]: {Token()}})
+
+    # Series fusion moves the initial token to the end of the chain.
+    reduced = reduce_net(net, initial)
+    assert reduced.expand(reduced.initial_marking) != initial
+
+    assert reachability_graph(net, initial, reduce=True).markings == [initial]
+
+
+def test_other_analyses_find_deadlocks_of_the_reduced_net():
+    net, initial, lock = processes(2, 5)
+    net = net.update(stuck := Transition(name="Stuck"), lock >> stuck)
+    reduced = reduce_net(net, initial)
+
+    # Symbolic reachability takes no reduce option, but finds deadlocks of the reduced net that the original shares.
+    deadlock = symbolic_reachability(reduced.net, reduced.initial_marking).example_deadlock()
+    expanded = reduced.expand(deadlock)
+    assert not list(net.enabled_transitions(expanded))
+    assert canonical_key(expanded) in {canonical_key(marking) for marking in reachability_graph(net, initial).markings}
@@ -0,0 +1,81 @@
+import pytest
+
+from carladam import PetriNet, Place, Token, Transition
+from carladam.django.petrinet_simulator.replay import ReplayCache, prefix_digests
+
+
+@pytest.fixture
+def firings(monkeypatch):
+    """Counts the transitions fired by any net."""
+    fired = []
+    marking_after_transition = PetriNet.marking_after_transition
+
+    def counting(self, marking, transition):
+        fired.append(transition)
+        return marking_after_transition(self, marking, transition)
+
+    monkeypatch.setattr(PetriNet, "marking_after_transition", counting)
+    return fired
+
+
+def ring() -> tuple[PetriNet, dict, Transition, Transition]:
+    net = PetriNet.new(
+        left := Place("Left"),
+        right := Place("Right"),
+        forth := Transition("Forth"),
+        back := Transition("Back"),
+        left >> forth,
+        forth >> right,
+        right >> back,
+        back >> left,
+    )
+    return net, {left: {Token()}}, forth, back
+
+
+def test_requests_fire_only_transitions_after_the_longest_cached_prefix(firings):
+    net, initial, forth, back = ring()
+    cache = ReplayCache(checkpoint_interval=4)
+    session = [forth, back] * 5
+
+    first = cache.marking_after(net, initial, session)
+    assert len(firings) == 10
+
+    # Taking one more step fires one transition.
+    firings.clear()
+    cache.marking_after(net, initial, [*session, forth])
+    assert firings == [forth]
+
+    # Repeating a request fires nothing.
+    firings.clear()
+    assert cache.marking_after(net, initial, session) == first
+    assert firings == []
+
+    # Going back to an earlier step resumes from the checkpoint before it.
+    firings.clear()
+    cache.marking_after(net, initial, session[:7])
+    assert firings == session[4:7]
+
+
+def test_prefixes_are_distinguished_by_initial_marking_and_order():
+    net, initial, forth, back = ring()
+    cache = ReplayCache()
+
+    cache.marking_after(net, initial, [forth])
+    (left,) = initial
+    (right,) = net.places - {left}
+    assert len(cache.marking_after(net, {right: {Token()}}, [back])[left]) == 1
+    assert len(cache.marking_after(net, {left: {Token()}, right: {Token()}}, [forth])[right]) == 2
+
+    assert prefix_digests([forth, back])[1:] != prefix_digests([back, forth])[1:]
+    assert len(set(prefix_digests([forth, back, forth]))) == 4
+
+
+def test_cache_size_is_bounded(firings):
+    net, initial, forth, back = ring()
+    cache = ReplayCache(maxsize=2, checkpoint_interval=1)
+
+    cache.marking_after(net, initial, [forth, back, forth])
+
+    assert cache.info().currsize == 2
+    cache.clear()
+    assert cache.info().currsize == 0
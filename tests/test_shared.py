@@ -0,0 +1,108 @@
+import multiprocessing
+import pickle
+
+import pytest
+
+from carladam import Color, PetriNet, Place, Transition, arc
+from carladam.petrinet.arc import inhibitor_arc
+from carladam.petrinet.shared import SharedCountMarking, SharedNetIndex
+
+
+A = Color("A")
+B = Color("B")
+
+
+@pytest.fixture
+def net():
+    return PetriNet.new(
+        p0 := Place("P0"),
+        p1 := Place("P1"),
+        p2 := Place("P2"),
+        t0 := Transition("T0"),
+        t1 := Transition("T1"),
+        arc(p0, t0, {A: 2}),
+        arc(t0, p1, A),
+        arc(p1, t1, A),
+        inhibitor_arc(p2, t1, A),
+        arc(t1, p2, A),
+    )
+
+
+@pytest.fixture
+def index(net):
+    index = SharedNetIndex.publish(net.compiled)
+    yield index
+    index.close()
+    index.unlink()
+
+
+def test_published_index_matches_compiled_net(net, index):
+    compiled = net.compiled
+    assert list(index.pre) == list(compiled.pre)
+    assert list(index.post) == list(compiled.post)
+    assert list(index.test) == list(compiled.test)
+    assert list(index.inhibit) == list(compiled.inhibit)
+    assert list(index.weight_only) == [1, 1]
+    assert index.handle.place_ids == tuple(place.id for place in compiled.places)
+    assert index.handle.transition_ids == tuple(transition.id for transition in compiled.transitions)
+    assert index.handle.color_labels == ("A",)
+
+
+def test_attached_index_is_read_only(index):
+    with SharedNetIndex.attach(index.handle) as attached:
+        assert list(attached.pre) == list(index.pre)
+        with pytest.raises(TypeError):
+            attached.pre[0] = 0
+
+
+def test_firing_from_shared_memory(net, index):
+    counts = net.compiled.counts({net.compiled.places[0]: {A(), A()}})
+    with SharedCountMarking.create(counts) as marking:
+        assert list(index.enabled(marking.counts)) == [0]
+        marking.update(index.fire(marking.counts, 0))
+        assert list(marking.counts) == [0, 1, 0]
+        assert list(index.enabled(marking.counts)) == [1]
+        marking.update(index.fire(marking.counts, 1))
+        assert list(index.enabled(marking.counts)) == []
+        assert list(marking.snapshot()) == [0, 0, 1]
+        marking.unlink()
+
+
+def test_inhibitor_arcs_see_untracked_tokens(net, index):
+    compiled = net.compiled
+    p1, p2 = compiled.places[1], compiled.places[2]
+    marking = {p1: {A()}, p2: {B()}}
+    assert not net.transition_is_enabled(marking, compiled.transitions[1])
+    assert list(index.enabled(compiled.counts(marking), compiled.untracked(marking))) == []
+
+
+def test_pickles_by_reference(index):
+    with SharedCountMarking.create([1, 2, 3]) as marking:
+        with pickle.loads(pickle.dumps(marking)) as attached:
+            assert attached.name == marking.name
+            attached.counts[0] = 5
+            assert marking.counts[0] == 5
+        marking.unlink()
+    with pickle.loads(pickle.dumps(index)) as attached:
+        assert attached.handle == index.handle
+
+
+def test_empty_count_marking():
+    with SharedCountMarking.create([]) as marking:
+        assert list(marking.counts) == []
+        marking.unlink()
+
+
+def _fire_in_worker(index: SharedNetIndex, marking: SharedCountMarking, transition_index: int) -> list[int]:
+    with index, marking:
+        marking.update(index.fire(marking.counts, transition_index))
+        return list(index.enabled(marking.counts))
+
+
+def test_workers_share_index_and_marking(net, index):
+    with SharedCountMarking.create([2, 0, 0]) as marking:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            enabled = pool.apply(_fire_in_worker, (index, marking, 0))
+        assert enabled == [1]
+        assert list(marking.counts) == [0, 1, 0]
+        marking.unlink()
@@ -0,0 +1,74 @@
+from carladam import PetriNet, Place, Token, Transition
+from carladam.analysis.reachability import canonical_key, reachability_graph
+from carladam.analysis.slicing import cone_of_influence, slice_net
+from carladam.petrinet.arc import inhibitor_arc, read_arc, reset_arc
+
+
+def workshop() -> tuple[PetriNet, dict]:
+    """
+    Returns a net in which work is finished while a permit is held and no stop is raised,
+    alongside an unrelated cycle, and its initial marking.
+    """
+    ready, done, permit, request, stop, alarm = (
+        Place(name=name) for name in ("Ready", "Done", "Permit", "Request", "Stop", "Alarm")
+    )
+    idle, busy, log = Place(name="Idle"), Place(name="Busy"), Place(name="Log")
+    finish, grant, raise_stop = Transition(name="Finish"), Transition(name="Grant"), Transition(name="Raise stop")
+    start, rest = Transition(name="Start"), Transition(name="Rest")
+    net = PetriNet.new(
+        *(ready, done, permit, request, stop, alarm, idle, busy, log),
+        *(finish, grant, raise_stop, start, rest),
+        ready >> finish,
+        finish >> done,
+        finish >> log,
+        read_arc(permit, finish),
+        inhibitor_arc(stop, finish),
+        request >> grant,
+        grant >> permit,
+        alarm >> raise_stop,
+        raise_stop >> stop,
+        idle >> start,
+        start >> busy,
+        busy >> rest,
+        rest >> idle,
+    )
+    initial = {ready: {Token()}, request: {Token()}, alarm: {Token()}, idle: {Token()}}
+    return net, initial
+
+
+def test_cone_follows_read_and_inhibitor_arcs():
+    net, initial = workshop()
+    done = next(place for place in net.places if place.name == "Done")
+
+    places, transitions = cone_of_influence(net, places=[done])
+
+    assert {place.name for place in places} == {"Done", "Ready", "Permit", "Request", "Stop", "Alarm"}
+    assert {transition.name for transition in transitions} == {"Finish", "Grant", "Raise stop"}
+
+
+def test_slice_reaches_the_same_markings_of_its_places():
+    net, initial = workshop()
+    done = next(place for place in net.places if place.name == "Done")
+
+    sliced = slice_net(net, places=[done])
+
+    full = reachability_graph(net, initial)
+    small = reachability_graph(sliced, {place: tokens for place, tokens in initial.items() if place in sliced.places})
+    assert len(small.markings) < len(full.markings)
+
+    def restricted(marking):
+        return canonical_key({place: tokens for place, tokens in marking.items() if place in sliced.places})
+
+    assert {restricted(marking) for marking in full.markings} == {canonical_key(m) for m in small.markings}
+    assert not any(arc.dest.name == "Log" for arc in sliced.arcs if arc.src.name == "Finish")
+
+
+def test_transitions_depend_on_their_inputs_only():
+    net, initial = workshop()
+    start = next(transition for transition in net.transitions if transition.name == "Start")
+    flush, log = Transition(name="Flush"), next(place for place in net.places if place.name == "Log")
+    net = net.update(flush, reset_arc(log, flush))
+
+    assert {place.name for place in slice_net(net, transitions=[start]).places} == {"Idle", "Busy"}
+    places, transitions = cone_of_influence(net, places=[log])
+    assert {transition.name for transition in transitions} == {"Flush", "Finish", "Grant", "Raise stop"}
@@ -0,0 +1,113 @@
+from carladam import PetriNet, Place, Token, Transition
+from carladam.analysis.reachability import canonical_key, reachability_graph
+from carladam.analysis.stubborn import StubbornSets
+from carladam.petrinet.arc import inhibitor_arc
+from carladam.petrinet.marking import pmarking
+
+
+def chains(count: int) -> tuple[PetriNet, dict]:
+    """Returns `count` independent transitions, each moving a token from its own place to another."""
+    members, initial = [], {}
+    for index in range(count):
+        start, end = Place(name=f"Start {index}"), Place(name=f"End {index}")
+        move = Transition(name=f"Move {index}")
+        members += [start, end, move, start >> move, move >> end]
+        initial[start] = {Token()}
+    return PetriNet.new(*members), initial
+
+
+def deadlocks(graph) -> set:
+    sources = {source for source, transition, target in graph.edges}
+    return {canonical_key(marking) for number, marking in enumerate(graph.markings) if number not in sources}
+
+
+def test_stubborn_reduction_explores_one_interleaving_of_independent_transitions():
+    net, initial = chains(4)
+
+    full = reachability_graph(net, initial)
+    reduced = reachability_graph(net, initial, reduction="stubborn")
+
+    assert full.exploration.states == 16
+    assert reduced.exploration.states == 5
+    assert deadlocks(reduced) == deadlocks(full)
+
+
+def test_conflicting_transitions_are_all_explored():
+    net = PetriNet.new(
+        p := Place("P"),
+        left := Place("Left"),
+        right := Place("Right"),
+        f := Transition("F"),
+        g := Transition("G"),
+        p >> f,
+        f >> left,
+        p >> g,
+        g >> right,
+    )
+
+    graph = reachability_graph(net, {p: {Token()}}, reduction="stubborn")
+
+    assert [transition for source, transition, target in graph.edges] == [f, g]
+
+
+def cycles() -> tuple[PetriNet, dict, Place]:
+    """Returns two independent cycles, and the place of the second that is marked only after it moves."""
+    net = PetriNet.new(
+        a := Place("A"),
+        b := Place("B"),
+        c := Place("C"),
+        d := Place("D"),
+        f := Transition("F"),
+        g := Transition("G"),
+        h := Transition("H"),
+        k := Transition("K"),
+        a >> f,
+        f >> b,
+        b >> g,
+        g >> a,
+        c >> h,
+        h >> d,
+        d >> k,
+        k >> c,
+    )
+    return net, {a: {Token()}, c: {Token()}}, d
+
+
+def test_visible_places_are_not_ignored_around_cycles():
+    net, initial, d = cycles()
+
+    ignoring = reachability_graph(net, initial, reduction="stubborn")
+    assert not any(marking.get(d) for marking in ignoring.markings)
+
+    visible = reachability_graph(net, initial, reduction="stubborn", visible={d})
+    assert any(marking.get(d) for marking in visible.markings)
+
+
+def test_blockers_of_disabled_transitions():
+    net = PetriNet.new(
+        a := Place("A"),
+        b := Place("B"),
+        c := Place("C"),
+        absent := Place("Absent"),
+        fill := Transition("Fill"),
+        drain := Transition("Drain"),
+        needs := Transition("Needs"),
+        inhibited := Transition("Inhibited"),
+        guarded := Transition("Guarded", guard=lambda inputs: False),
+        lonely := Transition("Lonely"),
+        a >> fill,
+        fill >> b,
+        b >> needs,
+        inhibitor_arc(absent, needs),
+        c >> drain,
+        inhibitor_arc(c, inhibited),
+        a >> guarded,
+    )
+    stubborn = StubbornSets(net)
+    marking = pmarking({a: {Token()}, c: {Token()}})
+
+    assert stubborn.blockers(marking, needs) == {fill}
+    assert stubborn.blockers(marking, inhibited) == {drain}
+    assert stubborn.blockers(marking, guarded) == {fill, guarded}
+    assert stubborn.blockers(marking, lonely) == set()
+    assert stubborn.stubborn_set(marking, {fill, drain}, drain) == {drain, inhibited}
@@ -0,0 +1,126 @@
+import sys
+
+import pytest
+
+from carladam import Abstract, Color, PetriNet, Place, Token, Transition, arc
+from carladam.analysis.reachability import reachability_graph
+from carladam.analysis.symbolic import symbolic_reachability
+from carladam.petrinet.arc import inhibitor_arc, read_arc
+
+Red = Color("Red")
+Blue = Color("Blue")
+
+
+def philosophers(count: int) -> tuple[PetriNet, dict]:
+    """Returns dining philosophers who each take their left fork, then their right, then release both."""
+    think = [Place(name=f"Think {index}") for index in range(count)]
+    left = [Place(name=f"Left {index}") for index in range(count)]
+    eat = [Place(name=f"Eat {index}") for index in range(count)]
+    fork = [Place(name=f"Fork {index}") for index in range(count)]
+    members = [*think, *left, *eat, *fork]
+    for index in range(count):
+        right = (index + 1) % count
+        take_left = Transition(name=f"Take left {index}")
+        take_right = Transition(name=f"Take right {index}")
+        release = Transition(name=f"Release {index}")
+        members += [take_left, take_right, release]
+        members += [think[index] >> take_left, fork[index] >> take_left, take_left >> left[index]]
+        members += [left[index] >> take_right, fork[right] >> take_right, take_right >> eat[index]]
+        members += [eat[index] >> release, release >> think[index], release >> fork[index], release >> fork[right]]
+    return PetriNet.new(*members), {place: {Token()} for place in think + fork}
+
+
+def test_matches_explicit_reachability():
+    net, initial = philosophers(4)
+
+    space = symbolic_reachability(net, initial)
+
+    explicit = reachability_graph(net, initial)
+    assert space.count() == len(explicit.markings) == 34
+    assert all(space.contains(marking) for marking in explicit.markings)
+    assert not space.contains({})
+
+
+def test_finds_deadlocks_in_huge_state_spaces():
+    net, initial = philosophers(32)
+
+    space = symbolic_reachability(net, initial)
+
+    assert space.count() > 10**12
+    assert space.deadlock_count() == 1
+    deadlock = space.example_deadlock()
+    assert {place.name for place, tokens in deadlock.items() if tokens} == {f"Left {index}" for index in range(32)}
+
+
+def test_read_and_inhibitor_arcs():
+    net = PetriNet.new(
+        switch := Place("Switch"),
+        start := Place("Start"),
+        done := Place("Done"),
+        blocked := Place("Blocked"),
+        go := Transition("Go"),
+        block := Transition("Block"),
+        read_arc(switch, go),
+        inhibitor_arc(blocked, go),
+        start >> go,
+        go >> done,
+        start >> block,
+        block >> blocked,
+    )
+
+    space = symbolic_reachability(net, {switch: {Token()}, start: {Token()}})
+
+    assert space.count() == 3
+    assert space.contains({switch: {Token()}, done: {Token()}})
+    assert space.deadlock_count() == 2
+    assert symbolic_reachability(net, {start: {Token()}}).example_deadlock() is not None
+
+
+def test_nets_without_deadlocks():
+    net = PetriNet.new(
+        a := Place("A"), b := Place("B"), f := Transition("F"), g := Transition("G"), a >> f, f >> b, b >> g, g >> a
+    )
+
+    space = symbolic_reachability(net, {a: {Token()}}, order=[b, a])
+
+    assert space.count() == 2
+    assert space.example_deadlock() is None
+
+
+def test_rejects_nets_that_are_not_1_safe():
+    net = PetriNet.new(a := Place("A"), b := Place("B"), f := Transition("F"), a >> f, f >> b)
+
+    with pytest.raises(ValueError):
+        symbolic_reachability(net, {a: {Token()}, b: {Token()}})
+    with pytest.raises(ValueError):
+        symbolic_reachability(net, {a: Token() * 2})
+    with pytest.raises(ValueError):
+        symbolic_reachability(net, {a: {Token()}}, order=[a])
+
+
+def test_rejects_nets_not_described_by_occupancy():
+    p, t = Place("P"), Transition("T")
+    with pytest.raises(ValueError):
+        symbolic_reachability(PetriNet.new(p, t, p >> {Abstract: 2} >> t), {})
+    with pytest.raises(ValueError):
+        symbolic_reachability(PetriNet.new(p, t, arc(p, t, Red), arc(t, p, Blue)), {})
+
+
+def test_nets_with_more_places_than_the_recursion_limit():
+    members, initial = [], {}
+    for index in range(200):
+        off, on = Place(name=f"Off {index}"), Place(name=f"On {index}")
+        up, down = Transition(name=f"Up {index}"), Transition(name=f"Down {index}")
+        members += [off, on, up, down, off >> up, up >> on, on >> down, down >> off]
+        initial[off] = {Token()}
+    net = PetriNet.new(*members)
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(300)
+    try:
+        space = symbolic_reachability(net, initial)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    assert space.count() == 2**200
+    assert space.example_deadlock() is None
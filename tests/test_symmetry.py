@@ -0,0 +1,101 @@
+import pytest
+
+from carladam import Color, PetriNet, Place, Transition, arc, passthrough
+from carladam.analysis.reachability import reachability_graph
+from carladam.analysis.symmetry import Symmetry, behavior_key, symmetric_key
+from carladam.petrinet.transition import always
+
+Red = Color("Red")
+
+
+def buffers(count: int, capacity: int) -> tuple[PetriNet, dict, Symmetry]:
+    """Returns `count` identical bounded buffers, their initial marking, and the symmetry between them."""
+    members, initial, places, transitions = [], {}, [], []
+    for index in range(count):
+        free, full = Place(name=f"Free {index}"), Place(name=f"Full {index}")
+        put = Transition(name=f"Put {index}", fn=passthrough())
+        take = Transition(name=f"Take {index}", fn=passthrough())
+        members += [free, full, put, take, arc(free, put, Red), arc(put, full, Red), arc(full, take, Red)]
+        members.append(arc(take, free, Red))
+        initial[free] = Red() * capacity
+        places.append([free, full])
+        transitions.append([put, take])
+    return PetriNet.new(*members), initial, Symmetry(places, transitions)
+
+
+def test_symmetric_markings_are_one_state():
+    net, initial, symmetry = buffers(3, 2)
+
+    full = reachability_graph(net, initial)
+    reduced = reachability_graph(net, initial, key=symmetric_key(net, [symmetry]))
+
+    assert full.exploration.states == 27
+    # Each state is a multiset of three buffer levels, each from 0 to 2.
+    assert reduced.exploration.states == 10
+    assert reduced.exploration.complete
+
+
+def test_places_outside_symmetries_are_compared_individually():
+    net, initial, symmetry = buffers(2, 1)
+    extra = Place(name="Extra")
+    key = symmetric_key(net, [symmetry])
+    free_0, free_1 = symmetry.places[0][0], symmetry.places[1][0]
+
+    assert key({free_0: Red() * 1}) == key({free_1: Red() * 1})
+    assert key({free_0: Red() * 1, extra: Red() * 1}) != key({free_1: Red() * 1})
+
+
+def test_symmetries_must_hold():
+    net, initial, symmetry = buffers(2, 1)
+    (free_0, full_0), (free_1, full_1) = symmetry.places
+
+    with pytest.raises(ValueError):
+        symmetric_key(net, [Symmetry(places=[[free_0, full_0], [free_1, full_1]])])
+    with pytest.raises(ValueError):
+        symmetric_key(net, [Symmetry(places=[[free_0, full_0], [full_1, free_1]], transitions=symmetry.transitions)])
+    with pytest.raises(ValueError):
+        symmetric_key(net, [Symmetry(places=[[free_0, full_0], [free_1]], transitions=symmetry.transitions)])
+    with pytest.raises(ValueError):
+        symmetric_key(net, [symmetry, symmetry])
+
+
+def test_symmetries_must_preserve_guards_functions_and_transforms():
+    def copies(second_transition: dict, second_arc: dict) -> tuple[PetriNet, Symmetry]:
+        """Returns a net of two copies of a place and transition, changing the second copy's transition and arc."""
+        p0, p1 = Place(name="P0"), Place(name="P1")
+        t0 = Transition(name="T0", fn=passthrough())
+        t1 = Transition(name="T1", **{"fn": passthrough(), **second_transition})
+        net = PetriNet.new(p0, p1, t0, t1, arc(p0, t0, Red), arc(p1, t1, Red, **second_arc))
+        return net, Symmetry([[p0], [p1]], [[t0], [t1]])
+
+    # Functions made separately by the same factory are interchangeable.
+    net, symmetry = copies({}, {})
+    symmetry.check(net)
+
+    # Copies whose transitions have different guards or functions are not.
+    for changes in {"guard": always(False)}, {"fn": Red.produce()}:
+        net, symmetry = copies(changes, {})
+        with pytest.raises(ValueError, match="guards or functions"):
+            symmetry.check(net)
+
+    # Nor are copies whose arcs have different guards or transforms.
+    for changes in {"guard": lambda arc, tokens: True}, {"transform": lambda tokens: tokens}:
+        net, symmetry = copies({}, changes)
+        with pytest.raises(ValueError, match="changes the net"):
+            symmetry.check(net)
+
+
+def test_behavior_keys():
+    def factory(value, *, scale=1):
+        def fn(inputs, offset=value):
+            return fn, scale, offset
+
+        return fn
+
+    assert behavior_key(factory(1)) == behavior_key(factory(1))
+    assert behavior_key(factory(1)) != behavior_key(factory(2))
+    assert behavior_key(factory(1, scale=2)) == behavior_key(factory(1, scale=2))
+    assert behavior_key(passthrough(Red)) == behavior_key(passthrough({Red: 1}))
+    assert behavior_key({"a": [1, {2}]}) == behavior_key({"a": (1, frozenset({2}))})
+    unhashable = bytearray()
+    assert behavior_key(unhashable) == behavior_key(unhashable) != behavior_key(bytearray())
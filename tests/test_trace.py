@@ -0,0 +1,120 @@
+import pytest
+
+from carladam import Color, PetriNet, Place, Token, Transition
+from carladam.petrinet.arc import reset_arc, transfer_arc
+from carladam.petrinet.effects import Input, Output
+from carladam.petrinet.errors import TransitionNotEnabled
+from carladam.petrinet.occurrence import Occurrence
+from carladam.petrinet.trace import (
+    DeltaTrace,
+    EffectTrace,
+    PlaceDelta,
+    StepCount,
+    TraceLevel,
+    TransitionTrace,
+    new_trace,
+    simulate,
+)
+
+Red = Color("Red")
+
+
+def ring() -> tuple[PetriNet, Place, Place, Transition, Transition]:
+    """Returns a net that moves a token back and forth between two places."""
+    net = PetriNet.new(
+        left := Place("Left"),
+        right := Place("Right"),
+        forth := Transition("Forth"),
+        back := Transition("Back"),
+        left >> forth,
+        forth >> right,
+        right >> back,
+        back >> left,
+    )
+    return net, left, right, forth, back
+
+
+@pytest.mark.parametrize("level", list(TraceLevel))
+def test_every_level_reaches_the_same_marking(level):
+    net, left, right, forth, back = ring()
+
+    result = simulate(net, {left: {Token()}}, [forth, back, forth], level)
+
+    assert len(result.marking[right]) == 1
+    assert not result.marking.get(left)
+    assert len(result.trace) == 3
+    assert result.trace.level is level
+    assert isinstance(result.trace, {0: StepCount, 1: TransitionTrace, 2: DeltaTrace, 3: EffectTrace}[level])
+
+
+def test_transition_traces_store_each_transition_once():
+    net, left, right, forth, back = ring()
+
+    trace = simulate(net, {left: {Token()}}, [forth, back] * 50).trace
+
+    assert trace.transitions == [forth, back]
+    assert trace.steps.tolist() == [0, 1] * 50
+    assert trace[1] is back
+    assert list(trace)[:3] == [forth, back, forth]
+    assert list(trace.ids())[:2] == ["Forth", "Back"]
+
+
+def test_delta_traces_record_changes_per_place():
+    net, left, right, forth, back = ring()
+    token = Token()
+
+    trace = simulate(net, {left: {token}}, [forth], TraceLevel.DELTAS).trace
+
+    (produced,) = trace.deltas[0][1].added
+    assert trace.deltas == [(PlaceDelta(left, (token,), ()), PlaceDelta(right, (), (produced,)))]
+
+
+def test_delta_traces_include_resets_and_transfers():
+    source, dest, drain, empty = Place("Source"), Place("Dest"), Place("Drain"), Transition("Empty")
+    net = PetriNet.new(transfer_arc(source, empty, dest, Red), reset_arc(drain, empty, Red))
+    tokens = {Red(), Red()}
+
+    trace = simulate(net, {source: tokens, drain: {Red()}}, [empty], TraceLevel.DELTAS).trace
+
+    (deltas,) = trace.deltas
+    by_place = {delta.place: delta for delta in deltas}
+    assert set(by_place[source].removed) == tokens
+    assert set(by_place[dest].added) == tokens
+    assert len(by_place[drain].removed) == 1
+
+
+def test_only_full_traces_build_input_and_output_effects():
+    net, left, right, forth, back = ring()
+
+    full = simulate(net, {left: {Token()}}, [forth], TraceLevel.FULL).trace
+    (effects,) = full.effects
+    assert {type(effect) for effect in effects} >= {Input, Output}
+    assert full.deltas[0][0].place == left
+
+    deltas = simulate(net, {left: {Token()}}, [forth], TraceLevel.DELTAS).trace
+    assert not hasattr(deltas, "effects")
+
+
+@pytest.mark.parametrize("level", [TraceLevel.NONE, TraceLevel.TRANSITIONS])
+def test_low_levels_build_no_lists_of_effects(level, monkeypatch):
+    net, left, right, forth, back = ring()
+
+    def effects(self, record_io=True):
+        raise AssertionError("A list of effects was built.")
+
+    monkeypatch.setattr(Occurrence, "effects", effects)
+    monkeypatch.setattr(Occurrence, "bulk_effects", effects)
+    result = simulate(net, {left: {Token()}}, [forth, back, forth], level)
+    assert len(result.marking[right]) == 1
+    assert len(result.trace) == 3
+
+
+def test_simulation_stops_at_a_disabled_transition():
+    net, left, right, forth, back = ring()
+    with pytest.raises(TransitionNotEnabled):
+        simulate(net, {left: {Token()}}, [forth, forth])
+
+
+def test_new_trace_accepts_level_values():
+    assert new_trace(2) == DeltaTrace()
+    assert TransitionTrace([Transition("T")])._indexes == {Transition("T"): 0}
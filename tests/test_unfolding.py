@@ -0,0 +1,135 @@
+import pytest
+
+from carladam import PetriNet, Place, Token, Transition
+from carladam.analysis.reachability import reachability_graph
+from carladam.analysis.unfolding import unfold
+from carladam.petrinet.arc import inhibitor_arc, read_arc
+
+
+def philosophers(count: int) -> tuple[PetriNet, dict]:
+    """Returns dining philosophers who each take their left fork, then their right, then release both."""
+    think = [Place(name=f"Think {index}") for index in range(count)]
+    left = [Place(name=f"Left {index}") for index in range(count)]
+    eat = [Place(name=f"Eat {index}") for index in range(count)]
+    fork = [Place(name=f"Fork {index}") for index in range(count)]
+    members = [*think, *left, *eat, *fork]
+    for index in range(count):
+        right = (index + 1) % count
+        take_left = Transition(name=f"Take left {index}")
+        take_right = Transition(name=f"Take right {index}")
+        release = Transition(name=f"Release {index}")
+        members += [take_left, take_right, release]
+        members += [think[index] >> take_left, fork[index] >> take_left, take_left >> left[index]]
+        members += [left[index] >> take_right, fork[right] >> take_right, take_right >> eat[index]]
+        members += [eat[index] >> release, release >> think[index], release >> fork[index], release >> fork[right]]
+    return PetriNet.new(*members), {place: {Token()} for place in think + fork}
+
+
+def test_prefix_represents_every_reachable_marking():
+    net, initial = philosophers(4)
+
+    prefix = unfold(net, initial)
+
+    explicit = reachability_graph(net, initial)
+    assert prefix.complete
+    assert all(prefix.is_reachable(marking) for marking in explicit.markings)
+    assert not prefix.is_reachable({})
+    assert not prefix.is_reachable({place: {Token()} for place in net.places})
+    # Every event's local configuration reaches a marking of the reachability graph.
+    keys = {frozenset(place for place, tokens in marking.items() if tokens) for marking in explicit.markings}
+    for event in prefix.events:
+        consumed = produced = 0
+        for index, other in enumerate(prefix.events):
+            if event.local >> index & 1:
+                consumed |= other.preset
+                produced |= other.postset
+        marking = prefix.marking((prefix.initial | produced) & ~consumed)
+        assert frozenset(marking) in keys
+
+
+def test_finds_deadlocks():
+    net, initial = philosophers(5)
+
+    prefix = unfold(net, initial)
+
+    deadlock = prefix.deadlock()
+    assert {place.name for place in deadlock} == {f"Left {index}" for index in range(5)}
+
+
+def test_prefix_of_concurrent_cycles_is_small():
+    members, initial = [], {}
+    for index in range(12):
+        off, on = Place(name=f"Off {index}"), Place(name=f"On {index}")
+        up, down = Transition(name=f"Up {index}"), Transition(name=f"Down {index}")
+        members += [off, on, up, down, off >> up, up >> on, on >> down, down >> off]
+        initial[off] = {Token()}
+    net = PetriNet.new(*members)
+
+    prefix = unfold(net, initial)
+
+    # The reachability graph has 2**12 markings; the prefix has two events per cycle.
+    assert len(prefix.events) == 24
+    assert len(prefix.cutoffs()) == 12
+    assert prefix.deadlock() is None
+    marked = {f"On {index}" for index in range(12) if index != 1} | {"Off 1"}
+    assert prefix.is_reachable({place: {Token()} for place in net.places if place.name in marked})
+    assert not prefix.is_reachable({place: {Token()} for place in net.places if place.name in {"On 0", "Off 0"}})
+    assert not unfold(net, initial, max_events=5).complete
+
+
+def test_read_arcs():
+    net = PetriNet.new(
+        switch := Place("Switch"),
+        start := Place("Start"),
+        done := Place("Done"),
+        go := Transition("Go"),
+        read_arc(switch, go),
+        start >> go,
+        go >> done,
+    )
+
+    prefix = unfold(net, {switch: {Token()}, start: {Token()}})
+
+    assert prefix.is_reachable({switch: {Token()}, done: {Token()}})
+    assert set(prefix.deadlock()) == {switch, done}
+    assert set(unfold(net, {start: {Token()}}).deadlock()) == {start}
+
+
+def test_rejects_unsupported_nets():
+    a, b, f = Place("A"), Place("B"), Transition("F")
+    net = PetriNet.new(a, b, f, a >> f, f >> b)
+    with pytest.raises(ValueError):
+        unfold(net, {a: {Token()}, b: {Token()}})
+    with pytest.raises(ValueError):
+        unfold(net, {a: Token() * 2})
+    with pytest.raises(ValueError):
+        unfold(PetriNet.new(a, b, f, f >> b), {})
+    with pytest.raises(ValueError):
+        unfold(PetriNet.new(a, b, f, inhibitor_arc(a, f), b >> f), {})
+
+
+def test_searches_each_configuration_once():
+    p0, p1, p3, p4 = (Place(name=f"P{index}") for index in (0, 1, 3, 4))
+    t0, t1, t2 = (Transition(name=f"T{index}") for index in range(3))
+    net = PetriNet.new(
+        p0,
+        p1,
+        p3,
+        p4,
+        t0,
+        t1,
+        t2,
+        p1 >> t0,
+        p3 >> t0,
+        t0 >> p0,
+        t0 >> p4,
+        p0 >> t1,
+        p3 >> t1,
+        p1 >> t2,
+        t2 >> p0,
+        t2 >> p3,
+    )
+
+    prefix = unfold(net, {p1: {Token()}, p4: {Token()}})
+
+    assert not prefix.is_reachable({p3: {Token()}, p4: {Token()}})